@@ -33,6 +33,7 @@ from .asset import *
 from .audit_logs import *
 from .automod import *
 from .bans import *
+from .cache import *
 from .channel import *
 from .client import *
 from .colour import *
@@ -61,8 +62,10 @@ from .partial_emoji import *
 from .permissions import *
 from .player import *
 from .poll import *
+from .profiler import *
 from .raw_models import *
 from .reaction import *
+from .recorder import *
 from .role import *
 from .shard import *
 from .sku import *
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import copy
 from abc import ABC
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -82,6 +82,7 @@ if TYPE_CHECKING:
     from .ui._types import MessageComponents
     from .ui.view import View
     from .user import ClientUser
+    from .utils import SnowflakeList
     from .voice_region import VoiceRegion
 
     MessageableChannel: TypeAlias = GuildMessageable | DMChannel | GroupChannel | PartialMessageable
@@ -92,6 +93,9 @@ if TYPE_CHECKING:
 
 MISSING = utils.MISSING
 
+# maximum number of cached role-derived permissions per guild, see `GuildChannel.permissions_for`
+_PERMISSION_CACHE_SIZE = 8192
+
 
 @runtime_checkable
 class Snowflake(Protocol):
@@ -653,6 +657,45 @@ class GuildChannel(ABC):
             denied = Permissions.all_channel()
             base.value &= ~denied.value
 
+    def _role_permissions(self, value: int, roles: SnowflakeList) -> tuple[int, bool]:
+        # Resolves the permissions of the given roles in this channel, starting from
+        # the @everyone permissions, without taking member overwrites into account.
+        # Returns the permission value, and whether the roles grant administrator.
+        base = Permissions(value)
+        get_role = self.guild.get_role
+
+        # Apply guild roles that the member has.
+        for role_id in roles:
+            role = get_role(role_id)
+            if role is not None:
+                base.value |= role._permissions
+
+        if base.administrator:
+            return base.value, True
+
+        # Apply @everyone allow/deny first since it's special
+        try:
+            maybe_everyone = self._overwrites[0]
+            if maybe_everyone.id == self.guild.id:
+                base.handle_overwrite(allow=maybe_everyone.allow, deny=maybe_everyone.deny)
+                remaining_overwrites = self._overwrites[1:]
+            else:
+                remaining_overwrites = self._overwrites
+        except IndexError:
+            remaining_overwrites = self._overwrites
+
+        denies = 0
+        allows = 0
+
+        # Apply channel specific role permission overwrites
+        for overwrite in remaining_overwrites:
+            if overwrite.is_role() and roles.has(overwrite.id):
+                denies |= overwrite.deny
+                allows |= overwrite.allow
+
+        base.handle_overwrite(allow=allows, deny=denies)
+        return base.value, False
+
     def permissions_for(
         self,
         obj: Member | Role,
@@ -770,44 +813,28 @@ class GuildChannel(ABC):
 
             return base
 
+        # The role-derived part only depends on the member's roles, so it's cached per
+        # channel and set of roles, and invalidated whenever roles or channels change.
         roles = obj._roles
-        get_role = self.guild.get_role
-
-        # Apply guild roles that the member has.
-        for role_id in roles:
-            role = get_role(role_id)
-            if role is not None:
-                base.value |= role._permissions
+        cache = self.guild._permission_cache
+        key = (self.id, roles.tobytes())
+        try:
+            value, is_admin = cache[key]
+        except KeyError:
+            value, is_admin = self._role_permissions(base.value, roles)
+            if len(cache) >= _PERMISSION_CACHE_SIZE:
+                cache.clear()
+            cache[key] = (value, is_admin)
 
         # Guild-wide Administrator -> True for everything
         # Bypass all channel-specific overrides
-        if base.administrator:
+        if is_admin:
             return Permissions.all()
 
-        # Apply @everyone allow/deny first since it's special
-        try:
-            maybe_everyone = self._overwrites[0]
-            if maybe_everyone.id == self.guild.id:
-                base.handle_overwrite(allow=maybe_everyone.allow, deny=maybe_everyone.deny)
-                remaining_overwrites = self._overwrites[1:]
-            else:
-                remaining_overwrites = self._overwrites
-        except IndexError:
-            remaining_overwrites = self._overwrites
-
-        denies = 0
-        allows = 0
-
-        # Apply channel specific role permission overwrites
-        for overwrite in remaining_overwrites:
-            if overwrite.is_role() and roles.has(overwrite.id):
-                denies |= overwrite.deny
-                allows |= overwrite.allow
-
-        base.handle_overwrite(allow=allows, deny=denies)
+        base.value = value
 
         # Apply member specific permission overwrites
-        for overwrite in remaining_overwrites:
+        for overwrite in self._overwrites:
             if overwrite.is_member() and overwrite.id == obj.id:
                 base.handle_overwrite(allow=overwrite.allow, deny=overwrite.deny)
                 break
@@ -820,6 +847,66 @@ class GuildChannel(ABC):
 
         return base
 
+    def permissions_for_members(
+        self,
+        members: Iterable[Member] | None = None,
+        /,
+        *,
+        ignore_timeout: bool = False,
+    ) -> dict[Member, Permissions]:
+        r"""Resolves the permissions of many members in this channel at once.
+
+        This is equivalent to calling :meth:`permissions_for` for each member,
+        but considerably faster for large amounts of members, since members are
+        grouped by their roles and the permissions are only resolved once for each
+        distinct set of roles. Only members with a member-specific overwrite or an
+        active timeout, and the guild owner, are resolved individually.
+
+        This is useful for audits, e.g. determining which members can view a channel.
+
+        .. versionadded:: 2.13
+
+        Parameters
+        ----------
+        members: :class:`~collections.abc.Iterable`\[:class:`~disnake.Member`] | :data:`None`
+            The members to resolve permissions for.
+            Defaults to all cached members of the guild.
+        ignore_timeout: :class:`bool`
+            Whether or not to ignore the members' timeouts.
+            Defaults to ``False``.
+
+        Returns
+        -------
+        :class:`dict`\[:class:`~disnake.Member`, :class:`~disnake.Permissions`]
+            The resolved permissions of each member.
+        """
+        guild = self.guild
+        if members is None:
+            members = guild._members.values()
+
+        permissions_for = self.permissions_for
+        owner_id = guild.owner_id
+        member_overwrites = {ow.id for ow in self._overwrites if ow.is_member()}
+        # role IDs -> resolved permission value
+        groups: dict[bytes, int] = {}
+        result: dict[Member, Permissions] = {}
+        for member in members:
+            if (
+                member.id == owner_id
+                or member.id in member_overwrites
+                or (not ignore_timeout and member.current_timeout)
+            ):
+                result[member] = permissions_for(member, ignore_timeout=ignore_timeout)
+                continue
+
+            key = member._roles.tobytes()
+            try:
+                value = groups[key]
+            except KeyError:
+                value = groups[key] = permissions_for(member, ignore_timeout=ignore_timeout).value
+            result[member] = Permissions._from_value(value)
+        return result
+
     async def delete(self, *, reason: str | None = None) -> None:
         """|coro|
 
@@ -1087,7 +1174,7 @@ class GuildChannel(ABC):
         obj = cls(state=self._state, guild=self.guild, data=data)
 
         # temporarily add it to the cache
-        self.guild._channels[obj.id] = obj  # pyright: ignore[reportArgumentType]
+        self.guild._add_channel(obj)  # pyright: ignore[reportArgumentType]
         return obj
 
     async def clone(self, *, name: str | None = None, reason: str | None = None) -> Self:
@@ -0,0 +1,920 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import sys
+import time
+import types
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, ItemsView, Iterable, Iterator, MutableMapping, ValuesView
+from typing import TYPE_CHECKING, Generic, TypeAlias, TypeVar
+
+if TYPE_CHECKING:
+    from .activity import ActivityTypes
+    from .emoji import Emoji
+    from .guild import Guild
+    from .member import Member
+    from .message import Message
+    from .state import ConnectionState
+    from .sticker import GuildSticker
+    from .types.activity import Activity as ActivityPayload
+    from .user import User
+
+__all__ = (
+    "CacheBackends",
+    "CacheStats",
+    "LRUCache",
+    "MemberCachePolicy",
+    "PresenceStore",
+    "TTLCache",
+    "UserCache",
+)
+
+V = TypeVar("V")
+
+CacheFactory: TypeAlias = "Callable[[], MutableMapping[int, V]]"
+
+
+class _BoundedCache(MutableMapping[int, V], Generic[V]):
+    # Insertion-ordered mapping that evicts the oldest entries once `maxsize` is exceeded.
+    # This mirrors the semantics of the `deque(maxlen=...)` previously used for the message cache.
+
+    __slots__ = ("_data", "maxsize")
+
+    def __init__(self, maxsize: int | None) -> None:
+        if maxsize is not None and maxsize <= 0:
+            msg = "maxsize must be greater than 0."
+            raise ValueError(msg)
+        self.maxsize: int | None = maxsize
+        self._data: OrderedDict[int, V] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} maxsize={self.maxsize} len={len(self)}>"
+
+    def __getitem__(self, key: int) -> V:
+        return self._data[key]
+
+    def __setitem__(self, key: int, value: V) -> None:
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        if self.maxsize is not None and len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __delitem__(self, key: int) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # iterating over values/items shouldn't count as an access in subclasses
+    def values(self) -> ValuesView[V]:
+        return self._data.values()
+
+    def items(self) -> ItemsView[int, V]:
+        return self._data.items()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class LRUCache(_BoundedCache[V]):
+    """A cache backend that keeps at most ``maxsize`` entries, evicting the least recently used ones.
+
+    Reading an entry (e.g. through :meth:`~dict.get`) or storing it marks it as recently used.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        The maximum number of entries to keep.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+
+    def __getitem__(self, key: int) -> V:
+        data = self._data
+        value = data[key]
+        data.move_to_end(key)
+        return value
+
+
+class UserCache(_BoundedCache["User"]):
+    """A user cache backend that keeps strong references to users, to be used as the ``users`` factory of :class:`CacheBackends`.
+
+    Unlike the default :class:`weakref.WeakValueDictionary`, lookups don't have to go through
+    weak references. To keep memory usage bounded, users are evicted once they're no longer
+    cached as a member of any guild (i.e. after they left the last guild they shared with the
+    client, or the guild was removed), and the least recently stored users are evicted once
+    the cache exceeds ``maxsize`` users. Unlike :class:`LRUCache`, lookups don't
+    affect the eviction order, as that would make them considerably slower.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        The maximum number of users to keep. This should be comfortably larger than the
+        number of unique cached members, since users evicted while they're still referenced
+        by a member are recreated as separate objects the next time they're received.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+
+    # overridden to avoid going through `__getitem__` and a KeyError on misses
+    def get(self, key: int, default: User | None = None) -> User | None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._data.get(key, default)
+
+
+class TTLCache(MutableMapping[int, V], Generic[V]):
+    """A cache backend that evicts entries ``ttl`` seconds after they were last stored.
+
+    Expired entries are removed lazily, whenever the cache is accessed.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    ttl: :class:`float`
+        The number of seconds after which entries expire.
+    maxsize: :class:`int` | :data:`None`
+        The maximum number of entries to keep. If this is exceeded, the oldest
+        entries are evicted before they expire. Defaults to :data:`None`, i.e. unbounded.
+    """
+
+    __slots__ = ("_data", "maxsize", "ttl")
+
+    def __init__(self, ttl: float, *, maxsize: int | None = None) -> None:
+        if ttl <= 0:
+            msg = "ttl must be greater than 0."
+            raise ValueError(msg)
+        if maxsize is not None and maxsize <= 0:
+            msg = "maxsize must be greater than 0."
+            raise ValueError(msg)
+        self.ttl: float = ttl
+        self.maxsize: int | None = maxsize
+        # values are stored alongside their expiry time, ordered by expiry
+        self._data: OrderedDict[int, tuple[float, V]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<TTLCache ttl={self.ttl} maxsize={self.maxsize} len={len(self)}>"
+
+    def _expire(self) -> None:
+        data = self._data
+        now = time.monotonic()
+        while data:
+            key = next(iter(data))
+            if data[key][0] > now:
+                break
+            del data[key]
+
+    def __getitem__(self, key: int) -> V:
+        expires, value = self._data[key]
+        if expires <= time.monotonic():
+            del self._data[key]
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: int, value: V) -> None:
+        self._expire()
+        data = self._data
+        data[key] = (time.monotonic() + self.ttl, value)
+        data.move_to_end(key)
+        if self.maxsize is not None and len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __delitem__(self, key: int) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)  # pyright: ignore[reportArgumentType]
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __iter__(self) -> Iterator[int]:
+        self._expire()
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class MemberCachePolicy:
+    """A factory for bounded member caches, to be used as the ``members`` factory of :class:`CacheBackends`.
+
+    Members are evicted from the cache of each guild once the cache exceeds ``max_size``
+    members, or once they have been idle for ``ttl`` seconds, starting with the least
+    recently active members. Receiving a message, voice state update or interaction
+    from a member counts as activity, as does a member update.
+    Expired members are removed lazily, when they are looked up or when another
+    member is added to the cache.
+
+    The client's own member and members connected to a voice channel are never evicted.
+
+    .. note::
+        Since not all members are kept in the cache, :attr:`Guild.chunked` will generally
+        be ``False`` for guilds with more than ``max_size`` members.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    max_size: :class:`int` | :data:`None`
+        The maximum number of members to keep per guild, not counting pinned members.
+        Defaults to :data:`None`, i.e. unbounded.
+    ttl: :class:`float` | :data:`None`
+        The number of seconds after which idle members are evicted.
+        Defaults to :data:`None`, i.e. members don't expire.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=disnake.CacheBackends(
+                members=disnake.MemberCachePolicy(max_size=5000, ttl=3600),
+            ),
+        )
+    """
+
+    __slots__ = ("max_size", "ttl")
+
+    def __init__(self, *, max_size: int | None = None, ttl: float | None = None) -> None:
+        if max_size is not None and max_size <= 0:
+            msg = "max_size must be greater than 0."
+            raise ValueError(msg)
+        if ttl is not None and ttl <= 0:
+            msg = "ttl must be greater than 0."
+            raise ValueError(msg)
+        self.max_size: int | None = max_size
+        self.ttl: float | None = ttl
+
+    def __repr__(self) -> str:
+        return f"<MemberCachePolicy max_size={self.max_size} ttl={self.ttl}>"
+
+    def __call__(self) -> _MemberCache:
+        return _MemberCache(self)
+
+
+class _MemberCache(MutableMapping[int, "Member"]):
+    # Members ordered from least to most recently active, see `MemberCachePolicy`.
+
+    __slots__ = ("_active", "_data", "_owner", "policy")
+
+    def __init__(self, policy: MemberCachePolicy) -> None:
+        self.policy: MemberCachePolicy = policy
+        self._data: OrderedDict[int, Member] = OrderedDict()
+        # timestamp of the last activity of each member, only used with a ttl
+        self._active: dict[int, float] = {}
+        # the guild this cache belongs to, which is notified of evicted members
+        self._owner: Guild | None = None
+
+    def __repr__(self) -> str:
+        return f"<_MemberCache policy={self.policy!r} len={len(self)}>"
+
+    @staticmethod
+    def _is_pinned(member: Member) -> bool:
+        return member.id == member._state.self_id or member.id in member.guild._voice_states
+
+    def touch(self, member_id: int) -> None:
+        data = self._data
+        if member_id in data:
+            data.move_to_end(member_id)
+            if self.policy.ttl is not None:
+                self._active[member_id] = time.monotonic()
+
+    def _evict(self) -> None:
+        data = self._data
+        max_size, ttl = self.policy.max_size, self.policy.ttl
+        deadline = time.monotonic() - ttl if ttl is not None else None
+
+        # pinned members are moved to the end, so each member is checked at most once
+        for _ in range(len(data)):
+            member_id, member = next(iter(data.items()))
+            expired = deadline is not None and self._active.get(member_id, 0) <= deadline
+            if not expired and (max_size is None or len(data) <= max_size):
+                break
+            if self._is_pinned(member):
+                self.touch(member_id)
+            else:
+                self._remove_evicted(member_id, member)
+
+    def _remove_evicted(self, member_id: int, member: Member) -> None:
+        del self._data[member_id]
+        self._active.pop(member_id, None)
+        if self._owner is not None:
+            self._owner._on_member_evicted(member)
+
+    def __getitem__(self, key: int) -> Member:
+        member = self._data[key]
+        ttl = self.policy.ttl
+        if (
+            ttl is not None
+            and self._active.get(key, 0) <= time.monotonic() - ttl
+            and not self._is_pinned(member)
+        ):
+            self._remove_evicted(key, member)
+            raise KeyError(key)
+        return member
+
+    def __setitem__(self, key: int, value: Member) -> None:
+        self._data[key] = value
+        self.touch(key)
+        self._evict()
+
+    def __delitem__(self, key: int) -> None:
+        del self._data[key]
+        self._active.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        # unlike the other caches, expired members are evicted (and the guild is notified)
+        # here as well, so that `in` agrees with lookups; this doesn't affect the order
+        try:
+            self[key]  # pyright: ignore[reportArgumentType]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def values(self) -> ValuesView[Member]:
+        return self._data.values()
+
+    def items(self) -> ItemsView[int, Member]:
+        return self._data.items()
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._active.clear()
+
+
+def _peek(cache: MutableMapping[int, V], key: int) -> V | None:
+    # Returns an entry without side effects on the bounded caches, i.e. without
+    # marking it as recently used or removing it if it expired.
+    if isinstance(cache, (_BoundedCache, _MemberCache)):
+        return cache._data.get(key)  # pyright: ignore[reportReturnType]
+    if isinstance(cache, TTLCache):
+        entry = cache._data.get(key)
+        return entry[1] if entry is not None else None  # pyright: ignore[reportReturnType]
+    return cache.get(key)
+
+
+# the fields that are the same for all members with the same activity
+_SHARED_ACTIVITY_FIELDS = (
+    "type",
+    "name",
+    "url",
+    "application_id",
+    "details",
+    "details_url",
+    "state",
+    "state_url",
+    "assets",
+    "emoji",
+    "buttons",
+    "flags",
+    "platform",
+    "status_display_type",
+)
+# the fields that usually differ between members, which are set on a copy of the shared activity
+_MEMBER_ACTIVITY_FIELDS = ("created_at", "timestamps", "id")
+# activities with any of these fields belong to a specific session
+_SESSION_ACTIVITY_FIELDS = ("session_id", "sync_id", "party", "secrets")
+
+
+class PresenceStore:
+    """Deduplicates the presences of members, to be used as the ``presences`` option of :class:`CacheBackends`.
+
+    The data of identical activities (e.g. the same game or custom status) is only created
+    once and shared between all members, and the overall and per-client statuses of members
+    are shared as well. This reduces the memory usage of bots with the
+    :attr:`Intents.presences` intent, where activities usually take up most of the
+    memory used by members.
+
+    Activities are considered identical if their type, name, details, state, assets,
+    emoji, etc. are equal. Each member still gets its own activity object with its own
+    ``created_at``, ``start`` and ``end``, which only references the shared data, so
+    :attr:`Member.activities` is the same as without the store. Activities tied to a
+    specific session, like :class:`Spotify` or activities with a party, are not shared.
+
+    Up to ``max_size`` distinct activities are kept for deduplication, evicting the least
+    recently seen activities first; evicted activities are still kept by the members
+    referencing them, but aren't shared with new presences anymore.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    max_size: :class:`int`
+        The maximum number of distinct activities to keep. Defaults to ``10000``.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The number of received activities that were shared with an existing activity.
+    misses: :class:`int`
+        The number of received activities that had to be created.
+    """
+
+    __slots__ = ("_activities", "hits", "max_size", "misses")
+
+    def __init__(self, *, max_size: int = 10_000) -> None:
+        if max_size <= 0:
+            msg = "max_size must be greater than 0."
+            raise ValueError(msg)
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        # repr of shared activity fields -> activity
+        self._activities: OrderedDict[str, ActivityTypes] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<PresenceStore max_size={self.max_size} len={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._activities)
+
+    def clear(self) -> None:
+        """Removes all activities from the store, and resets the statistics."""
+        self._activities.clear()
+        self.hits = self.misses = 0
+
+    def _get_activities(
+        self, data: list[ActivityPayload], state: ConnectionState
+    ) -> tuple[ActivityTypes, ...]:
+        if not data:
+            return ()
+
+        from .activity import create_activity
+
+        activities = self._activities
+        result: list[ActivityTypes] = []
+        for activity_data in data:
+            if any(field in activity_data for field in _SESSION_ACTIVITY_FIELDS):
+                self.misses += 1
+                result.append(create_activity(activity_data, state=state))
+                continue
+
+            shared = {
+                field: activity_data[field]
+                for field in _SHARED_ACTIVITY_FIELDS
+                if field in activity_data
+            }
+            # payloads of identical activities have the same key order, so their reprs are equal;
+            # this is considerably faster than serializing them to json
+            key = repr(shared)
+            activity = activities.get(key)
+            if activity is None:
+                self.misses += 1
+                activities[key] = activity = create_activity(shared, state=state)  # pyright: ignore[reportArgumentType]
+                if len(activities) > self.max_size:
+                    activities.popitem(last=False)
+            else:
+                self.hits += 1
+                activities.move_to_end(key)
+
+            if any(field in activity_data for field in _MEMBER_ACTIVITY_FIELDS):
+                activity = _copy_activity(activity, activity_data)
+            result.append(activity)
+        return tuple(result)
+
+
+def _copy_activity(activity: ActivityTypes, data: ActivityPayload) -> ActivityTypes:
+    # shallow copy that references the shared data, with the member's own timestamps
+    from .activity import Activity
+
+    cls = type(activity)
+    copy = cls.__new__(cls)
+    for descriptor in _get_slot_descriptors(cls):
+        descriptor.__set__(copy, descriptor.__get__(activity))
+    copy._created_at = data.get("created_at")
+    copy._timestamps = data.get("timestamps") or {}
+    if isinstance(copy, Activity):
+        copy.id = data.get("id")
+    return copy
+
+
+class CacheStats:
+    r"""Statistics about the internal caches of a :class:`Client`, see :meth:`Client.cache_stats`.
+
+    Sizes are estimated by measuring a small sample of entries of each cache,
+    counting each entry along with the strings, numbers and containers it holds,
+    but not other objects that may be shared with other entries (like the guild of a member).
+    They are meant for monitoring trends, not for exact accounting.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    counts: :class:`dict`\[:class:`str`, :class:`int`]
+        The number of entries per cache. For the client, this contains the keys ``users``,
+        ``guilds``, ``members``, ``messages``, ``channels``, ``threads``, ``emojis``,
+        ``stickers``, ``views``, ``modals``, ``chunk_requests`` and ``wait_for``.
+        For a guild, this contains the keys ``members``, ``messages``, ``channels``,
+        ``threads``, ``emojis`` and ``stickers``.
+    sizes: :class:`dict`\[:class:`str`, :class:`int`]
+        The estimated number of bytes used per cache, with the same keys as :attr:`counts`.
+    guilds: :class:`dict`\[:class:`int`, :class:`CacheStats`]
+        The statistics of each guild, keyed by guild ID.
+        Empty unless requested using ``per_guild=True``.
+    """
+
+    __slots__ = ("counts", "guilds", "sizes")
+
+    def __init__(
+        self,
+        counts: dict[str, int],
+        sizes: dict[str, int],
+        guilds: dict[int, CacheStats] | None = None,
+    ) -> None:
+        self.counts: dict[str, int] = counts
+        self.sizes: dict[str, int] = sizes
+        self.guilds: dict[int, CacheStats] = guilds or {}
+
+    def __repr__(self) -> str:
+        return f"<CacheStats entries={sum(self.counts.values())} size={self.size}>"
+
+    @property
+    def size(self) -> int:
+        """:class:`int`: The estimated total number of bytes used by all caches."""
+        return sum(self.sizes.values())
+
+
+# number of entries measured per cache in `_estimate_size`
+_SIZE_SAMPLES = 16
+# types whose instances are owned by the object referencing them, for size estimates
+_OWNED_TYPES = (str, bytes, int, float, list, tuple, dict, set, frozenset)
+_slot_descriptors: dict[type, tuple[types.MemberDescriptorType, ...]] = {}
+
+
+def _get_slot_descriptors(cls: type) -> tuple[types.MemberDescriptorType, ...]:
+    try:
+        return _slot_descriptors[cls]
+    except KeyError:
+        pass
+
+    descriptors = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            # read slots through their member descriptors, to not trigger lazy attributes
+            descriptor = base.__dict__.get(name)
+            if isinstance(descriptor, types.MemberDescriptorType):
+                descriptors.append(descriptor)
+
+    result = _slot_descriptors[cls] = tuple(descriptors)
+    return result
+
+
+def _object_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    values: list[object] = []
+    for descriptor in _get_slot_descriptors(type(obj)):
+        try:
+            values.append(descriptor.__get__(obj))
+        except AttributeError:
+            pass
+    if (attrs := getattr(obj, "__dict__", None)) is not None:
+        size += sys.getsizeof(attrs)
+        values.extend(attrs.values())
+
+    for value in values:
+        # `bool` and `None` are singletons
+        if isinstance(value, _OWNED_TYPES) and not isinstance(value, bool):
+            size += sys.getsizeof(value)
+    return size
+
+
+def _estimate_size(entries: Iterable[object], count: int) -> int:
+    # extrapolates the average size of the first few entries to all entries
+    if not count:
+        return 0
+    sample = list(itertools.islice(entries, _SIZE_SAMPLES))
+    if not sample:
+        return 0
+    return sum(map(_object_size, sample)) * count // len(sample)
+
+
+class _UserGuildIndex:
+    # Maps user IDs to the IDs of the cached guilds they're cached as a member of.
+    # Most users only share a single guild with the client, so the guild ID is stored
+    # directly in that case, and a set is only created for users in multiple guilds.
+
+    __slots__ = ("_data",)
+
+    def __init__(self) -> None:
+        self._data: dict[int, int | set[int]] = {}
+
+    def __repr__(self) -> str:
+        return f"<_UserGuildIndex len={len(self)}>"
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, user_id: int) -> tuple[int, ...]:
+        guild_ids = self._data.get(user_id)
+        if guild_ids is None:
+            return ()
+        if isinstance(guild_ids, set):
+            return tuple(guild_ids)
+        return (guild_ids,)
+
+    def add(self, user_id: int, guild_id: int) -> None:
+        data = self._data
+        guild_ids = data.get(user_id)
+        if guild_ids is None:
+            data[user_id] = guild_id
+        elif isinstance(guild_ids, set):
+            guild_ids.add(guild_id)
+        elif guild_ids != guild_id:
+            data[user_id] = {guild_ids, guild_id}
+
+    def discard(self, user_id: int, guild_id: int) -> None:
+        data = self._data
+        guild_ids = data.get(user_id)
+        if guild_ids is None:
+            return
+        if isinstance(guild_ids, set):
+            guild_ids.discard(guild_id)
+            if len(guild_ids) == 1:
+                data[user_id] = next(iter(guild_ids))
+        elif guild_ids == guild_id:
+            del data[user_id]
+
+    def add_guild(self, guild_id: int, user_ids: Iterable[int]) -> None:
+        add = self.add
+        for user_id in user_ids:
+            add(user_id, guild_id)
+
+    def discard_guild(self, guild_id: int, user_ids: Iterable[int]) -> None:
+        discard = self.discard
+        for user_id in user_ids:
+            discard(user_id, guild_id)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class _MemberNameIndex:
+    # Per-guild index of member nicknames, global names and usernames, see `CacheBackends.member_name_index`.
+    #
+    # Exact lookups use a dict per name field. Prefix lookups use a list of
+    # (casefolded name, member ID) entries sorted by name, which is searched using bisection.
+    # To keep updates cheap, new entries are appended to a pending list and only merged into
+    # the sorted list on the next search (which is linear at worst, since timsort merges the
+    # sorted runs), and removed entries are left in the list and skipped when searching,
+    # until they make up more than half of it.
+
+    __slots__ = ("_entries", "_exact", "_pending", "_sorted", "_stale")
+
+    def __init__(self) -> None:
+        # member ID -> (nick, global name, username), casefolded names
+        self._entries: dict[int, tuple[tuple[str | None, str | None, str], frozenset[str]]] = {}
+        # nick/global name/username -> member IDs (as an ordered set)
+        self._exact: tuple[dict[str, dict[int, None]], ...] = ({}, {}, {})
+        self._sorted: list[tuple[str, int]] = []
+        self._pending: list[tuple[str, int]] = []
+        self._stale: int = 0
+
+    def __repr__(self) -> str:
+        return f"<_MemberNameIndex len={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, member: Member) -> None:
+        member_id = member.id
+        names = (member.nick, member.global_name, member.name)
+        entry = self._entries.get(member_id)
+        if entry is not None:
+            if entry[0] == names:
+                return
+            self.discard(member_id)
+
+        folded = frozenset(name.casefold() for name in names if name)
+        self._entries[member_id] = (names, folded)
+        for exact, name in zip(self._exact, names, strict=True):
+            if name is not None:
+                exact.setdefault(name, {})[member_id] = None
+        self._pending.extend((name, member_id) for name in folded)
+
+    def discard(self, member_id: int) -> None:
+        entry = self._entries.pop(member_id, None)
+        if entry is None:
+            return
+        names, folded = entry
+        for exact, name in zip(self._exact, names, strict=True):
+            if name is not None:
+                ids = exact.get(name)
+                if ids is not None:
+                    ids.pop(member_id, None)
+                    if not ids:
+                        del exact[name]
+        self._stale += len(folded)
+
+    def get(self, name: str) -> Iterator[int]:
+        # yields the IDs of members with the given nickname, global name or username, in that order
+        for exact in self._exact:
+            ids = exact.get(name)
+            if ids:
+                yield from ids
+
+    def get_username(self, name: str) -> Iterator[int]:
+        ids = self._exact[2].get(name)
+        if ids:
+            yield from ids
+
+    def _flush(self) -> None:
+        entries = self._entries
+        if self._stale > len(self._sorted) // 2:
+            self._sorted = [
+                (name, member_id) for member_id, (_, folded) in entries.items() for name in folded
+            ]
+            self._sorted.sort()
+            self._pending.clear()
+            self._stale = 0
+        elif self._pending:
+            self._sorted.extend(self._pending)
+            self._sorted.sort()
+            self._pending.clear()
+
+    def search(self, prefix: str, limit: int) -> list[int]:
+        self._flush()
+        prefix = prefix.casefold()
+        entries = self._entries
+        data = self._sorted
+        result: dict[int, None] = {}
+        for i in range(bisect.bisect_left(data, (prefix,)), len(data)):
+            name, member_id = data[i]
+            if not name.startswith(prefix):
+                break
+            entry = entries.get(member_id)
+            # skip entries of removed members, or names that have changed since
+            if entry is None or name not in entry[1]:
+                continue
+            result[member_id] = None
+            if len(result) >= limit:
+                break
+        return list(result)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        for exact in self._exact:
+            exact.clear()
+        self._sorted.clear()
+        self._pending.clear()
+        self._stale = 0
+
+
+class CacheBackends:
+    """Configures the storage used for the internal caches of the client.
+
+    Each cache is created by calling the corresponding factory without arguments.
+    Any :class:`collections.abc.MutableMapping` keyed by the entity's ID can be used
+    as a cache backend, which allows using bounded caches like :class:`LRUCache` and
+    :class:`TTLCache`, or custom implementations, e.g. storing objects off-heap.
+
+    Backends may drop entries at any time; the library treats a missing entry the same
+    way as an uncached entity. Caches are recreated whenever the client's state is
+    cleared, e.g. when a new session is started.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    users: Callable[[], MutableMapping[:class:`int`, :class:`User`]]
+        The factory for the user cache.
+        Defaults to :class:`weakref.WeakValueDictionary`, which only keeps users that
+        are referenced elsewhere, e.g. by a cached member or message.
+        See :class:`UserCache` for a faster cache that holds strong references.
+    guilds: Callable[[], MutableMapping[:class:`int`, :class:`Guild`]]
+        The factory for the guild cache. Defaults to :class:`dict`.
+    emojis: Callable[[], MutableMapping[:class:`int`, :class:`Emoji`]]
+        The factory for the emoji cache. Defaults to :class:`dict`.
+    stickers: Callable[[], MutableMapping[:class:`int`, :class:`GuildSticker`]]
+        The factory for the sticker cache. Defaults to :class:`dict`.
+    members: Callable[[], MutableMapping[:class:`int`, :class:`Member`]]
+        The factory for the member cache, which is called once for every guild.
+        Defaults to :class:`dict`. Which members are cached in the first place
+        is still controlled by :class:`MemberCacheFlags`.
+        See :class:`MemberCachePolicy` for a bounded member cache.
+    messages: Callable[[], MutableMapping[:class:`int`, :class:`Message`]] | :data:`None`
+        The factory for the message cache. Iterating over the cache must yield message IDs
+        from oldest to newest. Defaults to :data:`None`, which keeps the most recent
+        ``max_messages`` messages (see :class:`Client`).
+        The message cache is always disabled if ``max_messages`` is :data:`None`.
+    compact_members: :class:`bool`
+        Whether to store members in a more compact way, reducing the memory
+        usage of large member caches. Defaults to ``False``.
+
+        If enabled, names and avatar hashes of users and members are interned,
+        members with identical roles share the same list of role IDs,
+        and :attr:`Member.activities` are only created when accessed.
+    lazy_messages: :class:`bool`
+        Whether to create the reactions, attachments, embeds, stickers, components, poll,
+        interaction metadata, referenced message and forwarded messages of received
+        messages only when they're first accessed, instead of when the message is received.
+        This reduces the memory usage of the message cache and the time spent
+        processing messages that are never accessed again. Defaults to ``False``.
+    member_name_index: :class:`bool`
+        Whether to keep an index of the nicknames, global names and usernames of the
+        cached members of each guild. This makes :meth:`Guild.get_member_named`
+        (and therefore :class:`~ext.commands.MemberConverter`) and
+        :meth:`Guild.search_cached_members` considerably faster in large guilds,
+        at the cost of additional memory usage. Defaults to ``False``.
+    presences: :class:`PresenceStore` | :data:`None`
+        The store used to deduplicate the statuses and activities of members.
+        Defaults to :data:`None`, i.e. every member has its own activities.
+    """
+
+    __slots__ = (
+        "compact_members",
+        "emojis",
+        "guilds",
+        "lazy_messages",
+        "member_name_index",
+        "members",
+        "messages",
+        "presences",
+        "stickers",
+        "users",
+    )
+
+    def __init__(
+        self,
+        *,
+        users: CacheFactory[User] = weakref.WeakValueDictionary,
+        guilds: CacheFactory[Guild] = dict,
+        emojis: CacheFactory[Emoji] = dict,
+        stickers: CacheFactory[GuildSticker] = dict,
+        members: CacheFactory[Member] = dict,
+        messages: CacheFactory[Message] | None = None,
+        compact_members: bool = False,
+        lazy_messages: bool = False,
+        member_name_index: bool = False,
+        presences: PresenceStore | None = None,
+    ) -> None:
+        for name, factory in (
+            ("users", users),
+            ("guilds", guilds),
+            ("emojis", emojis),
+            ("stickers", stickers),
+            ("members", members),
+        ):
+            if not callable(factory):
+                msg = f"{name} cache factory must be callable, not {type(factory)!r}."
+                raise TypeError(msg)
+        if messages is not None and not callable(messages):
+            msg = f"messages cache factory must be callable, not {type(messages)!r}."
+            raise TypeError(msg)
+        if presences is not None and not isinstance(presences, PresenceStore):
+            msg = f"presences must be PresenceStore, not {type(presences)!r}."
+            raise TypeError(msg)
+
+        self.users: CacheFactory[User] = users
+        self.guilds: CacheFactory[Guild] = guilds
+        self.emojis: CacheFactory[Emoji] = emojis
+        self.stickers: CacheFactory[GuildSticker] = stickers
+        self.members: CacheFactory[Member] = members
+        self.messages: CacheFactory[Message] | None = messages
+        self.compact_members: bool = compact_members
+        self.lazy_messages: bool = lazy_messages
+        self.member_name_index: bool = member_name_index
+        self.presences: PresenceStore | None = presences
+
+    def __repr__(self) -> str:
+        inner = " ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"<CacheBackends {inner}>"
+
+    def _create_message_cache(self, max_messages: int) -> MutableMapping[int, Message]:
+        if self.messages is None:
+            return _BoundedCache(max_messages)
+        return self.messages()
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
+import os
 import signal
 import sys
 import traceback
 import types
-from collections.abc import Callable, Coroutine, Generator, Mapping, Sequence
+from collections.abc import Callable, Coroutine, Generator, Iterable, Mapping, Sequence
 from datetime import datetime, timedelta
 from errno import ECONNRESET
 from typing import (
@@ -35,6 +37,7 @@ from .app_commands import (
 from .appinfo import AppInfo
 from .application_role_connection import ApplicationRoleConnectionMetadata
 from .backoff import ExponentialBackoff
+from .cache import CacheStats, _estimate_size
 from .channel import PartialMessageable, _threaded_channel_factory
 from .emoji import Emoji
 from .entitlement import Entitlement
@@ -47,8 +50,14 @@ from .errors import (
     PrivilegedIntentsRequired,
     SessionStartLimitReached,
 )
-from .flags import ApplicationFlags, Intents, MemberCacheFlags
-from .gateway import DiscordWebSocket, ReconnectWebSocket
+from .flags import (
+    _EVENT_INTENTS,
+    _GATEWAY_EVENT_INTENTS,
+    ApplicationFlags,
+    Intents,
+    MemberCacheFlags,
+)
+from .gateway import DiscordWebSocket, ReconnectWebSocket, SessionFile
 from .guild import Guild, GuildBuilder
 from .guild_preview import GuildPreview
 from .http import HTTPClient
@@ -57,7 +66,10 @@ from .invite import Invite
 from .iterators import EntitlementIterator, GuildIterator
 from .mentions import AllowedMentions
 from .object import Object
+from .profiler import HandlerProfiler, LoopLagMonitor
+from .recorder import GatewayRecorder
 from .sku import SKU
+from .snapshot import CacheSnapshot
 from .soundboard import GuildSoundboardSound, SoundboardSound
 from .stage_instance import StageInstance
 from .state import ConnectionState
@@ -78,6 +90,7 @@ if TYPE_CHECKING:
     from .abc import GuildChannel, PrivateChannel, Snowflake, SnowflakeTime
     from .app_commands import APIApplicationCommand, MessageCommand, SlashCommand, UserCommand
     from .asset import AssetBytes
+    from .cache import CacheBackends
     from .channel import DMChannel
     from .member import Member
     from .message import Message
@@ -92,6 +105,7 @@ __all__ = (
     "Client",
     "SessionStartLimit",
     "GatewayParams",
+    "IntentsReport",
 )
 
 T = TypeVar("T")
@@ -203,6 +217,60 @@ class GatewayParams(NamedTuple):
     zlib: bool = True
 
 
+class IntentsReport:
+    r"""Compares the intents of a :class:`Client` with the minimal intents
+    required by its listeners and caches, see :meth:`Client.intents_report`.
+
+    Savings are estimated from the gateway events received so far, i.e. events that
+    would not have been sent with the minimal intents. Since the size of other payloads
+    (e.g. ``GUILD_CREATE``) also depends on the intents, this is a lower bound.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    current: :class:`Intents`
+        The intents currently configured for the client.
+    minimal: :class:`Intents`
+        The minimal intents, see :meth:`Client.minimal_intents`.
+    events: :class:`dict`\[:class:`str`, :class:`int`]
+        The number of received gateway events per event type (e.g. ``PRESENCE_UPDATE``)
+        that would not have been received with the minimal intents.
+    events_per_second: :class:`float`
+        The rate of these events, summed over all shards.
+    bytes_per_second: :class:`float`
+        The rate of decompressed gateway data of these events, summed over all shards.
+    """
+
+    __slots__ = ("current", "minimal", "events", "events_per_second", "bytes_per_second")
+
+    def __init__(
+        self,
+        *,
+        current: Intents,
+        minimal: Intents,
+        events: dict[str, int],
+        events_per_second: float,
+        bytes_per_second: float,
+    ) -> None:
+        self.current: Intents = current
+        self.minimal: Intents = minimal
+        self.events: dict[str, int] = events
+        self.events_per_second: float = events_per_second
+        self.bytes_per_second: float = bytes_per_second
+
+    def __repr__(self) -> str:
+        return (
+            f"<IntentsReport current={self.current!r} minimal={self.minimal!r} "
+            f"events_per_second={self.events_per_second:.2f} bytes_per_second={self.bytes_per_second:.0f}>"
+        )
+
+    @property
+    def unused(self) -> Intents:
+        """:class:`Intents`: The intents that are enabled, but not required."""
+        return Intents._from_value(self.current.value & ~self.minimal.value)
+
+
 # used for typing the ws parameter dict in the connect() loop
 class _WebSocketParams(TypedDict):
     initial: bool
@@ -254,6 +322,13 @@ class Client:
 
         .. versionadded:: 1.5
 
+    enforce_minimal_intents: :class:`bool`
+        Whether to only request the intents required by the registered listeners and caches
+        when connecting, see :meth:`minimal_intents`. Intents that are not enabled in
+        ``intents`` are never added. Defaults to ``False``.
+
+        .. versionadded:: 2.13
+
     member_cache_flags: :class:`MemberCacheFlags`
         Allows for finer control over how the library caches members.
         If not given, defaults to cache as much as possible with the
@@ -261,6 +336,13 @@ class Client:
 
         .. versionadded:: 1.5
 
+    cache_backends: :class:`CacheBackends` | :data:`None`
+        Allows replacing the storage used for the user, guild, emoji, sticker,
+        member and message caches, e.g. with bounded :class:`LRUCache` instances.
+        If not given, defaults to the regular in-memory caches.
+
+        .. versionadded:: 2.13
+
     chunk_guilds_at_startup: :class:`bool`
         Indicates if :func:`.on_ready` should be delayed to chunk all guilds
         at start-up if necessary. This operation is incredibly slow for large
@@ -269,6 +351,27 @@ class Client:
 
         .. versionadded:: 1.5
 
+    chunk_priority: Callable[[:class:`Guild`], Any] | :data:`None`
+        A function returning a sort key for guilds whose members are requested,
+        e.g. at start-up. Guilds with lower keys are requested first.
+        Defaults to :attr:`Guild.member_count`, i.e. smaller guilds are requested first.
+
+        Regardless of the order, guilds are requested concurrently, with the number of
+        in-flight requests (and their combined member counts) limited per shard.
+
+        .. versionadded:: 2.13
+
+    guild_cache_filter: Callable[[:class:`int`], :class:`bool`] | :data:`None`
+        A function that decides whether a guild is fully cached, given its ID.
+        Defaults to :data:`None`, i.e. all guilds are fully cached.
+
+        For guilds that are not fully cached, only the guild itself along with its
+        channels, roles and the client's own member is cached, but not its other members,
+        emojis, stickers or threads. Events for these guilds are still received
+        and dispatched. See :attr:`guild_cache_filter` for changing this at runtime.
+
+        .. versionadded:: 2.13
+
     status: class:`str` | :class:`.Status` | :data:`None`
         A status to start your presence with upon logging on to Discord.
     activity: :class:`.BaseActivity` | :data:`None`
@@ -348,6 +451,69 @@ class Client:
 
         .. versionadded:: 2.6
 
+    gateway_recorder: :class:`.GatewayRecorder` | :data:`None`
+        A recorder that all frames received from the gateway are written to,
+        which can later be replayed using :class:`.GatewayReplay`.
+        The recorder is closed when the client is closed.
+        Defaults to :data:`None`.
+
+        .. versionadded:: 2.13
+
+    handler_profiler: :class:`.HandlerProfiler` | :data:`None`
+        A profiler measuring the durations of event listeners and commands.
+        See :attr:`handler_profiler` for changing this at runtime.
+        Defaults to :data:`None`.
+
+        .. versionadded:: 2.13
+
+    loop_lag_monitor: :class:`.LoopLagMonitor` | :data:`None`
+        A monitor measuring how long the event loop is blocked, which is run
+        while the client is connected. Defaults to :data:`None`.
+
+        .. versionadded:: 2.13
+
+    session_file: :class:`str` | :class:`os.PathLike` | :data:`None`
+        The path of a file to persist the gateway session state of each shard to.
+        If set, the client attempts to resume the stored sessions when connecting,
+        instead of starting new sessions. This allows quickly reconnecting after a restart,
+        as long as the session is still resumable; otherwise, a new session is started as usual.
+        Defaults to :data:`None`.
+
+        The file is updated whenever a session is started or resumed, after each acknowledged
+        heartbeat (to keep the stored sequence recent in case the process crashes),
+        and when the client is closed. Writes happen in a background thread.
+
+        .. note::
+            After resuming a session from a previous process, no ``GUILD_CREATE`` events
+            are received, which means the cache will initially be empty.
+            :func:`on_ready` is dispatched once the session is resumed.
+
+        .. warning::
+            The file can be used to resume the session, and should be treated
+            with the same care as the bot token.
+
+        .. versionadded:: 2.13
+
+    cache_snapshot: :class:`str` | :class:`os.PathLike` | :data:`None`
+        The path of a file to save a snapshot of the guild cache (including channels,
+        roles, members, emojis and stickers) to when the client is closed.
+        When a session stored in ``session_file`` is resumed, the cached guilds of
+        that session are restored from the snapshot, making the cache usable immediately
+        without waiting for ``GUILD_CREATE`` events or member chunks.
+        Requires ``session_file`` to be set. Defaults to :data:`None`.
+
+        A snapshot is only restored if it was created for the same session at the same
+        sequence number as the session being resumed, and by the same library version;
+        otherwise, it is discarded. If the session cannot be resumed, the restored
+        guilds are removed again when the new session starts.
+
+        .. warning::
+            Snapshots contain serialized Python objects that are executed when loaded.
+            Only load snapshots created by the bot itself, and make sure the file
+            cannot be modified by other users.
+
+        .. versionadded:: 2.13
+
     Attributes
     ----------
     ws
@@ -378,6 +544,11 @@ class Client:
         localization_provider: LocalizationProtocol | None = None,
         strict_localization: bool = False,
         gateway_params: GatewayParams | None = None,
+        gateway_recorder: GatewayRecorder | None = None,
+        handler_profiler: HandlerProfiler | None = None,
+        loop_lag_monitor: LoopLagMonitor | None = None,
+        session_file: str | os.PathLike[str] | None = None,
+        cache_snapshot: str | os.PathLike[str] | None = None,
         connector: aiohttp.BaseConnector | None = None,
         proxy: str | None = None,
         proxy_auth: aiohttp.BasicAuth | None = None,
@@ -390,8 +561,12 @@ class Client:
         activity: BaseActivity | None = None,
         status: Status | str | None = None,
         intents: Intents | None = None,
+        enforce_minimal_intents: bool = False,
         chunk_guilds_at_startup: bool | None = None,
+        chunk_priority: Callable[[Guild], Any] | None = None,
+        guild_cache_filter: Callable[[int], bool] | None = None,
         member_cache_flags: MemberCacheFlags | None = None,
+        cache_backends: CacheBackends | None = None,
     ) -> None:
         # self.ws is set in the connect method
         self.ws: DiscordWebSocket = None  # pyright: ignore[reportAttributeAccessIssue]
@@ -424,6 +599,17 @@ class Client:
 
         self._enable_debug_events: bool = enable_debug_events
         self._enable_gateway_error_handler: bool = enable_gateway_error_handler
+        if gateway_recorder is not None and not isinstance(gateway_recorder, GatewayRecorder):
+            msg = f"gateway_recorder must be GatewayRecorder, not {type(gateway_recorder)!r}."
+            raise TypeError(msg)
+        self._gateway_recorder: GatewayRecorder | None = gateway_recorder
+        self._handler_profiler: HandlerProfiler | None = None
+        self.handler_profiler = handler_profiler
+        if loop_lag_monitor is not None and not isinstance(loop_lag_monitor, LoopLagMonitor):
+            msg = f"loop_lag_monitor must be LoopLagMonitor, not {type(loop_lag_monitor)!r}."
+            raise TypeError(msg)
+        self._loop_lag_monitor: LoopLagMonitor | None = loop_lag_monitor
+        self._enforce_minimal_intents: bool = enforce_minimal_intents
         self._connection: ConnectionState = self._get_state(
             max_messages=max_messages,
             application_id=application_id,
@@ -434,11 +620,25 @@ class Client:
             status=status,
             intents=intents,
             chunk_guilds_at_startup=chunk_guilds_at_startup,
+            chunk_priority=chunk_priority,
+            guild_cache_filter=guild_cache_filter,
             member_cache_flags=member_cache_flags,
+            cache_backends=cache_backends,
         )
         self.shard_id: int | None = shard_id
         self.shard_count: int | None = shard_count
         self._connection.shard_count = shard_count
+        self._session_file: SessionFile | None = (
+            SessionFile(session_file, state=self._connection) if session_file is not None else None
+        )
+        if cache_snapshot is not None and session_file is None:
+            msg = "cache_snapshot requires session_file to be set."
+            raise ValueError(msg)
+        self._cache_snapshot: CacheSnapshot | None = (
+            CacheSnapshot(cache_snapshot, state=self._connection)
+            if cache_snapshot is not None
+            else None
+        )
 
         self._closed: bool = False
         self._ready: asyncio.Event = asyncio.Event()
@@ -501,7 +701,10 @@ class Client:
         status: str | Status | None,
         intents: Intents | None,
         chunk_guilds_at_startup: bool | None,
+        chunk_priority: Callable[[Guild], Any] | None,
+        guild_cache_filter: Callable[[int], bool] | None,
         member_cache_flags: MemberCacheFlags | None,
+        cache_backends: CacheBackends | None,
     ) -> ConnectionState:
         return ConnectionState(
             dispatch=self.dispatch,
@@ -518,7 +721,10 @@ class Client:
             status=status,
             intents=intents,
             chunk_guilds_at_startup=chunk_guilds_at_startup,
+            chunk_priority=chunk_priority,
+            guild_cache_filter=guild_cache_filter,
             member_cache_flags=member_cache_flags,
+            cache_backends=cache_backends,
         )
 
     def _handle_ready(self) -> None:
@@ -552,6 +758,20 @@ class Client:
             return self.ws.is_ratelimited()
         return False
 
+    @property
+    def gateway_queue_size(self) -> int:
+        """:class:`int`: The number of gateway commands (e.g. member chunk requests or
+        presence updates) currently waiting to be sent because of the gateway rate limit.
+
+        While rate limited, heartbeats and connection-related commands are sent first,
+        followed by voice state updates, member chunk requests, and all other commands.
+        Multiple waiting presence updates are combined, only the most recent one is sent.
+
+        .. versionadded:: 2.13
+        """
+        ws = self.ws
+        return ws.send_queue_size if ws else 0
+
     @property
     def user(self) -> ClientUser:
         """:class:`.ClientUser` | :data:`None`: Represents the connected client. :data:`None` if not logged in."""
@@ -587,9 +807,14 @@ class Client:
     def cached_messages(self) -> Sequence[Message]:
         r""":class:`~collections.abc.Sequence`\[:class:`.Message`]: Read-only list of messages the connected client has cached.
 
+        This is a view of the message cache that reflects later changes to the cache;
+        use ``list(client.cached_messages)`` for a copy, e.g. to iterate over it while awaiting.
+        Use :meth:`get_message` to look up a message by ID.
+
         .. versionadded:: 1.1
         """
-        return utils.SequenceProxy(self._connection._messages or [])
+        messages = self._connection._messages
+        return utils._MappingValuesProxy(messages if messages is not None else {})
 
     @property
     def private_channels(self) -> list[PrivateChannel]:
@@ -675,7 +900,7 @@ class Client:
         :class:`.Message` | :data:`None`
             The corresponding message.
         """
-        return utils.get(self.cached_messages, id=id)
+        return self._connection._get_message(id)
 
     @overload
     async def get_or_fetch_user(
@@ -730,7 +955,12 @@ class Client:
 
     async def _run_event(self, coro: CoroFunc, event_name: str, *args: Any, **kwargs: Any) -> None:
         try:
-            await coro(*args, **kwargs)
+            if (profiler := self._handler_profiler) is not None:
+                name = getattr(coro, "__qualname__", repr(coro))
+                with profiler._measure(event_name, name):
+                    await coro(*args, **kwargs)
+            else:
+                await coro(*args, **kwargs)
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -937,6 +1167,184 @@ class Client:
         """
         return types.MappingProxyType(self.extra_events)
 
+    def _listened_events(self) -> set[str]:
+        events = {
+            name[3:]
+            for name, listeners in self.extra_events.items()
+            if listeners and name.startswith("on_")
+        }
+        # pending `wait_for` calls
+        events.update(self._listeners)
+        # methods of subclasses, and handlers registered using `@client.event`
+        events.update(name[3:] for name in dir(self) if name.startswith("on_"))
+        return events
+
+    def minimal_intents(self) -> Intents:
+        """Returns the minimal intents required by the client.
+
+        This takes into account the events of all registered listeners (including
+        listeners of cogs and ``on_*`` methods), pending :meth:`wait_for` calls,
+        the :class:`MemberCacheFlags`, and whether guilds are chunked.
+        Intents that are currently not enabled are never included.
+
+        :attr:`Intents.guilds` and :attr:`Intents.voice_states` are always included,
+        since the library itself depends on them, e.g. connecting to voice channels
+        requires the client's own voice state updates.
+
+        Listeners added after connecting, or caches that are only used through methods
+        like :meth:`get_message`, cannot be accounted for.
+
+        .. versionadded:: 2.13
+
+        Returns
+        -------
+        :class:`Intents`
+            The minimal intents.
+        """
+        state = self._connection
+        value = Intents.guilds.flag
+        for event in self._listened_events():
+            value |= _EVENT_INTENTS.get(event, 0)
+
+        if state.member_cache_flags.joined or state._chunk_guilds:
+            value |= Intents.members.flag
+        # required for connecting to voice, see `VoiceClient.on_voice_state_update`
+        value |= Intents.voice_states.flag
+
+        return Intents._from_value(value & state._intents.value)
+
+    def intents_report(self) -> IntentsReport:
+        """Compares the current intents with the :meth:`minimal intents <minimal_intents>`,
+        and estimates the gateway traffic that would be saved by only requesting those.
+
+        .. versionadded:: 2.13
+
+        Returns
+        -------
+        :class:`IntentsReport`
+            The report.
+        """
+        current = self.intents
+        minimal = self.minimal_intents()
+
+        events: dict[str, int] = {}
+        events_per_second = bytes_per_second = 0.0
+        for stats in self._connection._gateway_stats.values():
+            elapsed = stats.elapsed
+            for event, count in stats.events.items():
+                flags = _GATEWAY_EVENT_INTENTS.get(event)
+                # only count events that none of the minimal intents would cause
+                if flags is None or flags & minimal.value:
+                    continue
+                events[event] = events.get(event, 0) + count
+                if elapsed > 0:
+                    events_per_second += count / elapsed
+                    bytes_per_second += stats.event_bytes[event] / elapsed
+
+        return IntentsReport(
+            current=current,
+            minimal=minimal,
+            events=events,
+            events_per_second=events_per_second,
+            bytes_per_second=bytes_per_second,
+        )
+
+    def _apply_minimal_intents(self) -> None:
+        if not self._enforce_minimal_intents:
+            return
+
+        state = self._connection
+        minimal = self.minimal_intents()
+        dropped = state._intents.value & ~minimal.value
+        if dropped:
+            names = [name for name, enabled in Intents._from_value(dropped) if enabled]
+            _log.warning("Not requesting unused intents: %s", ", ".join(names))
+            state._intents = minimal
+
+    def cache_stats(self, *, per_guild: bool = False) -> CacheStats:
+        """Returns the number of entries and their estimated size for each of the client's caches.
+
+        This only inspects a few entries of each cache, and is cheap enough
+        to be called periodically, e.g. for exporting metrics.
+
+        .. versionadded:: 2.13
+
+        Parameters
+        ----------
+        per_guild: :class:`bool`
+            Whether to include statistics for each guild in :attr:`CacheStats.guilds`.
+            This iterates over all cached messages, and is therefore more expensive.
+
+        Returns
+        -------
+        :class:`CacheStats`
+            The cache statistics.
+        """
+        state = self._connection
+        guilds = list(state._guilds.values())
+        messages = state._messages.values() if state._messages is not None else ()
+        views = state._view_store._views if hasattr(state, "_view_store") else {}
+        modals = state._modal_store._modals if hasattr(state, "_modal_store") else {}
+
+        # (entries, count) per cache; entries are only iterated for sampling
+        caches: dict[str, tuple[Iterable[object], int]] = {
+            "users": (state._users.values(), len(state._users)),
+            "guilds": (guilds, len(guilds)),
+            "members": (
+                itertools.chain.from_iterable(g._members.values() for g in guilds),
+                sum(len(g._members) for g in guilds),
+            ),
+            "messages": (messages, len(messages)),
+            "channels": (
+                itertools.chain(
+                    state._private_channels.values(),
+                    itertools.chain.from_iterable(g._channels.values() for g in guilds),
+                ),
+                len(state._private_channels) + sum(len(g._channels) for g in guilds),
+            ),
+            "threads": (
+                itertools.chain.from_iterable(g._threads.values() for g in guilds),
+                sum(len(g._threads) for g in guilds),
+            ),
+            "emojis": (state._emojis.values(), len(state._emojis)),
+            "stickers": (state._stickers.values(), len(state._stickers)),
+            "views": (
+                (view for view, _ in views.values()),
+                len({id(view) for view, _ in views.values()}),
+            ),
+            "modals": (modals.values(), len(modals)),
+            "chunk_requests": (state._chunk_requests.values(), len(state._chunk_requests)),
+            "wait_for": (
+                itertools.chain.from_iterable(self._listeners.values()),
+                sum(len(listeners) for listeners in self._listeners.values()),
+            ),
+        }
+        counts = {name: count for name, (_, count) in caches.items()}
+        sizes = {name: _estimate_size(entries, count) for name, (entries, count) in caches.items()}
+        if not per_guild:
+            return CacheStats(counts, sizes)
+
+        guild_messages: dict[int, int] = {}
+        for message in messages:
+            if (guild := message.guild) is not None:
+                guild_messages[guild.id] = guild_messages.get(guild.id, 0) + 1
+
+        # use the average entry sizes of the whole cache, instead of sampling each guild
+        average = {name: sizes[name] / counts[name] if counts[name] else 0 for name in counts}
+        guild_stats: dict[int, CacheStats] = {}
+        for guild in guilds:
+            guild_counts = {
+                "members": len(guild._members),
+                "messages": guild_messages.get(guild.id, 0),
+                "channels": len(guild._channels),
+                "threads": len(guild._threads),
+                "emojis": len(guild.emojis),
+                "stickers": len(guild.stickers),
+            }
+            guild_sizes = {name: int(count * average[name]) for name, count in guild_counts.items()}
+            guild_stats[guild.id] = CacheStats(guild_counts, guild_sizes)
+        return CacheStats(counts, sizes, guild_stats)
+
     async def on_error(self, event_method: str, *args: Any, **kwargs: Any) -> None:
         """|coro|
 
@@ -1086,6 +1494,10 @@ class Client:
             However, if ``ignore_session_start_limit`` is ``True``, the client will connect regardless
             and this exception will not be raised.
         """
+        self._apply_minimal_intents()
+        if self._loop_lag_monitor is not None:
+            self._loop_lag_monitor._start()
+
         _, initial_gateway, session_start_limit = await self.http.get_bot_gateway(
             encoding=self.gateway_params.encoding,
             zlib=self.gateway_params.zlib,
@@ -1100,6 +1512,19 @@ class Client:
             "shard_id": self.shard_id,
             "gateway": initial_gateway,
         }
+        if self._session_file is not None and (
+            resume_state := self._session_file.pop(self.shard_id)
+        ):
+            _log.info("Attempting to resume stored session %s.", resume_state.session_id)
+            self._connection._pending_resumes.add(self.shard_id)
+            if self._cache_snapshot is not None:
+                self._cache_snapshot.load({self.shard_id: resume_state})
+            ws_params.update(
+                resume=True,
+                session=resume_state.session_id,
+                sequence=resume_state.sequence,
+                gateway=resume_state.resume_gateway,
+            )
 
         backoff = ExponentialBackoff()
         while not self.is_closed():
@@ -1215,7 +1640,21 @@ class Client:
 
         # can be None if not connected
         if self.ws is not None and self.ws.open:  # pyright: ignore[reportUnnecessaryComparison]
-            await self.ws.close(code=1000)
+            if self._session_file is not None:
+                # closing with 1000 would invalidate the session
+                await self.ws.close(code=4000)
+                self._session_file.update(self.ws)
+                await self._session_file.save_async()
+                if self._cache_snapshot is not None:
+                    self._cache_snapshot.save(self._session_file.sessions)
+            else:
+                await self.ws.close(code=1000)
+
+        if self._gateway_recorder is not None:
+            self._gateway_recorder.close()
+
+        if self._loop_lag_monitor is not None:
+            self._loop_lag_monitor._close()
 
         await self.http.close()
         self._ready.clear()
@@ -1382,6 +1821,50 @@ class Client:
         """
         return self._connection.intents
 
+    @property
+    def guild_cache_filter(self) -> Callable[[int], bool] | None:
+        """Callable[[:class:`int`], :class:`bool`] | :data:`None`: The function that decides
+        whether a guild is fully cached, given its ID. See the ``guild_cache_filter``
+        parameter of :class:`Client` for details.
+
+        When set, the filter is applied to all cached guilds right away: guilds that are
+        not fully cached anymore are trimmed, while guilds that become fully cached
+        are upgraded in the background, by fetching their emojis, stickers and active
+        threads and chunking their members if enabled.
+
+        .. versionadded:: 2.13
+        """
+        return self._connection._guild_cache_filter
+
+    @guild_cache_filter.setter
+    def guild_cache_filter(self, value: Callable[[int], bool] | None) -> None:
+        self._connection._set_guild_cache_filter(value)
+
+    @property
+    def handler_profiler(self) -> HandlerProfiler | None:
+        """:class:`.HandlerProfiler` | :data:`None`: The profiler measuring the durations
+        of event listeners and commands, if any.
+
+        .. versionadded:: 2.13
+        """
+        return self._handler_profiler
+
+    @handler_profiler.setter
+    def handler_profiler(self, value: HandlerProfiler | None) -> None:
+        if value is not None and not isinstance(value, HandlerProfiler):
+            msg = f"handler_profiler must be HandlerProfiler, not {type(value)!r}."
+            raise TypeError(msg)
+        self._handler_profiler = value
+
+    @property
+    def loop_lag_monitor(self) -> LoopLagMonitor | None:
+        """:class:`.LoopLagMonitor` | :data:`None`: The monitor measuring how long
+        the event loop is blocked, if any.
+
+        .. versionadded:: 2.13
+        """
+        return self._loop_lag_monitor
+
     # helpers/getters
 
     @property
@@ -1552,7 +2035,7 @@ class Client:
         for guild in self.guilds:
             yield from guild.channels
 
-    def get_all_members(self) -> Generator[Member]:
+    def get_all_members(self, *, user: Snowflake | None = None) -> Generator[Member]:
         """Returns a generator with every :class:`.Member` the client can see.
 
         This is equivalent to: ::
@@ -1561,11 +2044,30 @@ class Client:
                 for member in guild.members:
                     yield member
 
+        .. versionchanged:: 2.13
+            Added the ``user`` parameter.
+
+        Parameters
+        ----------
+        user: :class:`.abc.Snowflake` | :data:`None`
+            If provided, only yields the members of this user, i.e. one member for each
+            guild the user shares with the client. This is much faster than filtering
+            all members, as it only needs to look at the user's mutual guilds.
+
+            .. versionadded:: 2.13
+
         Yields
         ------
         :class:`.Member`
             A member the client can see.
         """
+        if user is not None:
+            for guild in self._connection._get_mutual_guilds(user.id):
+                member = guild.get_member(user.id)
+                if member is not None:
+                    yield member
+            return
+
         for guild in self.guilds:
             yield from guild.members
 
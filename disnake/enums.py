@@ -95,6 +95,10 @@ class _EnumValueBase(NamedTuple):
     def __str__(self) -> str:
         return f"{self._cls_name}.{self.name}"
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # value classes are created dynamically and can't be pickled by reference
+        return (try_enum, (self._actual_enum_cls_, self.value))
+
 
 @total_ordering
 class _EnumValueComparable(_EnumValueBase):
@@ -12,11 +12,13 @@ from .interaction_bot_base import InteractionBotBase
 
 if TYPE_CHECKING:
     import asyncio
+    import os
 
     import aiohttp
     from typing_extensions import Self
 
     from disnake.activity import BaseActivity
+    from disnake.cache import CacheBackends
     from disnake.client import GatewayParams
     from disnake.enums import Status
     from disnake.flags import (
@@ -25,9 +27,12 @@ if TYPE_CHECKING:
         InteractionContextTypes,
         MemberCacheFlags,
     )
+    from disnake.guild import Guild
     from disnake.i18n import LocalizationProtocol
     from disnake.mentions import AllowedMentions
     from disnake.message import Message
+    from disnake.profiler import HandlerProfiler, LoopLagMonitor
+    from disnake.recorder import GatewayRecorder
 
     from ._types import MaybeCoro
     from .bot_base import PrefixType
@@ -274,6 +279,11 @@ class Bot(BotBase, InteractionBotBase, disnake.Client):
             enable_debug_events: bool = False,
             enable_gateway_error_handler: bool = True,
             gateway_params: GatewayParams | None = None,
+            gateway_recorder: GatewayRecorder | None = None,
+            handler_profiler: HandlerProfiler | None = None,
+            loop_lag_monitor: LoopLagMonitor | None = None,
+            session_file: str | os.PathLike[str] | None = None,
+            cache_snapshot: str | os.PathLike[str] | None = None,
             connector: aiohttp.BaseConnector | None = None,
             proxy: str | None = None,
             proxy_auth: aiohttp.BasicAuth | None = None,
@@ -286,8 +296,12 @@ class Bot(BotBase, InteractionBotBase, disnake.Client):
             activity: BaseActivity | None = None,
             status: Status | str | None = None,
             intents: Intents | None = None,
+            enforce_minimal_intents: bool = False,
             chunk_guilds_at_startup: bool | None = None,
+            chunk_priority: Callable[[Guild], Any] | None = None,
+            guild_cache_filter: Callable[[int], bool] | None = None,
             member_cache_flags: MemberCacheFlags | None = None,
+            cache_backends: CacheBackends | None = None,
             localization_provider: LocalizationProtocol | None = None,
             strict_localization: bool = False,
         ) -> None: ...
@@ -327,6 +341,11 @@ class AutoShardedBot(BotBase, InteractionBotBase, disnake.AutoShardedClient):
             enable_debug_events: bool = False,
             enable_gateway_error_handler: bool = True,
             gateway_params: GatewayParams | None = None,
+            gateway_recorder: GatewayRecorder | None = None,
+            handler_profiler: HandlerProfiler | None = None,
+            loop_lag_monitor: LoopLagMonitor | None = None,
+            session_file: str | os.PathLike[str] | None = None,
+            cache_snapshot: str | os.PathLike[str] | None = None,
             connector: aiohttp.BaseConnector | None = None,
             proxy: str | None = None,
             proxy_auth: aiohttp.BasicAuth | None = None,
@@ -339,8 +358,12 @@ class AutoShardedBot(BotBase, InteractionBotBase, disnake.AutoShardedClient):
             activity: BaseActivity | None = None,
             status: Status | str | None = None,
             intents: Intents | None = None,
+            enforce_minimal_intents: bool = False,
             chunk_guilds_at_startup: bool | None = None,
+            chunk_priority: Callable[[Guild], Any] | None = None,
+            guild_cache_filter: Callable[[int], bool] | None = None,
             member_cache_flags: MemberCacheFlags | None = None,
+            cache_backends: CacheBackends | None = None,
             localization_provider: LocalizationProtocol | None = None,
             strict_localization: bool = False,
         ) -> None: ...
@@ -499,6 +522,11 @@ class InteractionBot(InteractionBotBase, disnake.Client):
             enable_debug_events: bool = False,
             enable_gateway_error_handler: bool = True,
             gateway_params: GatewayParams | None = None,
+            gateway_recorder: GatewayRecorder | None = None,
+            handler_profiler: HandlerProfiler | None = None,
+            loop_lag_monitor: LoopLagMonitor | None = None,
+            session_file: str | os.PathLike[str] | None = None,
+            cache_snapshot: str | os.PathLike[str] | None = None,
             connector: aiohttp.BaseConnector | None = None,
             proxy: str | None = None,
             proxy_auth: aiohttp.BasicAuth | None = None,
@@ -511,8 +539,12 @@ class InteractionBot(InteractionBotBase, disnake.Client):
             activity: BaseActivity | None = None,
             status: Status | str | None = None,
             intents: Intents | None = None,
+            enforce_minimal_intents: bool = False,
             chunk_guilds_at_startup: bool | None = None,
+            chunk_priority: Callable[[Guild], Any] | None = None,
+            guild_cache_filter: Callable[[int], bool] | None = None,
             member_cache_flags: MemberCacheFlags | None = None,
+            cache_backends: CacheBackends | None = None,
             localization_provider: LocalizationProtocol | None = None,
             strict_localization: bool = False,
         ) -> None: ...
@@ -545,6 +577,11 @@ class AutoShardedInteractionBot(InteractionBotBase, disnake.AutoShardedClient):
             enable_debug_events: bool = False,
             enable_gateway_error_handler: bool = True,
             gateway_params: GatewayParams | None = None,
+            gateway_recorder: GatewayRecorder | None = None,
+            handler_profiler: HandlerProfiler | None = None,
+            loop_lag_monitor: LoopLagMonitor | None = None,
+            session_file: str | os.PathLike[str] | None = None,
+            cache_snapshot: str | os.PathLike[str] | None = None,
             connector: aiohttp.BaseConnector | None = None,
             proxy: str | None = None,
             proxy_auth: aiohttp.BasicAuth | None = None,
@@ -557,8 +594,12 @@ class AutoShardedInteractionBot(InteractionBotBase, disnake.AutoShardedClient):
             activity: BaseActivity | None = None,
             status: Status | str | None = None,
             intents: Intents | None = None,
+            enforce_minimal_intents: bool = False,
             chunk_guilds_at_startup: bool | None = None,
+            chunk_priority: Callable[[Guild], Any] | None = None,
+            guild_cache_filter: Callable[[int], bool] | None = None,
             member_cache_flags: MemberCacheFlags | None = None,
+            cache_backends: CacheBackends | None = None,
             localization_provider: LocalizationProtocol | None = None,
             strict_localization: bool = False,
         ) -> None: ...
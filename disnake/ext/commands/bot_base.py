@@ -572,7 +572,12 @@ class BotBase(CommonBotBase, GroupMixin):
             self.dispatch("command", ctx)
             try:
                 if await self.can_run(ctx, call_once=True):
-                    await ctx.command.invoke(ctx)
+                    profiler: disnake.HandlerProfiler | None = self._handler_profiler  # pyright: ignore[reportAttributeAccessIssue]
+                    if profiler is not None:
+                        with profiler._measure("command", ctx.command.qualified_name):
+                            await ctx.command.invoke(ctx)
+                    else:
+                        await ctx.command.invoke(ctx)
                 else:
                     msg = "The global check once functions failed."
                     raise errors.CheckFailure(msg)
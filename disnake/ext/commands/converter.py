@@ -244,8 +244,9 @@ class MemberConverter(IDConverter[disnake.Member]):
                 guild._add_member(member)
             return member
 
-        # If we're not being rate limited then we can use the websocket to actually query
-        members = await guild.query_members(limit=1, user_ids=[user_id], cache=cache)
+        # If we're not being rate limited then we can use the websocket to actually query,
+        # which is batched with concurrent lookups in the same guild
+        members = await guild._state.resolve_members(guild, [user_id], presences=False, cache=cache)
         if not members:
             return None
         return members[0]
@@ -1472,7 +1472,12 @@ class InteractionBotBase(CommonBotBase):
         self.dispatch(event_name, interaction)
         try:
             if await self.application_command_can_run(interaction, call_once=True):
-                await app_command.invoke(interaction)
+                profiler: disnake.HandlerProfiler | None = self._handler_profiler  # pyright: ignore[reportAttributeAccessIssue]
+                if profiler is not None:
+                    with profiler._measure(event_name, app_command.qualified_name):
+                        await app_command.invoke(interaction)
+                else:
+                    await app_command.invoke(interaction)
                 self.dispatch(f"{event_name}_completion", interaction)
             else:
                 msg = "The global check_once functions failed."
@@ -0,0 +1,288 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections.abc import Iterable, Mapping
+
+from aiohttp import web
+
+import disnake
+from disnake.utils import Histogram
+
+__all__ = ("Metrics",)
+
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (name suffix, labels, value)
+_Sample = tuple[str, Mapping[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class _Family:
+    __slots__ = ("documentation", "name", "samples", "type")
+
+    def __init__(self, name: str, type: str, documentation: str) -> None:
+        # the name of counters doesn't include the `_total` suffix
+        self.name: str = name
+        self.type: str = type
+        self.documentation: str = documentation
+        self.samples: list[_Sample] = []
+
+    def add(self, labels: Mapping[str, str], value: float) -> None:
+        self.samples.append(("_total" if self.type == "counter" else "", labels, value))
+
+    def add_histogram(self, labels: Mapping[str, str], histogram: Histogram) -> None:
+        cumulative = 0
+        # the last count (of values above all bounds) is only included in `+Inf`
+        for bound, count in zip(histogram.bounds, histogram.counts, strict=False):
+            cumulative += count
+            self.samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+        self.samples.append(("_bucket", {**labels, "le": "+Inf"}, histogram.count))
+        self.samples.append(("_sum", labels, histogram.sum))
+        self.samples.append(("_count", labels, histogram.count))
+
+    def render(self, *, openmetrics: bool) -> Iterable[str]:
+        name = self.name
+        # the text format expects the full name of counters in the metadata
+        meta_name = name if openmetrics or self.type != "counter" else name + "_total"
+        yield f"# HELP {meta_name} {self.documentation}"
+        yield f"# TYPE {meta_name} {self.type}"
+        for suffix, labels, value in self.samples:
+            if labels:
+                inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+                yield f"{name}{suffix}{{{inner}}} {_format_value(value)}"
+            else:
+                yield f"{name}{suffix} {_format_value(value)}"
+
+
+class Metrics:
+    """Collects metrics of a client, and exposes them in the Prometheus/OpenMetrics
+    text format, optionally using a local HTTP endpoint.
+
+    The following metrics are collected, with the given prefix (``disnake_`` by default);
+    metrics of the gateway connection are labelled by shard ID:
+
+    - ``gateway_latency_seconds``: The heartbeat latency.
+    - ``gateway_events_total``: The number of received dispatch events, by event type.
+    - ``gateway_frames_total``: The number of received (decompressed) gateway payloads.
+    - ``gateway_received_bytes_total``: The number of received bytes, after decompression.
+    - ``http_request_duration_seconds``: The duration of HTTP requests (including
+      retries as separate requests) by route.
+    - ``http_responses_total``: The number of HTTP responses, by route and status.
+    - ``http_ratelimited_total``: The number of ``429`` responses, by rate limit bucket.
+    - ``http_retries_total``: The number of retried HTTP requests, by route and reason.
+    - ``event_handler_duration_seconds``: The duration of event listeners and commands,
+      by event and handler name, if the client has a :class:`~disnake.HandlerProfiler`.
+    - ``tasks``: The number of asyncio tasks, by kind (``event_handler`` or ``other``).
+    - ``cache_entries`` and ``cache_size_bytes``: The number of entries and the estimated
+      size of the internal caches, see :meth:`disnake.Client.cache_stats`.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    client: :class:`disnake.Client`
+        The client to collect metrics of.
+    prefix: :class:`str`
+        The prefix of all metric names. Defaults to ``"disnake"``.
+    handler_durations: :class:`bool`
+        Whether to measure the duration of event listeners and commands,
+        by setting :attr:`Client.handler_profiler <disnake.Client.handler_profiler>`
+        if the client doesn't have a profiler yet. Defaults to ``True``.
+    cache: :class:`bool`
+        Whether to include cache statistics. Defaults to ``True``.
+    """
+
+    def __init__(
+        self,
+        client: disnake.Client,
+        *,
+        prefix: str = "disnake",
+        handler_durations: bool = True,
+        cache: bool = True,
+    ) -> None:
+        self.client: disnake.Client = client
+        self.prefix: str = prefix
+        self.cache: bool = cache
+        self._runner: web.AppRunner | None = None
+
+        if handler_durations and client.handler_profiler is None:
+            client.handler_profiler = disnake.HandlerProfiler()
+
+    def __repr__(self) -> str:
+        return f"<Metrics client={self.client!r} running={self._runner is not None}>"
+
+    def _latencies(self) -> list[tuple[int, float]]:
+        client = self.client
+        if isinstance(client, disnake.AutoShardedClient):
+            return client.latencies
+        return [(client.shard_id or 0, client.latency)]
+
+    def _collect(self) -> list[_Family]:
+        client = self.client
+        prefix = self.prefix + "_"
+        families: list[_Family] = []
+
+        def family(name: str, type: str, documentation: str) -> _Family:
+            result = _Family(prefix + name, type, documentation)
+            families.append(result)
+            return result
+
+        latency = family("gateway_latency_seconds", "gauge", "Gateway heartbeat latency.")
+        for shard_id, value in self._latencies():
+            latency.add({"shard": str(shard_id)}, value)
+
+        events = family("gateway_events", "counter", "Received gateway dispatch events.")
+        frames = family("gateway_frames", "counter", "Received gateway payloads.")
+        received = family(
+            "gateway_received_bytes", "counter", "Received gateway bytes, after decompression."
+        )
+        for shard_id, stats in sorted(client._connection._gateway_stats.items()):
+            shard = str(shard_id)
+            for event, count in stats.events.items():
+                events.add({"shard": shard, "event": event}, count)
+            frames.add({"shard": shard}, stats.frames)
+            received.add({"shard": shard}, stats.bytes)
+
+        http = client.http._stats
+        durations = family(
+            "http_request_duration_seconds", "histogram", "Duration of HTTP requests."
+        )
+        for route, histogram in http.durations.items():
+            durations.add_histogram({"route": route}, histogram)
+        responses = family("http_responses", "counter", "HTTP responses by status.")
+        for (route, status), count in http.responses.items():
+            responses.add({"route": route, "status": str(status)}, count)
+        ratelimited = family("http_ratelimited", "counter", "HTTP 429 responses.")
+        for bucket, count in http.ratelimits.items():
+            ratelimited.add({"bucket": bucket}, count)
+        retries = family("http_retries", "counter", "Retried HTTP requests.")
+        for (route, reason), count in http.retries.items():
+            retries.add({"route": route, "reason": reason}, count)
+
+        if (profiler := client.handler_profiler) is not None:
+            handlers = family(
+                "event_handler_duration_seconds",
+                "histogram",
+                "Duration of event listeners and commands.",
+            )
+            for stats in profiler.handlers:
+                handlers.add_histogram(
+                    {"event": stats.event, "handler": stats.name}, stats._histogram
+                )
+
+        try:
+            all_tasks = asyncio.all_tasks()
+        except RuntimeError:  # no running event loop
+            all_tasks = set()
+        # see `Client._schedule_event`
+        handler_tasks = sum(task.get_name().startswith("disnake: ") for task in all_tasks)
+        tasks = family("tasks", "gauge", "Number of asyncio tasks.")
+        tasks.add({"kind": "event_handler"}, handler_tasks)
+        tasks.add({"kind": "other"}, len(all_tasks) - handler_tasks)
+
+        if self.cache:
+            cache_stats = client.cache_stats()
+            entries = family("cache_entries", "gauge", "Number of cached entries.")
+            sizes = family("cache_size_bytes", "gauge", "Estimated size of cached entries.")
+            for name, count in cache_stats.counts.items():
+                entries.add({"cache": name}, count)
+                sizes.add({"cache": name}, cache_stats.sizes[name])
+
+        return families
+
+    def collect(self, *, openmetrics: bool = False) -> str:
+        """Returns the current metrics in the text exposition format.
+
+        Parameters
+        ----------
+        openmetrics: :class:`bool`
+            Whether to use the OpenMetrics format instead of the Prometheus text format.
+            Defaults to ``False``.
+
+        Returns
+        -------
+        :class:`str`
+            The metrics.
+        """
+        lines = [
+            line for family in self._collect() for line in family.render(openmetrics=openmetrics)
+        ]
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        openmetrics = "application/openmetrics-text" in request.headers.get("Accept", "")
+        return web.Response(
+            body=self.collect(openmetrics=openmetrics).encode(),
+            headers={
+                "Content-Type": _OPENMETRICS_CONTENT_TYPE
+                if openmetrics
+                else _PROMETHEUS_CONTENT_TYPE
+            },
+        )
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 9100, *, path: str = "/metrics"
+    ) -> None:
+        """|coro|
+
+        Starts an HTTP server exposing the metrics.
+
+        The response uses the OpenMetrics format if requested using the ``Accept`` header,
+        and the Prometheus text format otherwise.
+
+        Parameters
+        ----------
+        host: :class:`str`
+            The host to listen on. Defaults to ``"127.0.0.1"``.
+        port: :class:`int`
+            The port to listen on. Defaults to ``9100``.
+        path: :class:`str`
+            The path of the endpoint. Defaults to ``"/metrics"``.
+
+        Raises
+        ------
+        RuntimeError
+            The server is already running.
+        """
+        if self._runner is not None:
+            msg = "The metrics server is already running."
+            raise RuntimeError(msg)
+
+        app = web.Application()
+        app.router.add_get(path, self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the HTTP server, if running.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
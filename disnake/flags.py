@@ -1706,6 +1706,165 @@ class Intents(BaseFlags):
         return 1 << 25
 
 
+# maps client events to the intents required to receive them;
+# events that only require `guilds` (which is always needed) are not included
+_EVENT_INTENTS: dict[str, int] = {
+    **dict.fromkeys(
+        (
+            "member_join",
+            "member_remove",
+            "member_update",
+            "raw_member_remove",
+            "raw_member_update",
+            "user_update",
+            "thread_member_join",
+            "thread_member_remove",
+            "raw_thread_member_remove",
+        ),
+        Intents.members.flag,
+    ),
+    **dict.fromkeys(
+        ("member_ban", "member_unban", "audit_log_entry_create"), Intents.moderation.flag
+    ),
+    **dict.fromkeys(
+        ("guild_emojis_update", "guild_stickers_update", "guild_soundboard_sounds_update"),
+        Intents.expressions.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "guild_integrations_update",
+            "integration_create",
+            "integration_update",
+            "raw_integration_delete",
+        ),
+        Intents.integrations.flag,
+    ),
+    "webhooks_update": Intents.webhooks.flag,
+    **dict.fromkeys(("invite_create", "invite_delete"), Intents.invites.flag),
+    **dict.fromkeys(
+        ("voice_state_update", "voice_channel_effect", "raw_voice_channel_effect"),
+        Intents.voice_states.flag,
+    ),
+    **dict.fromkeys(("presence_update", "raw_presence_update"), Intents.presences.flag),
+    **dict.fromkeys(
+        ("message", "message_edit", "raw_message_edit"),
+        Intents.messages.flag | Intents.message_content.flag,
+    ),
+    **dict.fromkeys(
+        ("message_delete", "raw_message_delete", "bulk_message_delete", "raw_bulk_message_delete"),
+        Intents.messages.flag,
+    ),
+    # these depend on the message cache, which is only populated with the `messages` intent
+    **dict.fromkeys(
+        ("reaction_add", "reaction_remove", "reaction_clear", "reaction_clear_emoji"),
+        Intents.messages.flag | Intents.reactions.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "raw_reaction_add",
+            "raw_reaction_remove",
+            "raw_reaction_clear",
+            "raw_reaction_clear_emoji",
+        ),
+        Intents.reactions.flag,
+    ),
+    **dict.fromkeys(("typing", "raw_typing"), Intents.typing.flag),
+    **dict.fromkeys(
+        (
+            "guild_scheduled_event_create",
+            "guild_scheduled_event_update",
+            "guild_scheduled_event_delete",
+            "raw_guild_scheduled_event_subscribe",
+            "raw_guild_scheduled_event_unsubscribe",
+        ),
+        Intents.guild_scheduled_events.flag,
+    ),
+    **dict.fromkeys(
+        ("guild_scheduled_event_subscribe", "guild_scheduled_event_unsubscribe"),
+        Intents.guild_scheduled_events.flag | Intents.members.flag,
+    ),
+    **dict.fromkeys(
+        ("automod_rule_create", "automod_rule_update", "automod_rule_delete"),
+        Intents.automod_configuration.flag,
+    ),
+    "automod_action_execution": Intents.automod_execution.flag | Intents.message_content.flag,
+    **dict.fromkeys(
+        ("poll_vote_add", "poll_vote_remove", "raw_poll_vote_add", "raw_poll_vote_remove"),
+        Intents.polls.flag,
+    ),
+}
+
+# maps gateway dispatch events to the intents that cause them to be sent
+_GATEWAY_EVENT_INTENTS: dict[str, int] = {
+    **dict.fromkeys(
+        ("GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE", "GUILD_MEMBER_REMOVE", "THREAD_MEMBERS_UPDATE"),
+        Intents.members.flag,
+    ),
+    **dict.fromkeys(
+        ("GUILD_BAN_ADD", "GUILD_BAN_REMOVE", "GUILD_AUDIT_LOG_ENTRY_CREATE"),
+        Intents.moderation.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "GUILD_EMOJIS_UPDATE",
+            "GUILD_STICKERS_UPDATE",
+            "GUILD_SOUNDBOARD_SOUND_CREATE",
+            "GUILD_SOUNDBOARD_SOUND_UPDATE",
+            "GUILD_SOUNDBOARD_SOUND_DELETE",
+            "GUILD_SOUNDBOARD_SOUNDS_UPDATE",
+        ),
+        Intents.expressions.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "GUILD_INTEGRATIONS_UPDATE",
+            "INTEGRATION_CREATE",
+            "INTEGRATION_UPDATE",
+            "INTEGRATION_DELETE",
+        ),
+        Intents.integrations.flag,
+    ),
+    "WEBHOOKS_UPDATE": Intents.webhooks.flag,
+    **dict.fromkeys(("INVITE_CREATE", "INVITE_DELETE"), Intents.invites.flag),
+    **dict.fromkeys(("VOICE_STATE_UPDATE", "VOICE_CHANNEL_EFFECT_SEND"), Intents.voice_states.flag),
+    "PRESENCE_UPDATE": Intents.presences.flag,
+    **dict.fromkeys(
+        ("MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE", "MESSAGE_DELETE_BULK"),
+        Intents.messages.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "MESSAGE_REACTION_ADD",
+            "MESSAGE_REACTION_REMOVE",
+            "MESSAGE_REACTION_REMOVE_ALL",
+            "MESSAGE_REACTION_REMOVE_EMOJI",
+        ),
+        Intents.reactions.flag,
+    ),
+    "TYPING_START": Intents.typing.flag,
+    **dict.fromkeys(
+        (
+            "GUILD_SCHEDULED_EVENT_CREATE",
+            "GUILD_SCHEDULED_EVENT_UPDATE",
+            "GUILD_SCHEDULED_EVENT_DELETE",
+            "GUILD_SCHEDULED_EVENT_USER_ADD",
+            "GUILD_SCHEDULED_EVENT_USER_REMOVE",
+        ),
+        Intents.guild_scheduled_events.flag,
+    ),
+    **dict.fromkeys(
+        (
+            "AUTO_MODERATION_RULE_CREATE",
+            "AUTO_MODERATION_RULE_UPDATE",
+            "AUTO_MODERATION_RULE_DELETE",
+        ),
+        Intents.automod_configuration.flag,
+    ),
+    "AUTO_MODERATION_ACTION_EXECUTION": Intents.automod_execution.flag,
+    **dict.fromkeys(("MESSAGE_POLL_VOTE_ADD", "MESSAGE_POLL_VOTE_REMOVE"), Intents.polls.flag),
+}
+
+
 class MemberCacheFlags(BaseFlags):
     """Controls the library's cache policy when it comes to members.
 
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import heapq
+import itertools
 import logging
+import os
 import struct
 import sys
 import threading
@@ -12,7 +15,7 @@ import time
 import traceback
 import zlib
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -29,11 +32,14 @@ from . import utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed
+from .flags import ApplicationFlags
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
     from .client import Client
+    from .profiler import LoopLagMonitor
+    from .recorder import GatewayRecorder
     from .state import ConnectionState
     from .types.gateway import (
         GatewayPayload,
@@ -107,6 +113,13 @@ class EventListener(NamedTuple):
     future: asyncio.Future[Any]
 
 
+# priorities of outgoing gateway commands while rate limited, lower values are sent first
+_PRIORITY_CONNECTION: Final = 0  # heartbeats, identify, resume
+_PRIORITY_VOICE: Final = 1
+_PRIORITY_CHUNKS: Final = 2
+_PRIORITY_DEFAULT: Final = 3  # presence updates and anything else
+
+
 class GatewayRatelimiter:
     # The default is 110 to give room for at least 10 heartbeats per minute
     def __init__(self, count: int = 110, per: float = 60.0) -> None:
@@ -120,9 +133,19 @@ class GatewayRatelimiter:
         # start epoch time of current window
         self.window: float = 0.0
 
-        self.lock: asyncio.Lock = asyncio.Lock()
+        # commands waiting for the rate limit, as a heap of (priority, insertion order, future)
+        self._waiters: list[tuple[int, int, asyncio.Future[bool]]] = []
+        # waiting commands that are superseded by newer commands with the same key
+        self._coalesced: dict[str, asyncio.Future[bool]] = {}
+        self._waiter_counter: itertools.count[int] = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
         self.shard_id: int | None = None
 
+    @property
+    def queue_size(self) -> int:
+        """The number of commands currently waiting for the rate limit."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
     def is_ratelimited(self) -> bool:
         current = time.time()
         if current > self.window + self.per:
@@ -148,16 +171,249 @@ class GatewayRatelimiter:
         self.remaining -= 1
         return 0.0
 
-    async def block(self) -> None:
-        async with self.lock:
+    def _release_waiters(self) -> None:
+        self._wakeup = None
+        while self._waiters:
+            _, _, future = self._waiters[0]
+            if future.done():
+                # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+
             delta = self.get_delay()
             if delta:
-                _log.warning(
-                    "WebSocket in shard ID %s is ratelimited, waiting %.2f seconds",
-                    self.shard_id,
-                    delta,
-                )
-                await asyncio.sleep(delta)
+                self._schedule_wakeup(delta)
+                return
+
+            heapq.heappop(self._waiters)
+            future.set_result(True)
+
+    def _schedule_wakeup(self, delta: float) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.get_running_loop().call_later(delta, self._release_waiters)
+
+    async def block(
+        self, priority: int = _PRIORITY_DEFAULT, *, coalesce: str | None = None
+    ) -> bool:
+        # Commands go out immediately if there's no queue and the limit hasn't been reached,
+        # otherwise they're queued and released by priority once the window resets.
+        # Returns `False` if the command was superseded by a newer one with the same `coalesce` key,
+        # in which case it should not be sent.
+        if not self._waiters:
+            delta = self.get_delay()
+            if not delta:
+                return True
+            _log.warning(
+                "WebSocket in shard ID %s is ratelimited, waiting %.2f seconds",
+                self.shard_id,
+                delta,
+            )
+            self._schedule_wakeup(delta)
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._waiter_counter), future))
+        if coalesce is not None:
+            previous = self._coalesced.get(coalesce)
+            if previous is not None and not previous.done():
+                previous.set_result(False)
+            self._coalesced[coalesce] = future
+
+        try:
+            return await future
+        finally:
+            if coalesce is not None and self._coalesced.get(coalesce) is future:
+                del self._coalesced[coalesce]
+
+
+class GatewayStats:
+    """Counts received gateway events and their decompressed sizes for a shard.
+
+    Kept across reconnects, so rates are relative to when the shard first connected.
+    """
+
+    __slots__ = ("started_at", "frames", "bytes", "events", "event_bytes")
+
+    def __init__(self) -> None:
+        self.started_at: float = time.perf_counter()
+        self.frames: int = 0
+        self.bytes: int = 0
+        # event type -> count/bytes, only for dispatch events
+        self.events: dict[str, int] = {}
+        self.event_bytes: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return f"<GatewayStats frames={self.frames} bytes={self.bytes} elapsed={self.elapsed:.1f}>"
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def record(self, event: str | None, size: int) -> None:
+        self.frames += 1
+        self.bytes += size
+        if event:
+            events = self.events
+            events[event] = events.get(event, 0) + 1
+            event_bytes = self.event_bytes
+            event_bytes[event] = event_bytes.get(event, 0) + size
+
+
+class ResumeState(NamedTuple):
+    session_id: str
+    sequence: int
+    resume_gateway: str
+
+
+class SessionFile:
+    """Persists the resume state of each shard to a local file,
+    allowing sessions to be resumed after a process restart.
+    """
+
+    VERSION: Final[int] = 1
+
+    def __init__(self, path: str | os.PathLike[str], *, state: ConnectionState) -> None:
+        self.path: str | os.PathLike[str] = path
+        self._state: ConnectionState = state
+        self._sessions: dict[int | None, ResumeState] = {}
+        self._loaded: bool = False
+        # writes are numbered, so that outdated data doesn't overwrite newer data
+        self._generation: int = 0
+        self._written_generation: int = 0
+        self._write_lock: threading.Lock = threading.Lock()
+        self._last_data: dict[str, Any] | None = None
+        # the data of the next background write, and the task performing them
+        self._pending: tuple[int, dict[str, Any]] | None = None
+        self._save_task: asyncio.Task[None] | None = None
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = utils._from_json(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            _log.warning("Failed to read session file %s, ignoring it.", self.path, exc_info=True)
+            return
+
+        state = self._state
+        user = state.user
+        if (
+            not isinstance(data, dict)
+            or data.get("v") != self.VERSION
+            or not user
+            or data.get("user_id") != user.id
+            or data.get("shard_count") != state.shard_count
+        ):
+            _log.info("Session file %s does not match the current client, ignoring it.", self.path)
+            return
+
+        try:
+            sessions = {
+                s["shard_id"]: ResumeState(s["session_id"], s["sequence"], s["resume_gateway"])
+                for s in data["shards"]
+            }
+        except (KeyError, TypeError):
+            _log.warning("Session file %s is malformed, ignoring it.", self.path)
+            return
+
+        # these would usually be set by READY, which isn't received when resuming
+        if state.application_id is None:
+            state.application_id = data.get("application_id")
+        if (flags := data.get("application_flags")) is not None:
+            state.application_flags = ApplicationFlags._from_value(flags)
+
+        self._sessions = sessions
+
+    @property
+    def sessions(self) -> Mapping[int | None, ResumeState]:
+        """The currently stored resume states, by shard ID."""
+        return self._sessions
+
+    def pop(self, shard_id: int | None) -> ResumeState | None:
+        """Returns and removes the stored resume state for the given shard, if any."""
+        if not self._loaded:
+            self._load()
+        return self._sessions.pop(shard_id, None)
+
+    def update(self, ws: DiscordWebSocket) -> None:
+        """Stores the current resume state of the given websocket."""
+        if ws.session_id is None or ws.sequence is None or ws.resume_gateway is None:
+            self._sessions.pop(ws.shard_id, None)
+        else:
+            self._sessions[ws.shard_id] = ResumeState(ws.session_id, ws.sequence, ws.resume_gateway)
+
+    def _dump(self) -> dict[str, Any] | None:
+        state = self._state
+        if not state.user:
+            return None
+
+        flags = getattr(state, "application_flags", None)
+        return {
+            "v": self.VERSION,
+            "user_id": state.user.id,
+            "shard_count": state.shard_count,
+            "application_id": state.application_id,
+            "application_flags": flags.value if flags is not None else None,
+            "shards": [
+                {"shard_id": shard_id, **s._asdict()} for shard_id, s in self._sessions.items()
+            ],
+        }
+
+    def _write(self, generation: int, data: dict[str, Any]) -> None:
+        # this may run in an executor thread, concurrently with `save`
+        with self._write_lock:
+            # don't overwrite the file with older data
+            if generation <= self._written_generation:
+                return
+            self._written_generation = generation
+
+            # write to a temporary file first, to avoid corrupting the file if interrupted
+            tmp_path = f"{os.fspath(self.path)}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(utils._to_json(data))
+                os.replace(tmp_path, self.path)
+            except OSError:
+                _log.warning("Failed to write session file %s.", self.path, exc_info=True)
+
+    def save(self) -> None:
+        """Writes all stored resume states to the file, blocking until it has been written."""
+        if (data := self._dump()) is not None:
+            self._generation += 1
+            self._last_data = data
+            self._write(self._generation, data)
+
+    def save_later(self) -> None:
+        """Writes all stored resume states to the file in a background thread,
+        without blocking the event loop.
+
+        Nothing is written if the states didn't change since the last save. Saves requested
+        while a previous write is still in progress are combined into a single write.
+        """
+        data = self._dump()
+        if data is None or data == self._last_data:
+            return
+        self._generation += 1
+        self._last_data = data
+        self._pending = (self._generation, data)
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._write_pending())
+
+    async def save_async(self) -> None:
+        """Like :meth:`save_later`, but waits until the file has been written."""
+        self.save_later()
+        if self._save_task is not None:
+            await asyncio.shield(self._save_task)
+
+    async def _write_pending(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while (pending := self._pending) is not None:
+                self._pending = None
+                await loop.run_in_executor(None, self._write, *pending)
+        finally:
+            self._save_task = None
 
 
 class KeepAliveHandler(threading.Thread):
@@ -365,6 +621,10 @@ class DiscordWebSocket:
         self._buffer: bytearray = bytearray()
         self._close_code: int | None = None
         self._rate_limiter: GatewayRatelimiter = GatewayRatelimiter()
+        self._recorder: GatewayRecorder | None = None
+        self._stats: GatewayStats | None = None
+        self._lag_monitor: LoopLagMonitor | None = None
+        self._session_file: SessionFile | None = None
 
         # set in `from_client`
         self.token: str
@@ -442,6 +702,19 @@ class DiscordWebSocket:
         if client._enable_gateway_error_handler:
             ws._dispatch_gateway_error = client._dispatch_gateway_error
 
+        if client._gateway_recorder is not None:
+            ws._recorder = client._gateway_recorder
+            ws._recorder.record_connect(shard_id=shard_id)
+
+        ws._session_file = client._session_file
+        ws._lag_monitor = client._loop_lag_monitor
+
+        gateway_stats = client._connection._gateway_stats
+        stats_key = shard_id or 0
+        if (stats := gateway_stats.get(stats_key)) is None:
+            stats = gateway_stats[stats_key] = GatewayStats()
+        ws._stats = stats
+
         client._connection._update_references(ws)
 
         _log.debug("Created websocket connected to %s", gateway)
@@ -515,7 +788,7 @@ class DiscordWebSocket:
             }
 
         await self.call_hooks("before_identify", self.shard_id, initial=self._initial_identify)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=_PRIORITY_CONNECTION)
         _log.info("Shard ID %s has sent the IDENTIFY payload.", self.shard_id)
 
     async def resume(self) -> None:
@@ -530,10 +803,18 @@ class DiscordWebSocket:
             "d": {"seq": seq, "session_id": session_id, "token": self.token},
         }
 
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=_PRIORITY_CONNECTION)
         _log.info("Shard ID %s has sent the RESUME payload.", self.shard_id)
 
+    def _save_session(self) -> None:
+        if self._session_file is not None:
+            self._session_file.update(self)
+            self._session_file.save_later()
+
     async def received_message(self, raw_msg: str | bytes, /) -> None:
+        if self._recorder is not None:
+            self._recorder.record(raw_msg, shard_id=self.shard_id)
+
         if isinstance(raw_msg, bytes):
             self._buffer.extend(raw_msg)
 
@@ -545,10 +826,13 @@ class DiscordWebSocket:
 
         self.log_receive(raw_msg)
         msg: GatewayPayload = utils._from_json(raw_msg)
+        size = len(raw_msg)
         del raw_msg  # no need to keep this in memory
 
         _log.debug("For Shard ID %s: WebSocket Event: %s", self.shard_id, msg)
         event = msg.get("t")
+        if self._stats is not None:
+            self._stats.record(event, size)
         if event:
             self._dispatch("socket_event_type", event)
 
@@ -573,12 +857,15 @@ class DiscordWebSocket:
             if op == self.HEARTBEAT_ACK:
                 if self._keep_alive:
                     self._keep_alive.ack()
+                # persist the sequence regularly, so that it's still
+                # recent enough to resume the session after a crash
+                self._save_session()
                 return
 
             if op == self.HEARTBEAT:
                 if self._keep_alive:
                     beat = self._keep_alive.get_payload()
-                    await self.send_as_json(beat)
+                    await self.send_as_json(beat, priority=_PRIORITY_CONNECTION)
                 return
 
             if op == self.HELLO:
@@ -587,7 +874,9 @@ class DiscordWebSocket:
                     ws=self, interval=interval, shard_id=self.shard_id
                 )
                 # send a heartbeat immediately
-                await self.send_as_json(self._keep_alive.get_payload())
+                await self.send_as_json(
+                    self._keep_alive.get_payload(), priority=_PRIORITY_CONNECTION
+                )
                 self._keep_alive.start()
                 return
 
@@ -600,6 +889,7 @@ class DiscordWebSocket:
                 self.session_id = None
                 self.resume_gateway = None
                 _log.info("Shard ID %s session has been invalidated.", self.shard_id)
+                self._save_session()
                 await self.close(code=1000)
                 raise ReconnectWebSocket(self.shard_id, resume=False)
 
@@ -620,6 +910,7 @@ class DiscordWebSocket:
                 self.session_id,
                 self.resume_gateway,
             )
+            self._save_session()
 
         elif event == "RESUMED":
             self._trace = trace = data.get("_trace", [])
@@ -631,12 +922,15 @@ class DiscordWebSocket:
                 self.session_id,
                 ", ".join(trace),
             )
+            self._save_session()
 
         try:
             func = self._discord_parsers[event]  # pyright: ignore[reportArgumentType]
         except KeyError:
             _log.debug("Unknown event %s.", event)
         else:
+            if (lag_monitor := self._lag_monitor) is not None:
+                lag_monitor._event_started(event)  # pyright: ignore[reportArgumentType]
             try:
                 func(data)
             except Exception as e:
@@ -651,6 +945,9 @@ class DiscordWebSocket:
                 asyncio.create_task(
                     self._dispatch_gateway_error(event_name, data, self.shard_id, e)
                 )
+            finally:
+                if lag_monitor is not None:
+                    lag_monitor._event_finished()
 
         # remove the dispatched listeners
         removed: list[int] = []
@@ -743,18 +1040,24 @@ class DiscordWebSocket:
                 _log.info("Websocket closed with %s, cannot reconnect.", code)
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id, code=code) from None
 
-    async def debug_send(self, data: str, /) -> None:
-        await self._rate_limiter.block()
+    async def debug_send(
+        self, data: str, /, *, priority: int = _PRIORITY_DEFAULT, coalesce: str | None = None
+    ) -> None:
+        if not await self._rate_limiter.block(priority, coalesce=coalesce):
+            return
         self._dispatch("socket_raw_send", data)
         await self.socket.send_str(data)
 
-    async def send(self, data: str, /) -> None:
-        await self._rate_limiter.block()
+    async def send(
+        self, data: str, /, *, priority: int = _PRIORITY_DEFAULT, coalesce: str | None = None
+    ) -> None:
+        if not await self._rate_limiter.block(priority, coalesce=coalesce):
+            return
         await self.socket.send_str(data)
 
-    async def send_as_json(self, data: Any) -> None:
+    async def send_as_json(self, data: Any, *, priority: int = _PRIORITY_DEFAULT) -> None:
         try:
-            await self.send(utils._to_json(data))
+            await self.send(utils._to_json(data), priority=priority)
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -770,6 +1073,11 @@ class DiscordWebSocket:
     def get_heartbeat_data(self) -> int | None:
         return self.sequence
 
+    @property
+    def send_queue_size(self) -> int:
+        """The number of gateway commands currently waiting to be sent due to rate limits."""
+        return self._rate_limiter.queue_size
+
     async def change_presence(
         self,
         *,
@@ -800,7 +1108,8 @@ class DiscordWebSocket:
 
         sent = utils._to_json(payload)
         _log.debug('Sending "%s" to change status', sent)
-        await self.send(sent)
+        # only the most recent presence update is sent if multiple are waiting for the rate limit
+        await self.send(sent, coalesce="presence")
 
     async def request_chunks(
         self,
@@ -826,7 +1135,7 @@ class DiscordWebSocket:
         if query is not None:
             payload["d"]["query"] = query
 
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=_PRIORITY_CHUNKS)
 
     async def voice_state(
         self,
@@ -846,7 +1155,7 @@ class DiscordWebSocket:
         }
 
         _log.debug("Updating our voice state to %s.", payload)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=_PRIORITY_VOICE)
 
     async def close(self, code: int = 4000) -> None:
         if self._keep_alive:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import copy
 import datetime
 import unicodedata
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, MutableMapping, Sequence
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -14,6 +14,7 @@ from typing import (
     NamedTuple,
     NewType,
     TypeAlias,
+    TypeVar,
     cast,
     overload,
 )
@@ -23,6 +24,7 @@ from .app_commands import GuildApplicationCommandPermissions
 from .asset import Asset
 from .automod import AutoModAction, AutoModRule
 from .bans import BanEntry, BulkBanResult
+from .cache import _MemberCache, _MemberNameIndex, _peek
 from .channel import (
     CategoryChannel,
     ForumChannel,
@@ -66,7 +68,7 @@ from .mixins import Hashable
 from .object import Object
 from .onboarding import Onboarding
 from .partial_emoji import PartialEmoji
-from .permissions import PermissionOverwrite
+from .permissions import PermissionOverwrite, Permissions
 from .role import Role
 from .soundboard import GuildSoundboardSound
 from .stage_instance import StageInstance
@@ -79,11 +81,13 @@ from .widget import Widget, WidgetSettings
 
 __all__ = (
     "IncidentsData",
+    "ChunkProgress",
     "Guild",
     "GuildBuilder",
 )
 
 VocalGuildChannel: TypeAlias = VoiceChannel | StageChannel
+SortedChannelT = TypeVar("SortedChannelT", bound="abc.GuildChannel")
 MISSING = utils.MISSING
 
 if TYPE_CHECKING:
@@ -91,7 +95,6 @@ if TYPE_CHECKING:
     from .app_commands import APIApplicationCommand
     from .asset import AssetBytes
     from .automod import AutoModTriggerMetadata
-    from .permissions import Permissions
     from .state import ConnectionState
     from .template import Template
     from .threads import AnyThreadArchiveDuration, ForumTag
@@ -219,6 +222,95 @@ class IncidentsData:
         )
 
 
+class ChunkProgress:
+    """Represents the progress of a request for all members of a guild.
+
+    This is returned by :attr:`Guild.chunk_progress`, and is a snapshot of the
+    progress at the time it was created.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    guild: :class:`Guild`
+        The guild whose members are being requested.
+    members_received: :class:`int`
+        The number of members received so far.
+    member_count: :class:`int` | :data:`None`
+        The expected number of members, based on :attr:`Guild.member_count`
+        at the time the request was created.
+    chunks_received: :class:`int`
+        The number of member chunks received so far.
+    chunk_count: :class:`int` | :data:`None`
+        The total number of member chunks, or :data:`None` if no chunks were received yet.
+    elapsed: :class:`float` | :data:`None`
+        The number of seconds since the request was sent,
+        or :data:`None` if it is still waiting to be sent.
+    """
+
+    __slots__ = (
+        "guild",
+        "members_received",
+        "member_count",
+        "chunks_received",
+        "chunk_count",
+        "elapsed",
+    )
+
+    def __init__(
+        self,
+        *,
+        guild: Guild,
+        members_received: int,
+        member_count: int | None,
+        chunks_received: int,
+        chunk_count: int | None,
+        elapsed: float | None,
+    ) -> None:
+        self.guild: Guild = guild
+        self.members_received: int = members_received
+        self.member_count: int | None = member_count
+        self.chunks_received: int = chunks_received
+        self.chunk_count: int | None = chunk_count
+        self.elapsed: float | None = elapsed
+
+    @property
+    def queued(self) -> bool:
+        """:class:`bool`: Whether the request is still waiting to be sent."""
+        return self.elapsed is None
+
+    @property
+    def ratio(self) -> float | None:
+        """:class:`float` | :data:`None`: The completed fraction of the request, between ``0.0`` and ``1.0``.
+
+        This is based on the number of chunks if known, otherwise on the expected member count.
+        """
+        if self.chunk_count:
+            return self.chunks_received / self.chunk_count
+        if self.member_count:
+            return min(self.members_received / self.member_count, 1.0)
+        return None
+
+    @property
+    def eta(self) -> float | None:
+        """:class:`float` | :data:`None`: The estimated number of seconds until the request completes,
+        based on the rate at which chunks were received so far.
+
+        This is :data:`None` if no chunks were received yet.
+        """
+        ratio = self.ratio
+        if self.elapsed is None or not ratio:
+            return None
+        return self.elapsed * (1 - ratio) / ratio
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChunkProgress guild={self.guild!r} members_received={self.members_received}"
+            f" member_count={self.member_count} chunks_received={self.chunks_received}"
+            f" chunk_count={self.chunk_count} elapsed={self.elapsed!r}>"
+        )
+
+
 class Guild(Hashable):
     r"""Represents a Discord guild.
 
@@ -464,6 +556,10 @@ class Guild(Hashable):
         "_threads",
         "_region",
         "_safety_alerts_channel_id",
+        "_sorted_views",
+        "_permission_cache",
+        "_name_index",
+        "_skeleton",
     )
 
     _PREMIUM_GUILD_LIMITS: ClassVar[dict[int | None, _GuildLimit]] = {
@@ -475,37 +571,102 @@ class Guild(Hashable):
     }
 
     def __init__(self, *, data: GuildPayload, state: ConnectionState) -> None:
+        # memoized results of `roles`, `text_channels` etc., see `_invalidate_caches`
+        self._sorted_views: dict[str, Any] = {}
+        # (channel ID, role IDs) -> (role-derived permissions, administrator), see `GuildChannel.permissions_for`
+        self._permission_cache: dict[tuple[int, bytes], tuple[int, bool]] = {}
         self._channels: dict[int, GuildChannel] = {}
-        self._members: dict[int, Member] = {}
+        self._members: MutableMapping[int, Member] = state.cache_backends.members()
+        if isinstance(self._members, _MemberCache):
+            self._members._owner = self
+        self._name_index: _MemberNameIndex | None = (
+            _MemberNameIndex() if state.cache_backends.member_name_index else None
+        )
         self._voice_states: dict[int, VoiceState] = {}
         self._threads: dict[int, Thread] = {}
         self._stage_instances: dict[int, StageInstance] = {}
         self._scheduled_events: dict[int, GuildScheduledEvent] = {}
+        # whether only the guild's channels, roles and own member are cached,
+        # see `Client.guild_cache_filter`
+        self._skeleton: bool = False
         self._state: ConnectionState = state
         self._from_data(data)
 
     def _add_channel(self, channel: GuildChannel, /) -> None:
         self._channels[channel.id] = channel
+        self._invalidate_caches()
 
     def _remove_channel(self, channel: Snowflake, /) -> None:
         self._channels.pop(channel.id, None)
+        self._invalidate_caches()
+
+    def _invalidate_caches(self) -> None:
+        # must be called whenever channels or roles are added, removed or updated in-place
+        self._sorted_views.clear()
+        self._permission_cache.clear()
+
+    def _sorted_channels(self, name: str, cls: type[SortedChannelT]) -> list[SortedChannelT]:
+        try:
+            channels = self._sorted_views[name]
+        except KeyError:
+            channels = [ch for ch in self._channels.values() if isinstance(ch, cls)]
+            channels.sort(key=lambda c: (c.position, c.id))
+            self._sorted_views[name] = channels
+        return channels.copy()
 
     def _voice_state_for(self, user_id: int, /) -> VoiceState | None:
         return self._voice_states.get(user_id)
 
     def _add_member(self, member: Member, /) -> None:
+        if self._skeleton and member.id != self._state.self_id:
+            return
         self._members[member.id] = member
+        if self._name_index is not None:
+            self._name_index.add(member)
+        # only cached guilds are part of the user -> guilds index
+        state = self._state
+        if state._guilds.get(self.id) is self:
+            state._user_guilds.add(member.id, self.id)
 
     def _store_thread(self, payload: ThreadPayload, /) -> Thread:
         thread = Thread(guild=self, state=self._state, data=payload)
-        self._threads[thread.id] = thread
+        if not self._skeleton:
+            self._threads[thread.id] = thread
         return thread
 
     def _remove_member(self, member: Snowflake, /) -> None:
         self._members.pop(member.id, None)
+        self._forget_member(member.id)
+
+    def _forget_member(self, member_id: int, /) -> None:
+        # removes a member that isn't in the member cache anymore from the indexes
+        if self._name_index is not None:
+            self._name_index.discard(member_id)
+        state = self._state
+        if state._guilds.get(self.id) is self:
+            state._user_guilds.discard(member_id, self.id)
+
+    def _on_member_evicted(self, member: Member, /) -> None:
+        # called by bounded member caches, see `MemberCachePolicy`
+        self._forget_member(member.id)
+        self._state._evict_users((member.id,))
 
     def _add_thread(self, thread: Thread, /) -> None:
-        self._threads[thread.id] = thread
+        if not self._skeleton:
+            self._threads[thread.id] = thread
+
+    def _trim_cache(self) -> list[int]:
+        # drops everything that isn't cached for guilds that aren't fully cached,
+        # and returns the IDs of the removed members
+        self._skeleton = True
+        self_id = self._state.self_id
+        removed = [member_id for member_id in self._members if member_id != self_id]
+        for member_id in removed:
+            self._remove_member(Object(member_id))
+        self.emojis = ()
+        self.stickers = ()
+        self._threads.clear()
+        return removed
 
     def _remove_thread(self, thread: Snowflake, /) -> None:
         self._threads.pop(thread.id, None)
@@ -576,6 +737,7 @@ class Guild(Hashable):
             r.position += not r.is_default()
 
         self._roles[role.id] = role
+        self._invalidate_caches()
 
     def _remove_role(self, role_id: int, /) -> Role:
         # this raises KeyError if it fails..
@@ -587,6 +749,7 @@ class Guild(Hashable):
         for r in self._roles.values():
             r.position -= r.position > role.position
 
+        self._invalidate_caches()
         return role
 
     def get_command(self, application_command_id: int, /) -> APIApplicationCommand | None:
@@ -643,6 +806,7 @@ class Guild(Hashable):
         self.unavailable: bool = guild.get("unavailable", False)
         self.id: int = int(guild["id"])
         self._roles: dict[int, Role] = {}
+        self._invalidate_caches()
         state = self._state  # speed up attribute access
         for r in guild.get("roles", []):
             role = Role(guild=self, data=r, state=state)
@@ -781,9 +945,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, VoiceChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("voice_channels", VoiceChannel)
 
     @property
     def stage_channels(self) -> list[StageChannel]:
@@ -793,9 +955,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, StageChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("stage_channels", StageChannel)
 
     @property
     def forum_channels(self) -> list[ForumChannel]:
@@ -805,9 +965,7 @@ class Guild(Hashable):
 
         .. versionadded:: 2.5
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, ForumChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("forum_channels", ForumChannel)
 
     @property
     def media_channels(self) -> list[MediaChannel]:
@@ -817,9 +975,7 @@ class Guild(Hashable):
 
         .. versionadded:: 2.10
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, MediaChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("media_channels", MediaChannel)
 
     @property
     def me(self) -> Member:
@@ -841,9 +997,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, TextChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("text_channels", TextChannel)
 
     @property
     def categories(self) -> list[CategoryChannel]:
@@ -851,9 +1005,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, CategoryChannel)]
-        r.sort(key=lambda c: (c.position, c.id))
-        return r
+        return self._sorted_channels("categories", CategoryChannel)
 
     def by_category(self) -> list[ByCategoryItem]:
         r"""Returns every :class:`CategoryChannel` and their associated channels.
@@ -868,6 +1020,13 @@ class Guild(Hashable):
         :class:`list`\[:class:`tuple`\[:class:`CategoryChannel` | :data:`None`, :class:`list`\[:class:`abc.GuildChannel`]]]:
             The categories and their associated channels.
         """
+        try:
+            cached: list[ByCategoryItem] = self._sorted_views["by_category"]
+        except KeyError:
+            pass
+        else:
+            return [(category, channels.copy()) for category, channels in cached]
+
         grouped: dict[int | None, list[GuildChannel]] = {}
         for channel in self._channels.values():
             if isinstance(channel, CategoryChannel):
@@ -888,7 +1047,8 @@ class Guild(Hashable):
         as_list.sort(key=key)
         for _, channels in as_list:
             channels.sort(key=lambda c: (c._sorting_bucket, c.position, c.id))
-        return as_list
+        self._sorted_views["by_category"] = as_list
+        return [(category, channels.copy()) for category, channels in as_list]
 
     def _resolve_channel(self, id: int | None, /) -> GuildChannel | Thread | None:
         if id is None:
@@ -1062,6 +1222,10 @@ class Guild(Hashable):
         """
         return self._members.get(user_id)
 
+    def _peek_member(self, user_id: int) -> Member | None:
+        # unlike `get_member`, this doesn't affect the eviction order or expire members
+        return _peek(self._members, user_id)
+
     @property
     def premium_subscribers(self) -> list[Member]:
         r""":class:`list`\[:class:`Member`]: A list of members who have "boosted" this guild."""
@@ -1074,7 +1238,64 @@ class Guild(Hashable):
         The first element of this list will be the lowest role in the
         hierarchy.
         """
-        return sorted(self._roles.values())
+        try:
+            roles = self._sorted_views["roles"]
+        except KeyError:
+            roles = self._sorted_views["roles"] = sorted(self._roles.values())
+        return roles.copy()
+
+    def permissions_for_members(
+        self, members: Iterable[Member] | None = None, /
+    ) -> dict[Member, Permissions]:
+        r"""Resolves the guild-wide permissions of many members at once.
+
+        This is equivalent to :attr:`Member.guild_permissions` for each member,
+        but considerably faster for large amounts of members, since the permissions
+        are only resolved once for each distinct set of roles.
+        See :meth:`abc.GuildChannel.permissions_for_members` for channel permissions.
+
+        .. versionadded:: 2.13
+
+        Parameters
+        ----------
+        members: :class:`~collections.abc.Iterable`\[:class:`Member`] | :data:`None`
+            The members to resolve permissions for.
+            Defaults to all cached members of the guild.
+
+        Returns
+        -------
+        :class:`dict`\[:class:`Member`, :class:`Permissions`]
+            The resolved permissions of each member.
+        """
+        if members is None:
+            members = self._members.values()
+
+        everyone = self.default_role._permissions
+        get_role = self._roles.get
+        owner_id = self.owner_id
+        all_value = Permissions.all().value
+        # role IDs -> resolved permission value
+        groups: dict[bytes, int] = {}
+        result: dict[Member, Permissions] = {}
+        for member in members:
+            if member.id == owner_id:
+                result[member] = Permissions._from_value(all_value)
+                continue
+
+            key = member._roles.tobytes()
+            try:
+                value = groups[key]
+            except KeyError:
+                value = everyone
+                for role_id in member._roles:
+                    role = get_role(role_id)
+                    if role is not None:
+                        value |= role._permissions
+                if value & Permissions.administrator.flag:
+                    value = all_value
+                groups[key] = value
+            result[member] = Permissions._from_value(value)
+        return result
 
     def get_role(self, role_id: int, /) -> Role | None:
         """Returns a role with the given ID.
@@ -1253,6 +1474,30 @@ class Guild(Hashable):
             return False
         return count == len(self._members)
 
+    @property
+    def fully_cached(self) -> bool:
+        """:class:`bool`: Whether the guild is fully cached.
+
+        If this is ``False``, only the guild's channels, roles and the client's own member
+        are cached, but not its other members, emojis, stickers or threads.
+        See :attr:`Client.guild_cache_filter` for details.
+
+        .. versionadded:: 2.13
+        """
+        return not self._skeleton
+
+    @property
+    def chunk_progress(self) -> ChunkProgress | None:
+        """:class:`ChunkProgress` | :data:`None`: Returns the progress of the pending request
+        for all members of this guild, e.g. from :meth:`chunk` or startup chunking, if any.
+
+        .. versionadded:: 2.13
+        """
+        request = self._state._guild_chunk_requests.get(self.id)
+        if request is None:
+            return None
+        return request.progress(self)
+
     @property
     def shard_id(self) -> int:
         """:class:`int`: Returns the shard ID for this guild if applicable."""
@@ -1284,6 +1529,12 @@ class Guild(Hashable):
         .. versionchanged:: 2.9
             Now takes :attr:`User.global_name` into account.
 
+        .. versionchanged:: 2.13
+            If the member name index is enabled (see :class:`CacheBackends`), this uses an index
+            instead of scanning all members. In that case, members with a matching
+            nickname always take precedence over members with a matching global name,
+            which in turn take precedence over members with a matching username.
+
         Parameters
         ----------
         name: :class:`str`
@@ -1295,6 +1546,9 @@ class Guild(Hashable):
             The member in this guild with the associated name. If not found
             then :data:`None` is returned.
         """
+        if self._name_index is not None:
+            return self._get_member_named_indexed(name, self._name_index)
+
         username, _, discriminator = name.rpartition("#")
         if username and (
             discriminator == "0" or (len(discriminator) == 4 and discriminator.isdecimal())
@@ -1309,6 +1563,82 @@ class Guild(Hashable):
 
         return utils.find(pred, self._members.values())
 
+    def _get_member_named_indexed(self, name: str, index: _MemberNameIndex) -> Member | None:
+        # members may have been evicted from bounded member caches without being removed
+        # from the index, and entries may be outdated if a name changed without reindexing,
+        # so candidates are checked against their current names
+        get_member = self._members.get
+        username, _, discriminator = name.rpartition("#")
+        if username and (
+            discriminator == "0" or (len(discriminator) == 4 and discriminator.isdecimal())
+        ):
+            for member_id in index.get_username(username):
+                member = get_member(member_id)
+                if (
+                    member is not None
+                    and member.name == username
+                    and member.discriminator == discriminator
+                ):
+                    return member
+
+        for member_id in index.get(name):
+            member = get_member(member_id)
+            if member is not None and name in (member.nick, member.global_name, member.name):
+                return member
+        return None
+
+    def search_cached_members(self, prefix: str, /, *, limit: int = 5) -> list[Member]:
+        r"""Returns cached members whose nickname, global name or username starts with the given prefix.
+
+        The comparison is case-insensitive. Unlike :meth:`query_members`, this only
+        searches the internal member cache and does not make any requests.
+
+        If the member name index is enabled (see :class:`CacheBackends`), this uses an index
+        and is fast even in very large guilds; otherwise, all cached members are scanned.
+
+        .. versionadded:: 2.13
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            The prefix to search for.
+        limit: :class:`int`
+            The maximum number of members to return. Defaults to 5.
+
+        Returns
+        -------
+        :class:`list`\[:class:`Member`]
+            The members that matched the prefix, ordered by the matched name if an index is used,
+            or in cache order otherwise.
+        """
+        if limit < 1:
+            msg = "limit must be greater than 0."
+            raise ValueError(msg)
+
+        if self._name_index is not None:
+            get_member = self._members.get
+            result: list[Member] = []
+            # request a few more IDs, in case some members were evicted from the cache
+            for member_id in self._name_index.search(prefix, limit * 2):
+                member = get_member(member_id)
+                if member is not None:
+                    result.append(member)
+                    if len(result) >= limit:
+                        break
+            return result
+
+        prefix = prefix.casefold()
+        result = []
+        for member in self._members.values():
+            if any(
+                name and name.casefold().startswith(prefix)
+                for name in (member.nick, member.global_name, member.name)
+            ):
+                result.append(member)
+                if len(result) >= limit:
+                    break
+        return result
+
     def _create_channel(
         self,
         name: str,
@@ -1501,7 +1831,7 @@ class Guild(Hashable):
         channel = TextChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_voice_channel(
@@ -1618,7 +1948,7 @@ class Guild(Hashable):
         channel = VoiceChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_stage_channel(
@@ -1745,7 +2075,7 @@ class Guild(Hashable):
         channel = StageChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_forum_channel(
@@ -1895,7 +2225,7 @@ class Guild(Hashable):
         channel = ForumChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_media_channel(
@@ -2021,7 +2351,7 @@ class Guild(Hashable):
         channel = MediaChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_category(
@@ -2081,7 +2411,7 @@ class Guild(Hashable):
         channel = CategoryChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     create_category_channel = create_category
@@ -4135,6 +4465,7 @@ class Guild(Hashable):
             roles.append(role)
             self._roles[role.id] = role
 
+        self._invalidate_caches()
         return roles
 
     async def kick(self, user: Snowflake, *, reason: str | None = None) -> None:
@@ -4851,6 +5182,12 @@ class Guild(Hashable):
 
         .. versionadded:: 2.4
 
+        .. versionchanged:: 2.13
+            Concurrent calls for the same guild are coalesced: missing members are
+            collected for a short time and requested together, in batches of up to 100,
+            and members that are already being requested are not requested again.
+            A single missing member is now also requested using the websocket.
+
         Parameters
         ----------
         user_ids: :class:`list`\[:class:`int`]
@@ -4891,29 +5228,10 @@ class Guild(Hashable):
         if not unresolved_ids:
             return members
 
-        if len(unresolved_ids) == 1:
-            # fetch_member is cheaper than query_members
-            try:
-                member = await self.fetch_member(unresolved_ids[0])
-                members.append(member)
-                if cache:
-                    self._add_member(member)
-            except HTTPException:
-                pass
-        else:
-            # We have to split the request into several smaller requests
-            # because the limit is 100 members per request.
-            for i in range(0, len(unresolved_ids), 100):
-                limit = min(100, len(unresolved_ids) - i)
-                members += await self._state.query_members(
-                    self,
-                    query=None,
-                    limit=limit,
-                    user_ids=unresolved_ids[i : i + 100],
-                    presences=presences,
-                    cache=cache,
-                )
-
+        # concurrent calls are coalesced into requests of up to 100 members each
+        members += await self._state.resolve_members(
+            self, unresolved_ids, presences=presences, cache=cache
+        )
         return members
 
     getch_members = get_or_fetch_members
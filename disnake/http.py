@@ -6,6 +6,7 @@ import asyncio
 import logging
 import re
 import sys
+import time
 import weakref
 from collections.abc import Coroutine, Iterable, Sequence
 from errno import ECONNRESET
@@ -212,6 +213,36 @@ class MaybeUnlock:
             self.lock.release()
 
 
+class HTTPStats:
+    """Counts the responses, rate limits and retries of HTTP requests, per route."""
+
+    __slots__ = ("durations", "ratelimits", "responses", "retries")
+
+    def __init__(self) -> None:
+        # "METHOD /path" -> durations of all attempts
+        self.durations: dict[str, utils.Histogram] = {}
+        # (route, status) -> count
+        self.responses: dict[tuple[str, int], int] = {}
+        # rate limit bucket -> number of 429 responses
+        self.ratelimits: dict[str, int] = {}
+        # (route, reason) -> count
+        self.retries: dict[tuple[str, str], int] = {}
+
+    def record_response(self, route: str, status: int, duration: float) -> None:
+        if (histogram := self.durations.get(route)) is None:
+            histogram = self.durations[route] = utils.Histogram()
+        histogram.observe(duration)
+        key = (route, status)
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def record_ratelimit(self, bucket: str) -> None:
+        self.ratelimits[bucket] = self.ratelimits.get(bucket, 0) + 1
+
+    def record_retry(self, route: str, reason: str) -> None:
+        key = (route, reason)
+        self.retries[key] = self.retries.get(key, 0) + 1
+
+
 # For some reason, the Discord voice websocket expects this header to be
 # completely lowercase while aiohttp respects spec and does it as case-insensitive
 aiohttp.hdrs.WEBSOCKET = "websocket"  # pyright: ignore[reportAttributeAccessIssue]
@@ -240,6 +271,7 @@ class HTTPClient:
         self.proxy: str | None = proxy
         self.proxy_auth: aiohttp.BasicAuth | None = proxy_auth
         self.use_clock: bool = not unsync_clock
+        self._stats: HTTPStats = HTTPStats()
 
         user_agent = "DiscordBot (https://github.com/DisnakeDev/disnake {0}) Python/{1[0]}.{1[1]} aiohttp/{2}"
         self.user_agent: str = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
@@ -281,6 +313,9 @@ class HTTPClient:
         bucket = route.bucket
         method = route.method
         url = route.url
+        # the route without parameters, for statistics
+        route_key = f"{method} {route.path}"
+        stats = self._stats
 
         lock = self._locks.get(bucket)
         if lock is None:
@@ -340,6 +375,7 @@ class HTTPClient:
                         )
                     kwargs["data"] = form_data
 
+                start = time.perf_counter()
                 try:
                     async with self.__session.request(method, url, **kwargs) as response:
                         _log.debug(
@@ -352,6 +388,9 @@ class HTTPClient:
 
                         # even errors have text involved in them so this is safe to call
                         data = await json_or_text(response)
+                        stats.record_response(
+                            route_key, response.status, time.perf_counter() - start
+                        )
 
                         # check if we have rate limit header information
                         remaining = response.headers.get("X-Ratelimit-Remaining")
@@ -375,6 +414,9 @@ class HTTPClient:
 
                         # we are being rate limited
                         if response.status == 429:
+                            stats.record_ratelimit(
+                                response.headers.get("X-Ratelimit-Bucket") or route_key
+                            )
                             if not response.headers.get("Via") or isinstance(data, str):
                                 # Banned by Cloudflare more than likely.
                                 raise HTTPException(response, data)
@@ -394,6 +436,9 @@ class HTTPClient:
                                 )
                                 self._global_over.clear()
 
+                            # the last attempt isn't followed by a retry
+                            if tries < 4:
+                                stats.record_retry(route_key, "ratelimited")
                             await asyncio.sleep(retry_after)
                             _log.debug("Done sleeping for the rate limit. Retrying...")
 
@@ -407,6 +452,8 @@ class HTTPClient:
 
                         # we've received a 500, 502, or 504, unconditional retry
                         if response.status in {500, 502, 504}:
+                            if tries < 4:
+                                stats.record_retry(route_key, "server_error")
                             await asyncio.sleep(1 + tries * 2)
                             continue
 
@@ -424,6 +471,7 @@ class HTTPClient:
                 except OSError as e:
                     # Connection reset by peer
                     if tries < 4 and e.errno == ECONNRESET:
+                        stats.record_retry(route_key, "connection_reset")
                         await asyncio.sleep(1 + tries * 2)
                         continue
                     raise
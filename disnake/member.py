@@ -45,7 +45,11 @@ if TYPE_CHECKING:
     from .partial_emoji import PartialEmoji
     from .role import Role
     from .state import ConnectionState
-    from .types.activity import PresenceData
+    from .types.activity import (
+        Activity as ActivityPayload,
+        ClientStatus as ClientStatusPayload,
+        PresenceData,
+    )
     from .types.gateway import GuildMemberUpdateEvent
     from .types.member import (
         BaseMember as BaseMemberPayload,
@@ -63,6 +67,29 @@ if TYPE_CHECKING:
     VocalGuildChannel: TypeAlias = VoiceChannel | StageChannel
 
 
+# Client status dicts are shared between members and treated as immutable,
+# so that most members don't need a separate dict, see `Member.status`.
+# There are only a few distinct combinations, so referencing a shared dict costs
+# as much per member as a packed status code would, without a dense member index.
+_CLIENT_STATUSES: dict[tuple[str, tuple[tuple[str, str], ...]], dict[str | None, str]] = {}
+
+
+def _client_status(
+    status: str, client_status: ClientStatusPayload | None = None
+) -> dict[str | None, str]:
+    key = (status, tuple(sorted(client_status.items())) if client_status else ())
+    try:
+        return _CLIENT_STATUSES[key]
+    except KeyError:
+        result: dict[str | None, str] = {
+            sys.intern(k): sys.intern(v)  # pyright: ignore[reportArgumentType]
+            for k, v in (client_status or {}).items()
+        }
+        result[None] = sys.intern(status)
+        _CLIENT_STATUSES[key] = result
+        return result
+
+
 class VoiceState:
     """Represents a Discord user's voice state.
 
@@ -260,7 +287,7 @@ class Member(disnake.abc.Messageable, _UserTag):
         "_roles",
         "joined_at",
         "premium_since",
-        "activities",
+        "_activities",
         "guild",
         "pending",
         "nick",
@@ -330,12 +357,15 @@ class Member(disnake.abc.Messageable, _UserTag):
 
         self.joined_at: datetime.datetime | None = utils.parse_time(data.get("joined_at"))
         self.premium_since: datetime.datetime | None = utils.parse_time(data.get("premium_since"))
-        self._roles: utils.SnowflakeList = utils.SnowflakeList(map(int, data["roles"]))
-        self._client_status: dict[str | None, str] = {None: "offline"}
-        self.activities: tuple[ActivityTypes, ...] = ()
+        self._roles: utils.SnowflakeList = self._make_roles(data["roles"])
+        self._client_status: dict[str | None, str] = _client_status("offline")
+        # either the activity objects, or the raw activity data in compact mode, see `activities`
+        self._activities: tuple[ActivityTypes, ...] | list[ActivityPayload] = ()
         self.nick: str | None = data.get("nick")
         self.pending: bool = data.get("pending", False)
         self._avatar: str | None = data.get("avatar")
+        if self._is_compact:
+            self._intern_strings()
         self._banner: str | None = data.get("banner")
         timeout_datetime = utils.parse_time(data.get("communication_disabled_until"))
         self._communication_disabled_until: datetime.datetime | None = timeout_datetime
@@ -372,13 +402,37 @@ class Member(disnake.abc.Messageable, _UserTag):
             state=message._state,
         )
 
+    @property
+    def _is_compact(self) -> bool:
+        # partial states (e.g. of webhooks without a client) don't support compact members
+        return getattr(self._state, "_compact_members", False)
+
+    def _make_roles(self, role_ids: Sequence[str | int]) -> utils.SnowflakeList:
+        roles = utils.SnowflakeList(map(int, role_ids))
+        if self._is_compact:
+            # identical role lists are shared between members, since they're never modified in-place
+            return self._state._shared_roles(roles)
+        return roles
+
+    def _intern_strings(self) -> None:
+        if self.nick is not None:
+            self.nick = sys.intern(self.nick)
+        if self._avatar is not None:
+            self._avatar = sys.intern(self._avatar)
+
     def _update_from_message(self, data: MemberPayload) -> None:
         self.joined_at = utils.parse_time(data.get("joined_at"))
         self.premium_since = utils.parse_time(data.get("premium_since"))
-        self._roles = utils.SnowflakeList(map(int, data["roles"]))
+        self._roles = self._make_roles(data["roles"])
         self.nick = data.get("nick", None)
         self.pending = data.get("pending", False)
         self._flags = data.get("flags", 0)
+        if self._is_compact:
+            self._intern_strings()
+        # the nickname may have changed
+        guild = self.guild
+        if guild._name_index is not None and guild._peek_member(self.id) is self:
+            guild._name_index.add(self)
 
     @classmethod
     def _try_upgrade(
@@ -398,15 +452,20 @@ class Member(disnake.abc.Messageable, _UserTag):
     def _copy(cls, member: Member) -> Self:
         self = cls.__new__(cls)  # to bypass __init__
 
-        self._roles = utils.SnowflakeList(member._roles, is_sorted=True)
+        self._state = member._state
+        # shared role lists and status dicts are never modified in-place
+        if self._is_compact:
+            self._roles = member._roles
+            self._client_status = member._client_status
+        else:
+            self._roles = utils.SnowflakeList(member._roles, is_sorted=True)
+            self._client_status = member._client_status.copy()
         self.joined_at = member.joined_at
         self.premium_since = member.premium_since
-        self._client_status = member._client_status.copy()
         self.guild = member.guild
         self.nick = member.nick
         self.pending = member.pending
-        self.activities = member.activities
-        self._state = member._state
+        self._activities = member._activities
         self._avatar = member._avatar
         self._banner = member._banner
         self._communication_disabled_until = member.current_timeout
@@ -431,21 +490,35 @@ class Member(disnake.abc.Messageable, _UserTag):
             self.pending = data["pending"]
 
         self.premium_since = utils.parse_time(data.get("premium_since"))
-        self._roles = utils.SnowflakeList(map(int, data["roles"]))
+        self._roles = self._make_roles(data["roles"])
         self._avatar = data.get("avatar")
         self._banner = data.get("banner")
         timeout_datetime = utils.parse_time(data.get("communication_disabled_until"))
         self._communication_disabled_until = timeout_datetime
         self._flags = data.get("flags", 0)
         self._avatar_decoration_data = data.get("avatar_decoration_data")
+        if self._is_compact:
+            self._intern_strings()
 
     def _presence_update(self, data: PresenceData, user: UserPayload) -> tuple[User, User] | None:
-        self.activities = tuple(create_activity(a, state=self._state) for a in data["activities"])
-        self._client_status = {
-            sys.intern(key): sys.intern(value)  # pyright: ignore[reportArgumentType]
-            for key, value in data.get("client_status", {}).items()
-        }
-        self._client_status[None] = sys.intern(data["status"])
+        store = getattr(self._state, "_presence_store", None)
+        if store is not None:
+            # identical activities and statuses are shared between members
+            self._activities = store._get_activities(data["activities"], self._state)
+            self._client_status = _client_status(data["status"], data.get("client_status"))
+        elif self._is_compact:
+            # activities are only created once accessed
+            self._activities = data["activities"] or ()
+            self._client_status = _client_status(data["status"], data.get("client_status"))
+        else:
+            self._activities = tuple(
+                create_activity(a, state=self._state) for a in data["activities"]
+            )
+            self._client_status = {
+                sys.intern(key): sys.intern(value)  # pyright: ignore[reportArgumentType]
+                for key, value in data.get("client_status", {}).items()
+            }
+            self._client_status[None] = sys.intern(data["status"])
 
         if len(user) > 1:
             return self._update_inner_user(user)
@@ -486,6 +559,8 @@ class Member(disnake.abc.Messageable, _UserTag):
                 u._collectibles,
                 u._primary_guild,
             ) = modified
+            if self._is_compact:
+                self._state._intern_user(u)
             # Signal to dispatch on_user_update
             return to_return, u
         return None
@@ -506,7 +581,22 @@ class Member(disnake.abc.Messageable, _UserTag):
     @status.setter
     def status(self, value: Status) -> None:
         # internal use only
-        self._client_status[None] = str(value)
+        # the dict may be shared with other members, so a copy is modified instead
+        self._client_status = {**self._client_status, None: str(value)}
+
+    @property
+    def activities(self) -> tuple[ActivityTypes, ...]:
+        activities = self._activities
+        if isinstance(activities, list):
+            self._activities = activities = tuple(
+                create_activity(a, state=self._state) for a in activities
+            )
+        return activities
+
+    @activities.setter
+    def activities(self, value: tuple[ActivityTypes, ...]) -> None:
+        # internal use only
+        self._activities = value
 
     @property
     def tag(self) -> str:
@@ -76,9 +76,12 @@ if TYPE_CHECKING:
         MessageApplication as MessageApplicationPayload,
         MessageCall as MessageCallPayload,
         MessageReference as MessageReferencePayload,
+        MessageSnapshot as MessageSnapshotPayload,
         Reaction as ReactionPayload,
         RoleSubscriptionData as RoleSubscriptionDataPayload,
     )
+    from .types.poll import Poll as PollPayload
+    from .types.sticker import StickerItem as StickerItemPayload
     from .types.threads import ThreadArchiveDurationLiteral
     from .types.user import User as UserPayload
     from .ui._types import MessageComponents
@@ -953,6 +956,43 @@ class RoleSubscriptionData:
         self.is_renewal: bool = data["is_renewal"]
 
 
+class _LazyAttribute:
+    # A message attribute that is decoded from the raw payload on first access,
+    # if the message was created in lazy mode (see `CacheBackends.lazy_messages`).
+    # Otherwise, the value is set in `Message.__init__` right away.
+
+    __slots__ = ("_decoder", "_slot", "name")
+
+    def __init__(self, slot: str, decoder: str) -> None:
+        self._slot: Any = slot
+        self._decoder: str = decoder
+        self.name: str = ""
+
+    def __set_name__(self, owner: type[Message], name: str) -> None:
+        self.name = name
+        # use the slot's member descriptor directly, which is faster than `getattr`
+        self._slot = owner.__dict__[self._slot]
+
+    def __get__(self, instance: Message | None, owner: type[Message]) -> Any:
+        if instance is None:
+            return self
+        try:
+            return self._slot.__get__(instance, owner)
+        except AttributeError:
+            pass
+
+        lazy = instance._lazy
+        payload = lazy.pop(self.name, None) if lazy else None
+        value = getattr(instance, self._decoder)(payload)
+        self._slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: Message, value: Any) -> None:
+        self._slot.__set__(instance, value)
+        if instance._lazy:
+            instance._lazy.pop(self.name, None)
+
+
 def flatten_handlers(cls: type[Message]) -> type[Message]:
     prefix = len("_handle_")
     handlers = [
@@ -1159,42 +1199,90 @@ class Message(Hashable):
         "application_id",
         "webhook_id",
         "mention_everyone",
-        "embeds",
+        "_embeds",
         "id",
         "mentions",
         "author",
-        "attachments",
+        "_attachments",
         "nonce",
         "pinned",
         "role_mentions",
         "type",
         "flags",
-        "reactions",
-        "reference",
-        "_interaction",
-        "interaction_metadata",
-        "message_snapshots",
+        "_reactions",
+        "_reference",
+        "_interaction_reference",
+        "_interaction_metadata",
+        "_message_snapshots",
         "application",
         "activity",
-        "stickers",
-        "components",
+        "_stickers",
+        "_components",
         "guild",
-        "poll",
+        "_poll",
         "call",
         "_edited_timestamp",
         "_role_subscription_data",
         "_pinned_at",
+        "_lazy",
     )
 
     if TYPE_CHECKING:
         _HANDLERS: ClassVar[list[tuple[str, Callable[..., None]]]]
         _CACHED_SLOTS: ClassVar[list[str]]
         guild: Guild | None
-        reference: MessageReference | None
         mentions: list[User | Member]
         author: User | Member
         role_mentions: list[Role]
 
+        reactions: list[Reaction]
+        attachments: list[Attachment]
+        embeds: list[Embed]
+        stickers: list[StickerItem]
+        components: list[MessageTopLevelComponent]
+        poll: Poll | None
+        _interaction: InteractionReference | None
+        interaction_metadata: InteractionMetadata | None
+        reference: MessageReference | None
+        message_snapshots: list[ForwardedMessage]
+    else:
+        reactions = _LazyAttribute("_reactions", "_decode_reactions")
+        attachments = _LazyAttribute("_attachments", "_decode_attachments")
+        embeds = _LazyAttribute("_embeds", "_decode_embeds")
+        stickers = _LazyAttribute("_stickers", "_decode_stickers")
+        components = _LazyAttribute("_components", "_decode_components")
+        poll = _LazyAttribute("_poll", "_decode_poll")
+        _interaction = _LazyAttribute("_interaction_reference", "_decode_interaction")
+        interaction_metadata = _LazyAttribute(
+            "_interaction_metadata", "_decode_interaction_metadata"
+        )
+        reference = _LazyAttribute("_reference", "_decode_reference")
+        message_snapshots = _LazyAttribute("_message_snapshots", "_decode_message_snapshots")
+
+    _LAZY_ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+        "reactions",
+        "attachments",
+        "embeds",
+        "stickers",
+        "components",
+        "poll",
+        "_interaction",
+        "interaction_metadata",
+        "reference",
+        "message_snapshots",
+    )
+    # payload keys of lazy attributes that only depend on a single key
+    _LAZY_KEYS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("reactions", "reactions"),
+        ("attachments", "attachments"),
+        ("embeds", "embeds"),
+        ("stickers", "sticker_items"),
+        ("components", "components"),
+        ("poll", "poll"),
+        ("_interaction", "interaction"),
+        ("interaction_metadata", "interaction_metadata"),
+    )
+
     def __init__(
         self,
         *,
@@ -1206,13 +1294,6 @@ class Message(Hashable):
         self.id: int = int(data["id"])
         self.application_id: int | None = utils._get_as_snowflake(data, "application_id")
         self.webhook_id: int | None = utils._get_as_snowflake(data, "webhook_id")
-        self.reactions: list[Reaction] = [
-            Reaction(message=self, data=d) for d in data.get("reactions", [])
-        ]
-        self.attachments: list[Attachment] = [
-            Attachment(data=a, state=self._state) for a in data["attachments"]
-        ]
-        self.embeds: list[Embed] = [Embed.from_dict(a) for a in data["embeds"]]
         self.application: MessageApplicationPayload | None = data.get("application")
         self.activity: MessageActivityPayload | None = data.get("activity")
         # for user experience, on_message has no business getting partials
@@ -1230,16 +1311,6 @@ class Message(Hashable):
         self.tts: bool = data["tts"]
         self.content: str = data["content"]
         self.nonce: int | str | None = data.get("nonce")
-        self.stickers: list[StickerItem] = [
-            StickerItem(data=d, state=state) for d in data.get("sticker_items", [])
-        ]
-        self.components: list[MessageTopLevelComponent] = [
-            _message_component_factory(d) for d in data.get("components", [])
-        ]
-
-        self.poll: Poll | None = None
-        if poll_data := data.get("poll"):
-            self.poll = Poll.from_dict(message=self, data=poll_data)
         self.call = MessageCall(data=call_data) if (call_data := data.get("call")) else None
         try:
             # if the channel doesn't have a guild attribute, we handle that
@@ -1247,16 +1318,23 @@ class Message(Hashable):
         except AttributeError:
             self.guild = state._get_guild(utils._get_as_snowflake(data, "guild_id"))
 
-        self._interaction: InteractionReference | None = (
-            InteractionReference(state=state, guild=self.guild, data=interaction)
-            if (interaction := data.get("interaction"))
-            else None
-        )
-        self.interaction_metadata: InteractionMetadata | None = (
-            InteractionMetadata(state=state, data=interaction)
-            if (interaction := data.get("interaction_metadata")) is not None
-            else None
-        )
+        payloads: dict[str, Any] = {
+            name: value for name, key in self._LAZY_KEYS if (value := data.get(key))
+        }
+        if "message_reference" in data:
+            payloads["reference"] = (
+                data["message_reference"],
+                data.get("referenced_message", MISSING),
+            )
+        if snapshots := data.get("message_snapshots"):
+            payloads["message_snapshots"] = (data.get("message_reference", {}), snapshots)
+
+        # in lazy mode, the sub-objects are only created once accessed, see `_LazyAttribute`
+        self._lazy: dict[str, Any] | None = payloads
+        if not getattr(state, "_lazy_messages", False):
+            for name in self._LAZY_ATTRIBUTES:
+                getattr(self, name)
+            self._lazy = None
 
         if (
             (thread_data := data.get("thread"))
@@ -1269,39 +1347,6 @@ class Message(Hashable):
             "role_subscription_data"
         )
 
-        self.reference: MessageReference | None = None
-        if "message_reference" in data:
-            self.reference = ref = MessageReference.with_state(state, data["message_reference"])
-
-            if "referenced_message" in data:
-                resolved = data["referenced_message"]
-                if resolved is None:
-                    ref.resolved = DeletedReferencedMessage(ref)
-                else:
-                    # Right now the channel IDs match but maybe in the future they won't.
-                    if ref.channel_id == channel.id:
-                        chan = channel
-                    else:
-                        chan, _ = state._get_guild_channel(resolved)
-
-                    # the channel will be the correct type here
-                    ref.resolved = self.__class__(
-                        channel=chan,  # pyright: ignore[reportArgumentType]
-                        data=resolved,
-                        state=state,
-                    )
-
-        _ref = data.get("message_reference", {})
-        self.message_snapshots: list[ForwardedMessage] = [
-            ForwardedMessage(
-                state=self._state,
-                channel_id=utils._get_as_snowflake(_ref, "channel_id"),
-                guild_id=utils._get_as_snowflake(_ref, "guild_id"),
-                data=a["message"],
-            )
-            for a in data.get("message_snapshots", [])
-        ]
-
         for handler in ("author", "member", "mentions", "mention_roles"):
             if handler in data:
                 getattr(self, f"_handle_{handler}")(data[handler])  # pyright: ignore[reportTypedDictNotRequiredAccess]
@@ -1311,6 +1356,97 @@ class Message(Hashable):
         content = (self.content[:22] + "...") if len(self.content) > 25 else self.content
         return f"<{name} id={self.id} content={content!r} channel={self.channel!r} type={self.type!r} author={self.author!r} flags={self.flags!r}>"
 
+    def __copy__(self) -> Self:
+        # unlike the default implementation, this doesn't share `_lazy` with the copy,
+        # since payloads are removed from it once decoded
+        cls = self.__class__
+        new = cls.__new__(cls)
+        for base in cls.__mro__:
+            for slot in getattr(base, "__slots__", ()):
+                try:
+                    setattr(new, slot, getattr(self, slot))
+                except AttributeError:
+                    pass
+        if self._lazy:
+            new._lazy = self._lazy.copy()
+        return new
+
+    def _decode_reactions(self, value: list[ReactionPayload] | None) -> list[Reaction]:
+        return [Reaction(message=self, data=d) for d in value or ()]
+
+    def _decode_attachments(self, value: list[AttachmentPayload] | None) -> list[Attachment]:
+        return [Attachment(data=a, state=self._state) for a in value or ()]
+
+    def _decode_embeds(self, value: list[EmbedPayload] | None) -> list[Embed]:
+        return [Embed.from_dict(a) for a in value or ()]
+
+    def _decode_stickers(self, value: list[StickerItemPayload] | None) -> list[StickerItem]:
+        return [StickerItem(data=d, state=self._state) for d in value or ()]
+
+    def _decode_components(
+        self, value: list[MessageTopLevelComponentPayload] | None
+    ) -> list[MessageTopLevelComponent]:
+        return [_message_component_factory(d) for d in value or ()]
+
+    def _decode_poll(self, value: PollPayload | None) -> Poll | None:
+        return Poll.from_dict(message=self, data=value) if value else None
+
+    def _decode_interaction(
+        self, value: InteractionMessageReferencePayload | None
+    ) -> InteractionReference | None:
+        return (
+            InteractionReference(state=self._state, guild=self.guild, data=value) if value else None
+        )
+
+    def _decode_interaction_metadata(
+        self, value: InteractionMetadataPayload | None
+    ) -> InteractionMetadata | None:
+        return InteractionMetadata(state=self._state, data=value) if value else None
+
+    def _decode_reference(
+        self, value: tuple[MessageReferencePayload, MessagePayload | None] | None
+    ) -> MessageReference | None:
+        if value is None:
+            return None
+        state = self._state
+        ref_data, resolved = value
+        ref = MessageReference.with_state(state, ref_data)
+
+        if resolved is MISSING:
+            pass
+        elif resolved is None:
+            ref.resolved = DeletedReferencedMessage(ref)
+        else:
+            # Right now the channel IDs match but maybe in the future they won't.
+            if ref.channel_id == self.channel.id:
+                chan = self.channel
+            else:
+                chan, _ = state._get_guild_channel(resolved)
+
+            # the channel will be the correct type here
+            ref.resolved = self.__class__(
+                channel=chan,  # pyright: ignore[reportArgumentType]
+                data=resolved,
+                state=state,
+            )
+        return ref
+
+    def _decode_message_snapshots(
+        self, value: tuple[MessageReferencePayload, list[MessageSnapshotPayload]] | None
+    ) -> list[ForwardedMessage]:
+        if value is None:
+            return []
+        ref_data, snapshots = value
+        return [
+            ForwardedMessage(
+                state=self._state,
+                channel_id=utils._get_as_snowflake(ref_data, "channel_id"),
+                guild_id=utils._get_as_snowflake(ref_data, "guild_id"),
+                data=a["message"],
+            )
+            for a in snapshots
+        ]
+
     def _try_patch(self, data, key, transform=None) -> None:
         try:
             value = data[key]
@@ -1491,8 +1627,16 @@ class Message(Hashable):
         # updated later in _update_member_references, after re-chunking
         if isinstance(self.author, Member):
             self.author.guild = new_guild
-        if self._interaction and isinstance(self._interaction.user, Member):
-            self._interaction.user.guild = new_guild
+        interaction = self._decoded_interaction
+        if interaction and isinstance(interaction.user, Member):
+            interaction.user.guild = new_guild
+
+    @property
+    def _decoded_interaction(self) -> InteractionReference | None:
+        # avoids decoding lazy interactions, which will use the current guild/members once accessed
+        if self._lazy and "_interaction" in self._lazy:
+            return None
+        return self._interaction
 
     @utils.cached_slot_property("_cs_raw_mentions")
     def raw_mentions(self) -> list[int]:
@@ -0,0 +1,446 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Literal
+
+from . import utils
+
+__all__ = (
+    "HandlerProfiler",
+    "HandlerStats",
+    "LoopLagMonitor",
+    "LoopLagSample",
+)
+
+_log = logging.getLogger(__name__)
+
+
+def _format_task_stack(task: asyncio.Task) -> str:
+    # unlike `Task.get_stack`, this follows the chain of awaited coroutines,
+    # since the interesting part is usually the innermost frame
+    frames = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return "".join(traceback.format_list(traceback.StackSummary.extract(frames)))
+
+
+class HandlerStats:
+    """Represents the timing statistics of an event listener or command,
+    see :class:`HandlerProfiler`.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    event: :class:`str`
+        The event the handler was called for, e.g. ``on_message`` for listeners,
+        or ``command``, ``slash_command``, ``user_command`` or ``message_command`` for commands.
+    name: :class:`str`
+        The qualified name of the listener function or command.
+    count: :class:`int`
+        The number of completed calls.
+    total: :class:`float`
+        The combined duration of all calls, in seconds.
+    max: :class:`float`
+        The duration of the slowest call, in seconds.
+    """
+
+    __slots__ = ("_histogram", "event", "max", "name")
+
+    def __init__(self, event: str, name: str) -> None:
+        self.event: str = event
+        self.name: str = name
+        self.max: float = 0.0
+        self._histogram: utils.Histogram = utils.Histogram()
+
+    def __repr__(self) -> str:
+        return (
+            f"<HandlerStats event={self.event!r} name={self.name!r} count={self.count} "
+            f"mean={self.mean:.4f} max={self.max:.4f}>"
+        )
+
+    @property
+    def count(self) -> int:
+        return self._histogram.count
+
+    @property
+    def total(self) -> float:
+        return self._histogram.sum
+
+    @property
+    def mean(self) -> float:
+        """:class:`float`: The average duration of a call, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def _observe(self, duration: float) -> None:
+        self._histogram.observe(duration)
+        if duration > self.max:
+            self.max = duration
+
+
+class HandlerProfiler:
+    """Measures the durations of the event listeners and commands of a client.
+
+    Pass an instance of this class to :class:`Client` using the ``handler_profiler``
+    parameter, or set :attr:`Client.handler_profiler`, to measure every call of
+    an event listener (including ``on_*`` methods and listeners of cogs),
+    prefix command, and application command. Nothing is measured otherwise.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    threshold: :class:`float` | :data:`None`
+        The duration in seconds after which a handler is considered slow.
+        If a handler is still running after this duration, a warning is logged along
+        with the current stack of the handler's task. Slow handlers that finish before
+        this check could run, e.g. because they blocked the event loop, are logged once
+        they finish. Defaults to :data:`None`, i.e. nothing is logged.
+    """
+
+    __slots__ = ("_handlers", "threshold")
+
+    def __init__(self, *, threshold: float | None = None) -> None:
+        if threshold is not None and threshold <= 0:
+            msg = "threshold must be greater than 0."
+            raise ValueError(msg)
+        self.threshold: float | None = threshold
+        # (event, name) -> stats
+        self._handlers: dict[tuple[str, str], HandlerStats] = {}
+
+    def __repr__(self) -> str:
+        return f"<HandlerProfiler threshold={self.threshold} handlers={len(self._handlers)}>"
+
+    @property
+    def handlers(self) -> list[HandlerStats]:
+        r""":class:`list`\[:class:`HandlerStats`]: The statistics of all measured handlers."""
+        return list(self._handlers.values())
+
+    def slowest(
+        self, n: int = 10, *, key: Literal["mean", "max", "total"] = "mean"
+    ) -> list[HandlerStats]:
+        r"""Returns the slowest handlers.
+
+        Parameters
+        ----------
+        n: :class:`int`
+            The number of handlers to return. Defaults to ``10``.
+        key: :class:`str`
+            The statistic to sort by; one of ``mean`` (the default), ``max`` or ``total``.
+
+        Returns
+        -------
+        :class:`list`\[:class:`HandlerStats`]
+            Up to ``n`` handlers, from slowest to fastest.
+        """
+        if key not in ("mean", "max", "total"):
+            msg = f"key must be one of 'mean', 'max' or 'total', not {key!r}."
+            raise ValueError(msg)
+        return sorted(self._handlers.values(), key=lambda stats: getattr(stats, key), reverse=True)[
+            :n
+        ]
+
+    def reset(self) -> None:
+        """Removes all statistics."""
+        self._handlers.clear()
+
+    def _log_running(self, event: str, name: str, task: asyncio.Task, start: float) -> None:
+        _log.warning(
+            "Handler %s for %s is still running after %.3f seconds, stack (most recent call last):\n%s",
+            name,
+            event,
+            time.perf_counter() - start,
+            _format_task_stack(task).rstrip(),
+        )
+
+    @contextmanager
+    def _measure(self, event: str, name: str) -> Iterator[None]:
+        threshold = self.threshold
+        handle: asyncio.TimerHandle | None = None
+        logged = False
+        start = time.perf_counter()
+
+        if threshold is not None and (task := asyncio.current_task()) is not None:
+
+            def on_threshold() -> None:
+                nonlocal logged
+                logged = True
+                self._log_running(event, name, task, start)
+
+            handle = asyncio.get_running_loop().call_later(threshold, on_threshold)
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if handle is not None:
+                handle.cancel()
+
+            key = (event, name)
+            if (stats := self._handlers.get(key)) is None:
+                stats = self._handlers[key] = HandlerStats(event, name)
+            stats._observe(duration)
+
+            if threshold is not None and duration > threshold and not logged:
+                _log.warning(
+                    "Handler %s for %s took %.3f seconds.",
+                    name,
+                    event,
+                    duration,
+                )
+
+
+class LoopLagSample:
+    """Represents a single measurement of :class:`LoopLagMonitor`.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    timestamp: :class:`datetime.datetime`
+        When the measurement was taken, in UTC.
+    lag: :class:`float`
+        How much later than scheduled the monitor was woken up, in seconds.
+    event: :class:`str` | :data:`None`
+        The gateway event (e.g. ``GUILD_CREATE``) whose processing accounts for
+        most of the lag, if any.
+    """
+
+    __slots__ = ("event", "lag", "timestamp")
+
+    def __init__(self, timestamp: datetime.datetime, lag: float, event: str | None) -> None:
+        self.timestamp: datetime.datetime = timestamp
+        self.lag: float = lag
+        self.event: str | None = event
+
+    def __repr__(self) -> str:
+        return (
+            f"<LoopLagSample timestamp={self.timestamp!r} lag={self.lag:.4f} event={self.event!r}>"
+        )
+
+
+class LoopLagMonitor:
+    """Periodically measures how long the event loop of a client is blocked.
+
+    Pass an instance of this class to :class:`Client` using the ``loop_lag_monitor``
+    parameter. The monitor runs while the client is connected; every ``interval`` seconds,
+    it records how much later than scheduled it was woken up, and which gateway event
+    was being processed in the meantime, if any.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    interval: :class:`float`
+        The time in seconds between measurements. Defaults to ``0.5``.
+    history: :class:`int`
+        The number of measurements to keep. Defaults to ``600``, i.e. five minutes
+        with the default interval.
+    threshold: :class:`float` | :data:`None`
+        The lag in seconds above which a warning is logged.
+        Defaults to :data:`None`, i.e. nothing is logged.
+    dump_stack: :class:`bool`
+        Whether to log the stack of the event loop's thread while it is blocked for
+        longer than ``threshold``, using a separate thread that checks the loop
+        several times per interval. Requires ``threshold``. Defaults to ``False``.
+    """
+
+    __slots__ = (
+        "_dumped",
+        "_event",
+        "_event_started_at",
+        "_expected",
+        "_samples",
+        "_slowest_duration",
+        "_slowest_event",
+        "_task",
+        "dump_stack",
+        "interval",
+        "threshold",
+    )
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.5,
+        history: int = 600,
+        threshold: float | None = None,
+        dump_stack: bool = False,
+    ) -> None:
+        if interval <= 0:
+            msg = "interval must be greater than 0."
+            raise ValueError(msg)
+        if history < 1:
+            msg = "history must be at least 1."
+            raise ValueError(msg)
+        if threshold is not None and threshold <= 0:
+            msg = "threshold must be greater than 0."
+            raise ValueError(msg)
+        if dump_stack and threshold is None:
+            msg = "dump_stack requires a threshold."
+            raise ValueError(msg)
+
+        self.interval: float = interval
+        self.threshold: float | None = threshold
+        self.dump_stack: bool = dump_stack
+        self._samples: deque[LoopLagSample] = deque(maxlen=history)
+        self._task: asyncio.Task[None] | None = None
+
+        # the perf_counter value at which the monitor should be woken up next
+        self._expected: float = 0.0
+        # whether the stack was dumped since the last measurement
+        self._dumped: bool = False
+        # the gateway event currently being processed
+        self._event: str | None = None
+        self._event_started_at: float = 0.0
+        # the gateway event that took the longest to process since the last measurement
+        self._slowest_event: str | None = None
+        self._slowest_duration: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<LoopLagMonitor interval={self.interval} threshold={self.threshold} "
+            f"samples={len(self._samples)} running={self.running}>"
+        )
+
+    @property
+    def running(self) -> bool:
+        """:class:`bool`: Whether the monitor is currently running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def samples(self) -> list[LoopLagSample]:
+        r""":class:`list`\[:class:`LoopLagSample`]: The recorded measurements,
+        from oldest to newest.
+        """
+        return list(self._samples)
+
+    def percentile(self, percentile: float) -> float:
+        """Returns a percentile of the recorded lag, using linear interpolation.
+
+        Parameters
+        ----------
+        percentile: :class:`float`
+            The percentile to compute, between ``0`` and ``100``; e.g. ``50`` for the median.
+
+        Raises
+        ------
+        ValueError
+            The percentile is out of range.
+
+        Returns
+        -------
+        :class:`float`
+            The lag in seconds, or ``0.0`` if nothing was measured yet.
+        """
+        if not 0 <= percentile <= 100:
+            msg = "percentile must be between 0 and 100."
+            raise ValueError(msg)
+        if not self._samples:
+            return 0.0
+
+        lags = sorted(sample.lag for sample in self._samples)
+        rank = (len(lags) - 1) * percentile / 100
+        lower = math.floor(rank)
+        upper = min(lower + 1, len(lags) - 1)
+        return lags[lower] + (lags[upper] - lags[lower]) * (rank - lower)
+
+    def reset(self) -> None:
+        """Removes all recorded measurements."""
+        self._samples.clear()
+
+    def _start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def _close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _event_started(self, event: str) -> None:
+        self._event = event
+        self._event_started_at = time.perf_counter()
+
+    def _event_finished(self) -> None:
+        duration = time.perf_counter() - self._event_started_at
+        if duration > self._slowest_duration:
+            self._slowest_event = self._event
+            self._slowest_duration = duration
+        self._event = None
+
+    def _record(self, lag: float) -> LoopLagSample:
+        # only attribute the lag to an event if processing it took at least half of the lag
+        event = self._slowest_event if lag > 0 and self._slowest_duration >= lag / 2 else None
+        self._slowest_event = None
+        self._slowest_duration = 0.0
+
+        sample = LoopLagSample(utils.utcnow(), lag, event)
+        self._samples.append(sample)
+
+        if self.threshold is not None and lag > self.threshold and not self._dumped:
+            _log.warning("Event loop was blocked for %.3f seconds (gateway event: %s).", lag, event)
+        self._dumped = False
+        return sample
+
+    async def _run(self) -> None:
+        stop: threading.Event | None = None
+        if self.dump_stack:
+            stop = threading.Event()
+            threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(), stop),
+                name="disnake loop lag monitor",
+                daemon=True,
+            ).start()
+
+        try:
+            while True:
+                self._expected = time.perf_counter() + self.interval
+                await asyncio.sleep(self.interval)
+                self._record(max(time.perf_counter() - self._expected, 0.0))
+        finally:
+            if stop is not None:
+                stop.set()
+
+    def _watch(self, thread_id: int, stop: threading.Event) -> None:
+        # runs in a separate thread, as the event loop can't observe itself while blocked
+        threshold: float = self.threshold  # pyright: ignore[reportAssignmentType]
+        check_interval = min(self.interval, threshold) / 4
+        dumped_for = 0.0
+
+        while not stop.wait(check_interval):
+            expected = self._expected
+            lag = time.perf_counter() - expected
+            if lag <= threshold or dumped_for == expected:
+                continue
+            if (frame := sys._current_frames().get(thread_id)) is None:
+                continue
+
+            dumped_for = expected
+            self._dumped = True
+            _log.warning(
+                "Event loop has been blocked for %.3f seconds (gateway event: %s), "
+                "stack (most recent call last):\n%s",
+                lag,
+                self._event,
+                "".join(traceback.format_stack(frame)).rstrip(),
+            )
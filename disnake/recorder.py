@@ -0,0 +1,466 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import logging
+import os
+import struct
+import time
+import tracemalloc
+import zlib
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
+
+from . import utils
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .client import Client
+
+__all__ = (
+    "GatewayRecorder",
+    "GatewayReplay",
+    "RecordedFrame",
+    "ReplayStats",
+)
+
+_log = logging.getLogger(__name__)
+
+_MAGIC = b"DSNKREC"
+_VERSION = 1
+# timestamp, frame kind, shard id (-1 if unsharded), payload length
+_HEADER = struct.Struct("<dBhI")
+
+_KIND_CONNECT = 0
+_KIND_TEXT = 1
+_KIND_BINARY = 2
+
+_ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+
+
+class RecordedFrame(NamedTuple):
+    """Represents a single frame read from a gateway recording.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    timestamp: :class:`float`
+        The UNIX timestamp at which the frame was received.
+    kind: :class:`int`
+        The frame type; ``0`` marks a new connection, ``1`` a text frame and
+        ``2`` a (transport-compressed) binary frame.
+    shard_id: :class:`int` | :data:`None`
+        The shard ID of the websocket that received the frame.
+    data: :class:`bytes`
+        The raw frame data, exactly as it was received from the gateway.
+    """
+
+    timestamp: float
+    kind: int
+    shard_id: int | None
+    data: bytes
+
+
+def _open_for_reading(fp: BinaryIO) -> BinaryIO:
+    # transparently handle gzip-compressed recordings
+    if isinstance(fp, io.BufferedReader):
+        head = fp.peek(2)[:2]
+    else:
+        position = fp.tell()
+        head = fp.read(2)
+        fp.seek(position)
+
+    if head == b"\x1f\x8b":
+        return gzip.GzipFile(fileobj=fp, mode="rb")  # pyright: ignore[reportReturnType]
+    return fp
+
+
+class GatewayRecorder:
+    """Records raw gateway frames received by the client to a file.
+
+    Pass an instance of this class to :class:`Client` using the ``gateway_recorder``
+    parameter to record every frame received from the gateway, together with the time
+    it was received. The resulting file can be replayed without a network connection
+    using :class:`GatewayReplay`, e.g. for profiling or benchmarking.
+
+    .. versionadded:: 2.13
+
+    .. warning::
+        Recordings contain all data sent to the bot, including message contents
+        and user information. Treat them with the same care as the bot token.
+
+    Parameters
+    ----------
+    fp: :class:`str` | :class:`os.PathLike` | :class:`io.BufferedIOBase`
+        The file to write to. If a path is given, the file is created or truncated.
+    compress: :class:`bool`
+        Whether to gzip-compress the recording. Defaults to ``False``.
+        :class:`GatewayReplay` detects compressed files automatically.
+    """
+
+    def __init__(self, fp: str | os.PathLike[str] | BinaryIO, *, compress: bool = False) -> None:
+        self._owns_file: bool = isinstance(fp, (str, os.PathLike))
+        raw: BinaryIO = open(fp, "wb") if isinstance(fp, (str, os.PathLike)) else fp  # noqa: SIM115
+        self._raw: BinaryIO = raw
+        self._fp: BinaryIO = (
+            gzip.GzipFile(fileobj=raw, mode="wb")  # pyright: ignore[reportAttributeAccessIssue]
+            if compress
+            else raw
+        )
+        self._fp.write(_MAGIC + bytes((_VERSION,)))
+        self.frames: int = 0
+        self.closed: bool = False
+
+    def __repr__(self) -> str:
+        return f"<GatewayRecorder frames={self.frames} closed={self.closed}>"
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _write(self, kind: int, shard_id: int | None, data: bytes) -> None:
+        if self.closed:
+            return
+        self._fp.write(
+            _HEADER.pack(time.time(), kind, -1 if shard_id is None else shard_id, len(data))
+        )
+        self._fp.write(data)
+        self.frames += 1
+
+    def record_connect(self, *, shard_id: int | None = None) -> None:
+        """Marks the start of a new gateway connection.
+
+        This resets the transport compression context when replaying,
+        and is called automatically for each new websocket.
+
+        Parameters
+        ----------
+        shard_id: :class:`int` | :data:`None`
+            The shard ID of the new connection.
+        """
+        self._write(_KIND_CONNECT, shard_id, b"")
+
+    def record(self, data: str | bytes, /, *, shard_id: int | None = None) -> None:
+        """Records a single frame.
+
+        Parameters
+        ----------
+        data: :class:`str` | :class:`bytes`
+            The frame as received from the websocket.
+        shard_id: :class:`int` | :data:`None`
+            The shard ID of the websocket that received the frame.
+        """
+        if isinstance(data, str):
+            self._write(_KIND_TEXT, shard_id, data.encode("utf-8"))
+        else:
+            self._write(_KIND_BINARY, shard_id, data)
+
+    def flush(self) -> None:
+        """Flushes buffered frames to the underlying file."""
+        if not self.closed:
+            self._fp.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the recording.
+
+        If a file object was passed to the constructor, it is not closed.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self._fp is not self._raw:
+            self._fp.close()
+        if self._owns_file:
+            self._raw.close()
+        else:
+            self._raw.flush()
+
+
+class ReplayStats:
+    r"""Statistics collected by :meth:`GatewayReplay.run`.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    frames: :class:`int`
+        The number of frames that were replayed.
+    events: :class:`int`
+        The number of dispatch events that were parsed.
+    duration: :class:`float`
+        The wall-clock duration of the replay, in seconds.
+    parse_time: :class:`float`
+        The total time spent decoding and parsing frames, in seconds.
+        Unlike :attr:`duration`, this excludes any time spent sleeping
+        when replaying in real time.
+    event_counts: :class:`dict`\[:class:`str`, :class:`int`]
+        The number of parsed events per event type.
+    event_times: :class:`dict`\[:class:`str`, :class:`float`]
+        The total time spent parsing each event type, in seconds.
+    event_memory: :class:`dict`\[:class:`str`, :class:`int`]
+        The net number of bytes allocated while parsing each event type.
+        Only populated if ``trace_memory`` was enabled.
+    """
+
+    __slots__ = (
+        "frames",
+        "events",
+        "duration",
+        "parse_time",
+        "event_counts",
+        "event_times",
+        "event_memory",
+    )
+
+    def __init__(self) -> None:
+        self.frames: int = 0
+        self.events: int = 0
+        self.duration: float = 0.0
+        self.parse_time: float = 0.0
+        self.event_counts: dict[str, int] = {}
+        self.event_times: dict[str, float] = {}
+        self.event_memory: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReplayStats frames={self.frames} events={self.events} "
+            f"duration={self.duration:.3f} events_per_second={self.events_per_second:.1f}>"
+        )
+
+    @property
+    def events_per_second(self) -> float:
+        """:class:`float`: The parse throughput, in events per second of :attr:`parse_time`."""
+        if not self.parse_time:
+            return 0.0
+        return self.events / self.parse_time
+
+    def memory_per_event(self) -> dict[str, float]:
+        r"""Returns the average net number of bytes allocated per event, by event type.
+
+        :return type: :class:`dict`\[:class:`str`, :class:`float`]
+        """
+        return {
+            event: size / self.event_counts[event]
+            for event, size in self.event_memory.items()
+            if self.event_counts.get(event)
+        }
+
+    def _add(self, event: str, elapsed: float, memory: int | None) -> None:
+        self.events += 1
+        self.event_counts[event] = self.event_counts.get(event, 0) + 1
+        self.event_times[event] = self.event_times.get(event, 0.0) + elapsed
+        if memory is not None:
+            self.event_memory[event] = self.event_memory.get(event, 0) + memory
+
+
+class _ReplayWebSocket:
+    # stands in for the gateway connection during a replay, discarding all commands
+
+    shard_id: int | None = None
+    latency: float = float("nan")
+
+    async def request_chunks(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def voice_state(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def change_presence(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def is_ratelimited(self) -> bool:
+        return False
+
+
+class GatewayReplay:
+    """Replays a gateway recording created by :class:`GatewayRecorder`.
+
+    Frames are decoded and fed through the client's parsers just like they would
+    be when connected, without any network connection. Outgoing gateway commands
+    (e.g. member chunk requests) are discarded, which means member chunks contained
+    in the recording are parsed but not added to the cache.
+
+    .. versionadded:: 2.13
+
+    Parameters
+    ----------
+    fp: :class:`str` | :class:`os.PathLike` | :class:`io.BufferedIOBase`
+        The recording to read. Compressed recordings are detected automatically.
+    """
+
+    def __init__(self, fp: str | os.PathLike[str] | BinaryIO) -> None:
+        self._fp: str | os.PathLike[str] | BinaryIO = fp
+
+    def frames(self) -> Iterator[RecordedFrame]:
+        """Iterates over all frames in the recording.
+
+        Raises
+        ------
+        ValueError
+            The file is not a gateway recording, or was created by an unsupported version.
+
+        Yields
+        ------
+        :class:`RecordedFrame`
+            The recorded frames, in the order they were received.
+        """
+        raw = open(self._fp, "rb") if isinstance(self._fp, (str, os.PathLike)) else self._fp  # noqa: SIM115
+        fp = _open_for_reading(raw)
+        try:
+            magic = fp.read(len(_MAGIC) + 1)
+            if magic[: len(_MAGIC)] != _MAGIC:
+                msg = "File is not a gateway recording."
+                raise ValueError(msg)
+            if magic[-1] != _VERSION:
+                msg = f"Unsupported gateway recording version {magic[-1]}."
+                raise ValueError(msg)
+
+            while header := fp.read(_HEADER.size):
+                if len(header) < _HEADER.size:
+                    _log.warning("Gateway recording ends with a truncated frame, ignoring it.")
+                    return
+                timestamp, kind, shard_id, length = _HEADER.unpack(header)
+                data = fp.read(length)
+                if len(data) < length:
+                    _log.warning("Gateway recording ends with a truncated frame, ignoring it.")
+                    return
+                yield RecordedFrame(timestamp, kind, None if shard_id == -1 else shard_id, data)
+        finally:
+            if fp is not raw:
+                fp.close()
+            if raw is not self._fp:
+                raw.close()
+
+    async def run(
+        self,
+        client: Client,
+        *,
+        speed: float | None = None,
+        trace_memory: bool = False,
+    ) -> ReplayStats:
+        """|coro|
+
+        Feeds all recorded frames into the given client's state.
+
+        The client should be a fresh instance that is not connected to the gateway,
+        configured with the same intents and cache flags as the recording client
+        to get comparable results.
+
+        Parameters
+        ----------
+        client: :class:`Client`
+            The client to feed the frames into. Its cache will be populated as if it
+            were connected, and events are dispatched as usual.
+        speed: :class:`float` | :data:`None`
+            The replay speed relative to real time, e.g. ``1.0`` to replay at the
+            original pace or ``2.0`` to replay twice as fast.
+            Defaults to :data:`None`, which replays as fast as possible.
+        trace_memory: :class:`bool`
+            Whether to measure the memory allocated per event type using :mod:`tracemalloc`.
+            This significantly slows down the replay. Defaults to ``False``.
+
+        Raises
+        ------
+        ValueError
+            The file is not a valid gateway recording, or ``speed`` is not positive.
+
+        Returns
+        -------
+        :class:`ReplayStats`
+            The statistics collected during the replay.
+        """
+        if speed is not None and speed <= 0:
+            msg = "speed must be greater than 0."
+            raise ValueError(msg)
+
+        state = client._connection
+        parsers = state.parsers
+        stats = ReplayStats()
+
+        replay_ws = _ReplayWebSocket()
+        original_get_websocket = state._get_websocket
+        state._get_websocket = lambda *args, **kwargs: replay_ws  # pyright: ignore[reportAttributeAccessIssue]
+
+        started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        decompressors: dict[int | None, zlib._Decompress] = {}
+        buffers: dict[int | None, bytearray] = {}
+
+        start = time.perf_counter()
+        first_timestamp: float | None = None
+        try:
+            for frame in self.frames():
+                stats.frames += 1
+                if speed is not None:
+                    if first_timestamp is None:
+                        first_timestamp = frame.timestamp
+                    target = (frame.timestamp - first_timestamp) / speed
+                    delay = target - (time.perf_counter() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if frame.kind == _KIND_CONNECT:
+                    decompressors[frame.shard_id] = zlib.decompressobj()
+                    buffers[frame.shard_id] = bytearray()
+                    continue
+
+                parse_start = time.perf_counter()
+                if frame.kind == _KIND_BINARY:
+                    buffer = buffers.setdefault(frame.shard_id, bytearray())
+                    buffer.extend(frame.data)
+                    if len(frame.data) < 4 or frame.data[-4:] != _ZLIB_SUFFIX:
+                        continue
+                    decompressor = decompressors.setdefault(frame.shard_id, zlib.decompressobj())
+                    raw = decompressor.decompress(buffer).decode("utf-8")
+                    buffers[frame.shard_id] = bytearray()
+                else:
+                    raw = frame.data.decode("utf-8")
+
+                msg = utils._from_json(raw)
+                event = msg.get("t")
+                if msg.get("op") != 0 or event is None:
+                    stats.parse_time += time.perf_counter() - parse_start
+                    continue
+
+                data = msg.get("d")
+                if event in ("READY", "RESUMED"):
+                    data["__shard_id__"] = frame.shard_id
+
+                memory_before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+                try:
+                    func = parsers[event]
+                except KeyError:
+                    _log.debug("Unknown event %s in gateway recording.", event)
+                else:
+                    try:
+                        func(data)
+                    except Exception:
+                        _log.exception("Failed to parse %s event from gateway recording.", event)
+
+                elapsed = time.perf_counter() - parse_start
+                stats.parse_time += elapsed
+                stats._add(
+                    event,
+                    elapsed,
+                    tracemalloc.get_traced_memory()[0] - memory_before if trace_memory else None,
+                )
+
+                # give dispatched events and background tasks a chance to run
+                await asyncio.sleep(0)
+        finally:
+            stats.duration = time.perf_counter() - start
+            state._get_websocket = original_get_websocket
+            if started_tracing:
+                tracemalloc.stop()
+
+        return stats
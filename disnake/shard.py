@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Callable
+import os
+import time
+from collections.abc import Callable, Coroutine
 from errno import ECONNRESET
 from typing import (
     TYPE_CHECKING,
     Any,
+    ClassVar,
     Literal,
     NoReturn,
     overload,
@@ -34,13 +37,19 @@ if TYPE_CHECKING:
     from typing_extensions import Self
 
     from .activity import BaseActivity
+    from .cache import CacheBackends
     from .flags import Intents, MemberCacheFlags
+    from .gateway import ResumeState
+    from .guild import Guild
     from .i18n import LocalizationProtocol
     from .mentions import AllowedMentions
+    from .profiler import HandlerProfiler, LoopLagMonitor
+    from .recorder import GatewayRecorder
 
 __all__ = (
     "AutoShardedClient",
     "ShardInfo",
+    "ReconnectStats",
 )
 
 _log = logging.getLogger(__name__)
@@ -48,7 +57,6 @@ _log = logging.getLogger(__name__)
 
 class EventType:
     close = 0
-    reconnect = 1
     resume = 2
     identify = 3
     terminate = 4
@@ -77,6 +85,133 @@ class EventItem:
         return hash(self.type)
 
 
+class ReconnectStats:
+    """Statistics about shard reconnects of an :class:`AutoShardedClient`.
+
+    These can be used to monitor the bot for reconnect storms, e.g. during
+    Discord outages, where many shards disconnect at the same time.
+
+    .. versionadded:: 2.13
+
+    Attributes
+    ----------
+    disconnects: :class:`int`
+        The total number of unexpected shard disconnects.
+    resumes: :class:`int`
+        The total number of attempts to resume a shard's session.
+    identifies: :class:`int`
+        The total number of attempts to start a new session for a shard after
+        it disconnected, including after a failed resume.
+    reconnecting: :class:`int`
+        The number of shards that unexpectedly disconnected and haven't reconnected yet.
+    peak_reconnecting: :class:`int`
+        The highest number of shards that were reconnecting at the same time.
+    backoff_delay: :class:`float`
+        The most recent delay before reconnecting, in seconds, shared by all shards.
+    identify_delay: :class:`float`
+        The total time shards spent waiting for their turn to ``IDENTIFY``, in seconds.
+    """
+
+    __slots__ = (
+        "disconnects",
+        "resumes",
+        "identifies",
+        "reconnecting",
+        "peak_reconnecting",
+        "backoff_delay",
+        "identify_delay",
+    )
+
+    def __init__(self) -> None:
+        self.disconnects: int = 0
+        self.resumes: int = 0
+        self.identifies: int = 0
+        self.reconnecting: int = 0
+        self.peak_reconnecting: int = 0
+        self.backoff_delay: float = 0.0
+        self.identify_delay: float = 0.0
+
+    def __repr__(self) -> str:
+        attrs = " ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"<ReconnectStats {attrs}>"
+
+
+class ReconnectCoordinator:
+    """Coordinates reconnects of all shards of an :class:`AutoShardedClient`,
+    to avoid overwhelming the gateway when many shards disconnect at once.
+
+    - ``IDENTIFY`` requests are paced per ``max_concurrency`` bucket,
+      allowing one request per bucket every 5 seconds.
+    - The reconnect backoff is shared between shards; shards disconnecting during
+      an ongoing backoff wait for the same time instead of backing off individually.
+    """
+
+    # minimum time between IDENTIFY requests in the same bucket
+    IDENTIFY_INTERVAL: ClassVar[float] = 5.0
+
+    def __init__(self, *, max_concurrency: int = 1) -> None:
+        self.max_concurrency: int = max_concurrency
+        self.stats: ReconnectStats = ReconnectStats()
+        self._backoff: ExponentialBackoff[Literal[False]] = ExponentialBackoff()
+        self._backoff_until: float = 0.0
+        self._reconnecting: set[int] = set()
+        self._storm: bool = False
+        self._bucket_locks: dict[int, asyncio.Lock] = {}
+        self._bucket_last_identify: dict[int, float] = {}
+
+    def disconnected(self, shard_id: int) -> None:
+        # failed reconnect attempts of an already disconnected shard aren't counted again
+        if shard_id in self._reconnecting:
+            return
+        self.stats.disconnects += 1
+        self._reconnecting.add(shard_id)
+
+        stats = self.stats
+        stats.reconnecting = len(self._reconnecting)
+        if stats.reconnecting > stats.peak_reconnecting:
+            stats.peak_reconnecting = stats.reconnecting
+        if stats.reconnecting > 1 and not self._storm:
+            self._storm = True
+            _log.warning("Multiple shards disconnected, coordinating reconnects.")
+
+    def reconnected(self, shard_id: int) -> None:
+        self._reconnecting.discard(shard_id)
+        self.stats.reconnecting = len(self._reconnecting)
+        if self._storm and not self._reconnecting:
+            self._storm = False
+            _log.info("All shards reconnected.")
+
+    def backoff_delay(self) -> float:
+        now = time.monotonic()
+        if now < self._backoff_until:
+            # join the ongoing backoff instead of increasing it further
+            return self._backoff_until - now
+
+        delay = self._backoff.delay()
+        self._backoff_until = now + delay
+        self.stats.backoff_delay = delay
+        return delay
+
+    async def wait_identify(self, shard_id: int | None, *, initial: bool = False) -> None:
+        bucket = (shard_id or 0) % max(self.max_concurrency, 1)
+        lock = self._bucket_locks.setdefault(bucket, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            last = self._bucket_last_identify.get(bucket)
+            if last is not None and not initial:
+                delay = last + self.IDENTIFY_INTERVAL - loop.time()
+                if delay > 0:
+                    _log.debug(
+                        "Shard ID %s is waiting %.2fs to IDENTIFY (bucket %d).",
+                        shard_id,
+                        delay,
+                        bucket,
+                    )
+                    self.stats.identify_delay += delay
+                    await asyncio.sleep(delay)
+            self._bucket_last_identify[bucket] = loop.time()
+
+
 class Shard:
     def __init__(
         self,
@@ -85,14 +220,16 @@ class Shard:
         queue_put: Callable[[EventItem], None],
     ) -> None:
         self.ws: DiscordWebSocket = ws
-        self._client: Client = client
+        self._client: AutoShardedClient = client
+        self._coordinator: ReconnectCoordinator = client._reconnect_coordinator
         self._dispatch: Callable[..., None] = client.dispatch
         self._queue_put: Callable[[EventItem], None] = queue_put
         self.loop: asyncio.AbstractEventLoop = self._client.loop
         self._disconnect: bool = False
         self._reconnect = client._reconnect
-        self._backoff: ExponentialBackoff[Literal[False]] = ExponentialBackoff()
         self._task: asyncio.Task | None = None
+        # whether the last attempt to resume the session failed while connecting
+        self._resume_failed: bool = False
         self._handled_exceptions: tuple[type[Exception], ...] = (
             OSError,
             HTTPException,
@@ -115,9 +252,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, *, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -126,6 +263,7 @@ class Shard:
     async def _handle_disconnect(self, e: Exception) -> None:
         self._dispatch("disconnect")
         self._dispatch("shard_disconnect", self.id)
+        self._coordinator.disconnected(self.id)
         if not self._reconnect:
             self._queue_put(EventItem(EventType.close, self, e))
             return
@@ -149,16 +287,22 @@ class Shard:
                 self._queue_put(EventItem(EventType.close, self, e))
                 return
 
-        retry = self._backoff.delay()
+        retry = self._coordinator.backoff_delay()
         _log.error("Attempting a reconnect for shard ID %s in %.2fs", self.id, retry, exc_info=e)
         await asyncio.sleep(retry)
-        self._queue_put(EventItem(EventType.reconnect, self, e))
+
+        # try to resume the session, unless that already failed;
+        # if it's not resumable anymore, the gateway will invalidate the session
+        resume = self.ws.session_id is not None and not self._resume_failed
+        exc = ReconnectWebSocket(self.id, resume=resume)
+        self._queue_put(EventItem(EventType.resume if resume else EventType.identify, self, exc))
 
     async def worker(self) -> None:
         while not self._client.is_closed():
             try:
                 await self.ws.poll_event()
             except ReconnectWebSocket as e:
+                # requested by the gateway, not counted as a disconnect
                 etype = EventType.resume if e.resume else EventType.identify
                 self._queue_put(EventItem(etype, self, e))
                 break
@@ -176,6 +320,10 @@ class Shard:
         self._dispatch("disconnect")
         self._dispatch("shard_disconnect", self.id)
         _log.info("Got a request to %s the websocket at Shard ID %s.", exc.op, self.id)
+        if exc.resume:
+            self._coordinator.stats.resumes += 1
+        else:
+            self._coordinator.stats.identifies += 1
         try:
             coro = DiscordWebSocket.from_client(
                 self._client,
@@ -197,12 +345,16 @@ class Shard:
             etype = EventType.resume if e.resume else EventType.identify
             self._queue_put(EventItem(etype, self, e))
         except self._handled_exceptions as e:
+            # fall back to IDENTIFY next time if we failed to connect to the resume gateway
+            self._resume_failed = exc.resume
             await self._handle_disconnect(e)
         except asyncio.CancelledError:
             return
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            self._resume_failed = False
+            self._coordinator.reconnected(self.id)
             self.launch()
 
     async def reconnect(self) -> None:
@@ -225,6 +377,7 @@ class Shard:
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            self._coordinator.reconnected(self.id)
             self.launch()
 
 
@@ -307,6 +460,15 @@ class ShardInfo:
         """
         return self._parent.ws.is_ratelimited()
 
+    @property
+    def gateway_queue_size(self) -> int:
+        """:class:`int`: The number of gateway commands currently waiting to be sent
+        because of the gateway rate limit for this shard.
+
+        .. versionadded:: 2.13
+        """
+        return self._parent.ws.send_queue_size
+
 
 class AutoShardedClient(Client):
     r"""A client similar to :class:`Client` except it handles the complications
@@ -349,6 +511,11 @@ class AutoShardedClient(Client):
         enable_debug_events: bool = False,
         enable_gateway_error_handler: bool = True,
         gateway_params: GatewayParams | None = None,
+        gateway_recorder: GatewayRecorder | None = None,
+        handler_profiler: HandlerProfiler | None = None,
+        loop_lag_monitor: LoopLagMonitor | None = None,
+        session_file: str | os.PathLike[str] | None = None,
+        cache_snapshot: str | os.PathLike[str] | None = None,
         connector: aiohttp.BaseConnector | None = None,
         proxy: str | None = None,
         proxy_auth: aiohttp.BasicAuth | None = None,
@@ -361,8 +528,12 @@ class AutoShardedClient(Client):
         activity: BaseActivity | None = None,
         status: Status | str | None = None,
         intents: Intents | None = None,
+        enforce_minimal_intents: bool = False,
         chunk_guilds_at_startup: bool | None = None,
+        chunk_priority: Callable[[Guild], Any] | None = None,
+        guild_cache_filter: Callable[[int], bool] | None = None,
         member_cache_flags: MemberCacheFlags | None = None,
+        cache_backends: CacheBackends | None = None,
         localization_provider: LocalizationProtocol | None = None,
         strict_localization: bool = False,
     ) -> None: ...
@@ -388,6 +559,8 @@ class AutoShardedClient(Client):
         self._connection._get_websocket = self._get_websocket
         self._connection._get_client = lambda: self
         self.__queue = asyncio.PriorityQueue()
+        self._reconnect_coordinator: ReconnectCoordinator = ReconnectCoordinator()
+        self._reconnect_tasks: set[asyncio.Task[None]] = set()
 
     def _get_websocket(
         self, guild_id: int | None = None, *, shard_id: int | None = None
@@ -449,11 +622,34 @@ class AutoShardedClient(Client):
             for shard_id, parent in self.__shards.items()
         }
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+    async def launch_shard(
+        self,
+        gateway: str,
+        shard_id: int,
+        *,
+        initial: bool = False,
+        resume_state: ResumeState | None = None,
+    ) -> None:
         try:
-            coro = DiscordWebSocket.from_client(
-                self, initial=initial, gateway=gateway, shard_id=shard_id
-            )
+            if resume_state is not None:
+                _log.info(
+                    "Attempting to resume stored session %s for shard ID %s.",
+                    resume_state.session_id,
+                    shard_id,
+                )
+                coro = DiscordWebSocket.from_client(
+                    self,
+                    initial=initial,
+                    gateway=resume_state.resume_gateway,
+                    shard_id=shard_id,
+                    session=resume_state.session_id,
+                    sequence=resume_state.sequence,
+                    resume=True,
+                )
+            else:
+                coro = DiscordWebSocket.from_client(
+                    self, initial=initial, gateway=gateway, shard_id=shard_id
+                )
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception("Failed to connect for shard_id: %s. Retrying...", shard_id)
@@ -472,6 +668,7 @@ class AutoShardedClient(Client):
         )
 
         self.session_start_limit = SessionStartLimit(session_start_limit)
+        self._reconnect_coordinator.max_concurrency = self.session_start_limit.max_concurrency
 
         if self.shard_count is None:
             self.shard_count = shard_count
@@ -484,10 +681,22 @@ class AutoShardedClient(Client):
         if not ignore_session_start_limit and self.session_start_limit.remaining < self.shard_count:
             raise SessionStartLimitReached(self.session_start_limit, requested=self.shard_count)
 
+        resume_states: dict[int, ResumeState] = {}
+        if self._session_file is not None:
+            for shard_id in shard_ids:
+                if resume_state := self._session_file.pop(shard_id):
+                    resume_states[shard_id] = resume_state
+            # register all of these upfront, to avoid dispatching `ready` too early
+            self._connection._pending_resumes.update(resume_states)
+            if self._cache_snapshot is not None:
+                self._cache_snapshot.load(resume_states)
+
         # TODO: maybe take max_concurrency from session start limit into account?
         for shard_id in shard_ids:
             initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            await self.launch_shard(
+                gateway, shard_id, initial=initial, resume_state=resume_states.get(shard_id)
+            )
 
         self._connection.shards_launched.set()
 
@@ -495,6 +704,9 @@ class AutoShardedClient(Client):
         self, *, reconnect: bool = True, ignore_session_start_limit: bool = False
     ) -> None:
         self._reconnect = reconnect
+        self._apply_minimal_intents()
+        if self._loop_lag_monitor is not None:
+            self._loop_lag_monitor._start()
         await self.launch_shards(ignore_session_start_limit=ignore_session_start_limit)
 
         while not self.is_closed():
@@ -508,15 +720,51 @@ class AutoShardedClient(Client):
                         raise item.error
                 return
             elif item.type in (EventType.identify, EventType.resume):
-                await item.shard.reidentify(item.error)
-            elif item.type == EventType.reconnect:
-                await item.shard.reconnect()
+                # reconnect shards concurrently, IDENTIFYs are paced by `before_identify_hook`
+                self._start_reconnect(item.shard.reidentify(item.error))
             elif item.type == EventType.terminate:
                 await self.close()
                 raise item.error
             elif item.type == EventType.clean_close:
                 return
 
+    def _start_reconnect(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._reconnect_tasks.add(task)
+        task.add_done_callback(self._reconnect_tasks.discard)
+
+    async def before_identify_hook(self, shard_id: int | None, *, initial: bool = False) -> None:
+        """|coro|
+
+        A hook that is called before IDENTIFYing a session. This is useful
+        if you wish to have more control over the synchronization of multiple
+        IDENTIFYing clients.
+
+        The default implementation allows one IDENTIFY every 5 seconds per
+        ``max_concurrency`` bucket (see :attr:`SessionStartLimit.max_concurrency`),
+        based on the shard ID.
+
+        .. versionchanged:: 2.13
+            Takes ``max_concurrency`` into account, instead of always sleeping for 5 seconds.
+
+        Parameters
+        ----------
+        shard_id: :class:`int`
+            The shard ID that requested being IDENTIFY'd
+        initial: :class:`bool`
+            Whether this IDENTIFY is the first initial IDENTIFY.
+        """
+        await self._reconnect_coordinator.wait_identify(shard_id, initial=initial)
+
+    @property
+    def reconnect_stats(self) -> ReconnectStats:
+        """:class:`ReconnectStats`: Statistics about shard reconnects,
+        useful for monitoring reconnect storms.
+
+        .. versionadded:: 2.13
+        """
+        return self._reconnect_coordinator.stats
+
     async def close(self) -> None:
         """|coro|
 
@@ -527,18 +775,37 @@ class AutoShardedClient(Client):
 
         self._closed = True
 
+        for task in self._reconnect_tasks:
+            task.cancel()
+
         for vc in self.voice_clients:
             try:
                 await vc.disconnect(force=True)
             except Exception:
                 pass
 
+        # closing with 1000 would invalidate the sessions
+        close_code = 1000 if self._session_file is None else 4000
         to_close = [
-            asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()
+            asyncio.ensure_future(shard.close(code=close_code), loop=self.loop)
+            for shard in self.__shards.values()
         ]
         if to_close:
             await asyncio.wait(to_close)
 
+        if self._session_file is not None:
+            for shard in self.__shards.values():
+                self._session_file.update(shard.ws)
+            await self._session_file.save_async()
+            if self._cache_snapshot is not None:
+                self._cache_snapshot.save(self._session_file.sessions)
+
+        if self._gateway_recorder is not None:
+            self._gateway_recorder.close()
+
+        if self._loop_lag_monitor is not None:
+            self._loop_lag_monitor._close()
+
         await self.http.close()
         self.__queue.put_nowait(EventItem(EventType.clean_close, None, None))
 
@@ -626,3 +893,12 @@ class AutoShardedClient(Client):
         :return type: :class:`bool`
         """
         return any(shard.ws.is_ratelimited() for shard in self.__shards.values())
+
+    @property
+    def gateway_queue_size(self) -> int:
+        """:class:`int`: The number of gateway commands currently waiting to be sent
+        because of the gateway rate limit, across all shards.
+
+        .. versionadded:: 2.13
+        """
+        return sum(shard.ws.send_queue_size for shard in self.__shards.values())
@@ -0,0 +1,294 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import pickle
+import struct
+import time
+import zlib
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from . import __version__, enums, utils
+from .abc import _Overwrites
+from .activity import Activity, CustomActivity, Game, Spotify, Streaming
+from .cache import LRUCache, MemberCachePolicy, TTLCache, _MemberCache
+from .channel import (
+    CategoryChannel,
+    ForumChannel,
+    MediaChannel,
+    StageChannel,
+    TextChannel,
+    VoiceChannel,
+)
+from .emoji import Emoji
+from .guild import Guild, IncidentsData
+from .guild_scheduled_event import GuildScheduledEvent
+from .member import Member, VoiceState
+from .partial_emoji import PartialEmoji
+from .role import Role, RoleTags
+from .soundboard import GuildSoundboardSound
+from .stage_instance import StageInstance
+from .state import ConnectionState
+from .sticker import GuildSticker
+from .threads import ForumTag, Thread, ThreadMember
+from .user import ClientUser, User
+
+if TYPE_CHECKING:
+    from .gateway import ResumeState
+
+_log = logging.getLogger(__name__)
+
+_MAGIC = b"DSNKSNAP"
+_VERSION = 1
+_HEADER_LENGTH = struct.Struct("<I")
+
+# the only objects a snapshot may reference; anything else could be abused to run arbitrary code
+_ALLOWED_GLOBALS: frozenset[tuple[str, str]] = frozenset(
+    {
+        ("builtins", "set"),
+        ("builtins", "frozenset"),
+        ("copyreg", "_reconstructor"),
+        ("collections", "OrderedDict"),
+        ("datetime", "datetime"),
+        ("datetime", "timezone"),
+        ("datetime", "timedelta"),
+        ("array", "array"),
+        ("array", "_array_reconstructor"),
+        ("disnake.enums", "try_enum"),
+        *(
+            (cls.__module__, cls.__qualname__)
+            for cls in (
+                _Overwrites,
+                Activity,
+                CustomActivity,
+                Game,
+                Spotify,
+                Streaming,
+                LRUCache,
+                MemberCachePolicy,
+                TTLCache,
+                _MemberCache,
+                CategoryChannel,
+                ForumChannel,
+                MediaChannel,
+                StageChannel,
+                TextChannel,
+                VoiceChannel,
+                Emoji,
+                Guild,
+                IncidentsData,
+                GuildScheduledEvent,
+                Member,
+                VoiceState,
+                PartialEmoji,
+                Role,
+                RoleTags,
+                GuildSoundboardSound,
+                StageInstance,
+                GuildSticker,
+                ForumTag,
+                Thread,
+                ThreadMember,
+                User,
+                utils.SnowflakeList,
+                utils._MissingSentinel,
+            )
+        ),
+        *(
+            ("disnake.enums", name)
+            for name in enums.__all__
+            if isinstance(getattr(enums, name), enums.EnumMeta)
+        ),
+    }
+)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    # state objects are not part of the snapshot, and are restored from the current client
+    def persistent_id(self, obj: Any) -> str | None:
+        if isinstance(obj, ConnectionState):
+            return "state"
+        if isinstance(obj, ClientUser):
+            return "user"
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, *, state: ConnectionState) -> None:
+        super().__init__(file)
+        self._state: ConnectionState = state
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "state":
+            return self._state
+        if pid == "user":
+            return self._state.user
+        msg = f"Unknown persistent id {pid!r}."
+        raise pickle.UnpicklingError(msg)
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in _ALLOWED_GLOBALS:
+            msg = f"Snapshot references disallowed object {module}.{name}."
+            raise pickle.UnpicklingError(msg)
+        return super().find_class(module, name)
+
+
+class CacheSnapshot:
+    """Saves the cached guilds of each shard to a local file, and restores them
+    when resuming the corresponding sessions after a process restart.
+
+    A snapshot is only restored for a shard if it was taken at the exact same
+    session and sequence that is being resumed, and with the same library version.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, state: ConnectionState) -> None:
+        self.path: str | os.PathLike[str] = path
+        self._state: ConnectionState = state
+
+    def _get_shard_id(self, guild: Guild) -> int | None:
+        return None if self._state.shard_count is None else guild.shard_id
+
+    def save(self, sessions: Mapping[int | None, ResumeState]) -> None:
+        """Writes the cached guilds of all shards with a resumable session to the file."""
+        state = self._state
+        if not state.user or not sessions:
+            return
+
+        start = time.perf_counter()
+        guilds: dict[int | None, list[Guild]] = {shard_id: [] for shard_id in sessions}
+        for guild in state._guilds.values():
+            shard_guilds = guilds.get(self._get_shard_id(guild))
+            if shard_guilds is not None:
+                shard_guilds.append(guild)
+
+        header = {
+            "v": _VERSION,
+            "library_version": __version__,
+            "user_id": state.user.id,
+            "shard_count": state.shard_count,
+            "shards": [
+                {"shard_id": shard_id, "session_id": s.session_id, "sequence": s.sequence}
+                for shard_id, s in sessions.items()
+            ],
+        }
+
+        buffer = io.BytesIO()
+        try:
+            _SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(guilds)
+        except Exception:
+            _log.warning("Failed to serialize cache snapshot.", exc_info=True)
+            return
+
+        header_data = utils._to_json(header).encode("utf-8")
+        tmp_path = f"{os.fspath(self.path)}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC + bytes((_VERSION,)))
+                f.write(_HEADER_LENGTH.pack(len(header_data)))
+                f.write(header_data)
+                f.write(zlib.compress(buffer.getvalue()))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            _log.warning("Failed to write cache snapshot %s.", self.path, exc_info=True)
+            return
+
+        _log.debug(
+            "Saved cache snapshot with %d guilds in %.2fs.",
+            sum(len(g) for g in guilds.values()),
+            time.perf_counter() - start,
+        )
+
+    def _read(self) -> tuple[dict[str, Any], bytes] | None:
+        try:
+            with open(self.path, "rb") as f:
+                magic = f.read(len(_MAGIC) + 1)
+                if magic != _MAGIC + bytes((_VERSION,)):
+                    _log.info(
+                        "Cache snapshot %s has an unsupported format, ignoring it.", self.path
+                    )
+                    return None
+                (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+                header = utils._from_json(f.read(length))
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error):
+            _log.warning("Failed to read cache snapshot %s, ignoring it.", self.path, exc_info=True)
+            return None
+        return header, data
+
+    def load(self, sessions: Mapping[int | None, ResumeState]) -> int:
+        """Restores the cached guilds of the given shards, which are about to resume their sessions.
+
+        Returns the number of restored guilds.
+        """
+        state = self._state
+        if not sessions or not state.user or (result := self._read()) is None:
+            return 0
+        header, data = result
+
+        if (
+            header.get("library_version") != __version__
+            or header.get("user_id") != state.user.id
+            or header.get("shard_count") != state.shard_count
+        ):
+            _log.info(
+                "Cache snapshot %s does not match the current client, ignoring it.", self.path
+            )
+            return 0
+
+        # only restore shards whose session is resumed from the exact point the snapshot was taken at
+        shard_ids: set[int | None] = set()
+        for s in header.get("shards", []):
+            session = sessions.get(s.get("shard_id"))
+            if (
+                session is not None
+                and session.session_id == s.get("session_id")
+                and session.sequence == s.get("sequence")
+            ):
+                shard_ids.add(s["shard_id"])
+        if not shard_ids:
+            _log.info("Cache snapshot %s is outdated, ignoring it.", self.path)
+            return 0
+
+        start = time.perf_counter()
+        try:
+            guilds: dict[int | None, list[Guild]] = _SnapshotUnpickler(
+                io.BytesIO(zlib.decompress(data)), state=state
+            ).load()
+        except Exception:
+            _log.warning("Failed to load cache snapshot %s.", self.path, exc_info=True)
+            return 0
+
+        count = 0
+        for shard_id in shard_ids:
+            for guild in guilds.get(shard_id, ()):
+                self._restore_guild(guild)
+                count += 1
+
+        _log.info(
+            "Restored %d guilds from cache snapshot in %.2fs.", count, time.perf_counter() - start
+        )
+        return count
+
+    def _restore_guild(self, guild: Guild) -> None:
+        state = self._state
+        state._add_guild(guild)
+        for emoji in guild.emojis:
+            state._emojis[emoji.id] = emoji
+        for sticker in guild.stickers:
+            state._stickers[sticker.id] = sticker
+        for sound in guild.soundboard_sounds:
+            state._soundboard_sounds[sound.id] = sound
+        for member in guild._members.values():
+            user = member._user
+            if user.discriminator != "0000":
+                state._users[user.id] = user
+
+        # the guild cache filter may have changed since the snapshot was created
+        if not guild._skeleton and not state._is_fully_cached(guild.id):
+            state._trim_guild(guild)
@@ -5,13 +5,16 @@ from __future__ import annotations
 import asyncio
 import copy
 import datetime
+import heapq
 import inspect
 import itertools
 import logging
 import os
+import sys
+import time
 import weakref
-from collections import OrderedDict, deque
-from collections.abc import Callable, Coroutine, Sequence
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Iterable, MutableMapping, Sequence
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -27,6 +30,14 @@ from .activity import BaseActivity
 from .app_commands import GuildApplicationCommandPermissions, application_command_factory
 from .audit_logs import AuditLogEntry
 from .automod import AutoModActionExecution, AutoModRule
+from .cache import (
+    CacheBackends,
+    MemberCachePolicy,
+    PresenceStore,
+    UserCache,
+    _peek,
+    _UserGuildIndex,
+)
 from .channel import (
     DMChannel,
     ForumChannel,
@@ -44,8 +55,9 @@ from .components import _SELECT_COMPONENT_TYPES
 from .emoji import Emoji
 from .entitlement import Entitlement
 from .enums import ApplicationCommandType, ChannelType, ComponentType, MessageType, Status, try_enum
+from .errors import HTTPException
 from .flags import ApplicationFlags, Intents, MemberCacheFlags
-from .guild import Guild
+from .guild import ChunkProgress, Guild
 from .guild_scheduled_event import GuildScheduledEvent
 from .integrations import _integration_factory
 from .interactions import (
@@ -95,7 +107,7 @@ if TYPE_CHECKING:
     from .abc import AnyChannel, MessageableChannel, PrivateChannel
     from .app_commands import APIApplicationCommand, ApplicationCommand
     from .client import Client
-    from .gateway import DiscordWebSocket
+    from .gateway import DiscordWebSocket, GatewayStats
     from .guild import GuildChannel, VocalGuildChannel
     from .http import HTTPClient
     from .types import gateway
@@ -141,6 +153,11 @@ class AsyncRequest(Generic[T]):
             if not future.done():
                 future.set_result(result)
 
+    def set_exception(self, exc: BaseException) -> None:
+        for future in self.waiters:
+            if not future.done():
+                future.set_exception(exc)
+
 
 class ChunkRequest(AsyncRequest[list[Member]]):
     def __init__(
@@ -156,9 +173,21 @@ class ChunkRequest(AsyncRequest[list[Member]]):
         self.cache: bool = cache
         self.nonce: str = os.urandom(16).hex()
         self.buffer: list[Member] = []
-
-    def add_members(self, members: list[Member]) -> None:
+        # resolved once the request was sent, see `ChunkScheduler`
+        self.sent: asyncio.Future[None] = loop.create_future()
+        self.priority: Any = 0
+        # progress tracking, see `ChunkProgress`
+        self.shard_id: int = 0
+        self.expected: int | None = None
+        self.chunks_received: int = 0
+        self.chunk_count: int | None = None
+        self.started_at: float | None = None
+
+    def add_members(self, members: list[Member], chunk_count: int | None = None) -> None:
         self.buffer.extend(members)
+        self.chunks_received += 1
+        if chunk_count is not None:
+            self.chunk_count = chunk_count
         if self.cache:
             guild = self.resolver(self.guild_id)
             if guild is None:
@@ -172,6 +201,221 @@ class ChunkRequest(AsyncRequest[list[Member]]):
     def done(self) -> None:
         self.set_result(self.buffer)
 
+    def progress(self, guild: Guild) -> ChunkProgress:
+        return ChunkProgress(
+            guild=guild,
+            members_received=len(self.buffer),
+            member_count=self.expected,
+            chunks_received=self.chunks_received,
+            chunk_count=self.chunk_count,
+            elapsed=None if self.started_at is None else time.perf_counter() - self.started_at,
+        )
+
+
+class ChunkScheduler:
+    """Paces requests for all members of a guild, based on the size of the guilds.
+
+    Requests are sent per shard in order of their priority, as long as the shard has
+    fewer than ``max_requests`` requests in flight and the sum of their expected member
+    counts stays below ``max_members``; a request is always sent if nothing else is in
+    flight on its shard. The budget of a request is released once it completes, or once
+    its deadline (which scales with the member count) passes.
+    Gateway commands themselves are still subject to the `GatewayRatelimiter`.
+    """
+
+    def __init__(
+        self, state: ConnectionState, *, max_members: int = 250_000, max_requests: int = 50
+    ) -> None:
+        self.state: ConnectionState = state
+        self.max_members: int = max_members
+        self.max_requests: int = max_requests
+        # shard ID -> heap of (priority, insertion order, request)
+        self.queues: dict[int, list[tuple[Any, int, ChunkRequest]]] = {}
+        self._counter: itertools.count[int] = itertools.count()
+        # shard ID -> sum of expected member counts of in-flight requests
+        self.in_flight: dict[int, int] = {}
+        # shard ID -> number of in-flight requests
+        self.in_flight_requests: dict[int, int] = {}
+        # request nonce -> deadline timer, for in-flight requests
+        self.handles: dict[str, asyncio.TimerHandle | None] = {}
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    def cost(self, request: ChunkRequest) -> int:
+        # a single request never takes up more than half of the budget,
+        # so that smaller guilds can still be requested alongside huge ones
+        return min(max(request.expected or 0, 1), self.max_members // 2)
+
+    @staticmethod
+    def deadline(request: ChunkRequest) -> float:
+        # the gateway sends chunks of up to 1000 members, usually several per second
+        return 10.0 + (request.expected or 0) / 2000
+
+    def schedule(self, request: ChunkRequest) -> None:
+        queue = self.queues.setdefault(request.shard_id, [])
+        heapq.heappush(queue, (request.priority, next(self._counter), request))
+        self._pump(request.shard_id)
+
+    def _pump(self, shard_id: int) -> None:
+        queue = self.queues.get(shard_id)
+        while queue:
+            request = queue[0][2]
+            in_flight = self.in_flight.get(shard_id, 0)
+            requests = self.in_flight_requests.get(shard_id, 0)
+            if requests and (
+                requests >= self.max_requests or in_flight + self.cost(request) > self.max_members
+            ):
+                break
+
+            heapq.heappop(queue)
+            self.in_flight[shard_id] = in_flight + self.cost(request)
+            self.in_flight_requests[shard_id] = requests + 1
+            self.handles[request.nonce] = None
+            task = asyncio.create_task(self._send(request))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        if not queue:
+            self.queues.pop(shard_id, None)
+
+    async def _send(self, request: ChunkRequest) -> None:
+        request.started_at = time.perf_counter()
+        try:
+            await self.state.chunker(request.guild_id, nonce=request.nonce)
+        except Exception as e:
+            self.state._remove_chunk_request(request)
+            request.set_exception(e)
+            return
+
+        if not request.sent.done():
+            request.sent.set_result(None)
+        if request.nonce in self.handles:
+            self.handles[request.nonce] = asyncio.get_running_loop().call_later(
+                self.deadline(request), self.release, request
+            )
+
+    def release(self, request: ChunkRequest) -> None:
+        try:
+            handle = self.handles.pop(request.nonce)
+        except KeyError:
+            # not in flight, remove it from the queue if it's still there
+            queue = self.queues.get(request.shard_id)
+            if queue:
+                queue[:] = [entry for entry in queue if entry[2] is not request]
+                heapq.heapify(queue)
+            return
+
+        if handle is not None:
+            handle.cancel()
+        shard_id = request.shard_id
+        self.in_flight[shard_id] -= self.cost(request)
+        self.in_flight_requests[shard_id] -= 1
+        if not self.in_flight_requests[shard_id]:
+            del self.in_flight[shard_id], self.in_flight_requests[shard_id]
+        self._pump(shard_id)
+
+
+class MemberResolver:
+    """Coalesces concurrent requests for members of a guild by ID.
+
+    Requested IDs are collected for ``delay`` seconds (or until 100 IDs are pending),
+    and then requested using a single ``REQUEST_GUILD_MEMBERS`` gateway command per
+    100 IDs. IDs that are already pending or being requested are deduplicated,
+    and all waiters are resolved from the same response.
+    """
+
+    def __init__(self, state: ConnectionState, guild_id: int, *, delay: float = 0.05) -> None:
+        self.state: ConnectionState = state
+        self.guild_id: int = guild_id
+        self.delay: float = delay
+        # (user ID, presences) -> future, for pending and in-flight IDs
+        self.futures: dict[tuple[int, bool], asyncio.Future[Member | None]] = {}
+        # (presences, cache) -> IDs waiting for the next request
+        self.pending: dict[tuple[bool, bool], list[int]] = {}
+        self.handle: asyncio.TimerHandle | None = None
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def resolve(
+        self, user_ids: Iterable[int], *, presences: bool = False, cache: bool = True
+    ) -> list[Member]:
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[Member | None]] = []
+        for user_id in dict.fromkeys(user_ids):
+            future = self.futures.get((user_id, presences))
+            if future is None:
+                self.futures[user_id, presences] = future = loop.create_future()
+                batch = self.pending.setdefault((presences, cache), [])
+                batch.append(user_id)
+                if len(batch) >= 100:
+                    self._flush()
+                elif self.handle is None:
+                    self.handle = loop.call_later(self.delay, self._flush)
+            futures.append(future)
+
+        # shield the shared futures, so that a cancelled waiter doesn't affect others
+        results = await asyncio.gather(*map(asyncio.shield, futures))
+        members = [m for m in results if m is not None]
+        if cache:
+            # in case the member was requested by another waiter with `cache=False`
+            guild = self.state._get_guild(self.guild_id)
+            if guild is not None:
+                for member in members:
+                    if guild.get_member(member.id) is None:
+                        guild._add_member(member)
+        return members
+
+    def _flush(self) -> None:
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+        pending, self.pending = self.pending, {}
+        for (presences, cache), user_ids in pending.items():
+            for i in range(0, len(user_ids), 100):
+                task = asyncio.create_task(self._request(user_ids[i : i + 100], presences, cache))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def _request(self, user_ids: list[int], presences: bool, cache: bool) -> None:
+        # the futures stay registered until they're resolved,
+        # so that lookups of the same IDs in the meantime wait for this request
+        futures = [self.futures[user_id, presences] for user_id in user_ids]
+        try:
+            guild = self.state._get_guild(self.guild_id)
+            if guild is None:
+                members = []
+            else:
+                members = await self.state.query_members(
+                    guild,
+                    query=None,
+                    limit=len(user_ids),
+                    user_ids=user_ids,
+                    cache=cache,
+                    presences=presences,
+                )
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+                    # avoid "exception was never retrieved" warnings if all waiters were cancelled
+                    future.exception()
+        else:
+            by_id = {member.id: member for member in members}
+            for user_id, future in zip(user_ids, futures, strict=True):
+                if not future.done():
+                    future.set_result(by_id.get(user_id))
+        finally:
+            for user_id, future in zip(user_ids, futures, strict=True):
+                if self.futures.get((user_id, presences)) is future:
+                    del self.futures[user_id, presences]
+            # the current task is only removed from `tasks` once it's done
+            resolvers = self.state._member_resolvers
+            if not self.futures and len(self.tasks) <= 1 and resolvers.get(self.guild_id) is self:
+                del resolvers[self.guild_id]
+
 
 _log = logging.getLogger(__name__)
 
@@ -206,7 +450,10 @@ class ConnectionState:
         status: str | Status | None = None,
         intents: Intents | None = None,
         chunk_guilds_at_startup: bool | None = None,
+        chunk_priority: Callable[[Guild], Any] | None = None,
+        guild_cache_filter: Callable[[int], bool] | None = None,
         member_cache_flags: MemberCacheFlags | None = None,
+        cache_backends: CacheBackends | None = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = loop
         self.http: HTTPClient = http
@@ -219,6 +466,8 @@ class ConnectionState:
         self.hooks: dict[str, Callable[..., Any]] = hooks
         self.shard_count: int | None = None
         self._ready_task: asyncio.Task | None = None
+        # shards resuming a session persisted by a previous process, see `Client.session_file`
+        self._pending_resumes: set[int | None] = set()
         self.application_id: int | None = None if application_id is None else int(application_id)
         self.heartbeat_timeout: float = heartbeat_timeout
         self.guild_ready_timeout: float = guild_ready_timeout
@@ -231,7 +480,14 @@ class ConnectionState:
             raise TypeError(msg)
 
         self.allowed_mentions: AllowedMentions | None = allowed_mentions
-        self._chunk_requests: dict[int | str, ChunkRequest] = {}
+        # nonce -> request, for all pending chunk requests
+        self._chunk_requests: dict[str, ChunkRequest] = {}
+        # guild ID -> request for all members, to deduplicate concurrent requests
+        self._guild_chunk_requests: dict[int, ChunkRequest] = {}
+        self._chunk_scheduler: ChunkScheduler = ChunkScheduler(self)
+        self._member_resolvers: dict[int, MemberResolver] = {}
+        # shard ID -> received event statistics, kept across reconnects
+        self._gateway_stats: dict[int, GatewayStats] = {}
 
         if activity:
             if not isinstance(activity, BaseActivity):
@@ -264,6 +520,17 @@ class ConnectionState:
             self._intents.members if chunk_guilds_at_startup is None else chunk_guilds_at_startup
         )
 
+        self._chunk_priority: Callable[[Guild], Any] = chunk_priority or (
+            lambda guild: guild.member_count
+        )
+
+        if guild_cache_filter is not None and not callable(guild_cache_filter):
+            msg = f"guild_cache_filter must be callable, not {type(guild_cache_filter)!r}."
+            raise TypeError(msg)
+        self._guild_cache_filter: Callable[[int], bool] | None = guild_cache_filter
+        # background tasks upgrading guilds to be fully cached, see `_set_guild_cache_filter`
+        self._guild_upgrades: set[asyncio.Task[None]] = set()
+
         # Ensure these two are set properly
         if not self._intents.members and self._chunk_guilds:
             msg = "Intents.members must be enabled to chunk guilds at startup."
@@ -283,6 +550,21 @@ class ConnectionState:
 
         self.member_cache_flags: MemberCacheFlags = member_cache_flags
 
+        if cache_backends is None:
+            cache_backends = CacheBackends()
+        elif not isinstance(cache_backends, CacheBackends):
+            msg = f"cache_backends parameter must be CacheBackends, not {type(cache_backends)!r}."
+            raise TypeError(msg)
+        self.cache_backends: CacheBackends = cache_backends
+        self._member_cache_policy: MemberCachePolicy | None = (
+            cache_backends.members
+            if isinstance(cache_backends.members, MemberCachePolicy)
+            else None
+        )
+        self._compact_members: bool = cache_backends.compact_members
+        self._presence_store: PresenceStore | None = cache_backends.presences
+        self._lazy_messages: bool = cache_backends.lazy_messages
+
         if not self._intents.members or member_cache_flags._empty:
             self.store_user = self.create_user
 
@@ -297,15 +579,23 @@ class ConnectionState:
         self, *, views: bool = True, application_commands: bool = True, modals: bool = True
     ) -> None:
         self.user: ClientUser = MISSING
-        # NOTE: without weakrefs, these user objects would otherwise be kept in memory indefinitely.
-        # However, using weakrefs here unfortunately has a few drawbacks:
+        backends = self.cache_backends
+        # NOTE: by default, `_users` is a `WeakValueDictionary`, as these user objects would otherwise
+        # be kept in memory indefinitely. However, using weakrefs here unfortunately has a few drawbacks:
         # - the weakref slot + object in user objects likely results in a small increase in memory usage
         # - accesses on `_users` are slower, e.g. `__getitem__` takes ~1us with weakrefs and ~0.2us without
-        self._users: weakref.WeakValueDictionary[int, User] = weakref.WeakValueDictionary()
-        self._emojis: dict[int, Emoji] = {}
-        self._stickers: dict[int, GuildSticker] = {}
+        self._users: MutableMapping[int, User] = backends.users()
+        self._emojis: MutableMapping[int, Emoji] = backends.emojis()
+        self._stickers: MutableMapping[int, GuildSticker] = backends.stickers()
         self._soundboard_sounds: dict[int, GuildSoundboardSound] = {}
-        self._guilds: dict[int, Guild] = {}
+        self._guilds: MutableMapping[int, Guild] = backends.guilds()
+        # user ID -> IDs of cached guilds the user is a cached member of
+        self._user_guilds: _UserGuildIndex = _UserGuildIndex()
+        # role lists shared between compact members, keyed by their raw bytes;
+        # lists are dropped once no member references them anymore
+        self._role_sets: weakref.WeakValueDictionary[bytes, utils.SnowflakeList] = (
+            weakref.WeakValueDictionary()
+        )
 
         if application_commands:
             self._global_application_commands: dict[int, APIApplicationCommand] = {}
@@ -323,24 +613,40 @@ class ConnectionState:
         self._private_channels: OrderedDict[int, PrivateChannel] = OrderedDict()
         # extra dict to look up private channels by user id
         self._private_channels_by_user: dict[int, DMChannel] = {}
+        # messages are keyed by ID, ordered from oldest to newest
         if self.max_messages is not None:
-            self._messages: deque[Message] | None = deque(maxlen=self.max_messages)
+            self._messages: MutableMapping[int, Message] | None = backends._create_message_cache(
+                self.max_messages
+            )
         else:
-            self._messages: deque[Message] | None = None
+            self._messages: MutableMapping[int, Message] | None = None
 
     def process_chunk_requests(
-        self, guild_id: int, nonce: str | None, members: list[Member], complete: bool
-    ) -> None:
-        removed = []
-        for key, request in self._chunk_requests.items():
-            if request.guild_id == guild_id and request.nonce == nonce:
-                request.add_members(members)
-                if complete:
-                    request.done()
-                    removed.append(key)
+        self,
+        guild_id: int,
+        nonce: str | None,
+        members: list[Member],
+        complete: bool,
+        *,
+        chunk_count: int | None = None,
+    ) -> ChunkRequest | None:
+        if nonce is None:
+            return None
+        request = self._chunk_requests.get(nonce)
+        if request is None or request.guild_id != guild_id:
+            return None
 
-        for key in removed:
-            del self._chunk_requests[key]
+        request.add_members(members, chunk_count)
+        if complete:
+            self._remove_chunk_request(request)
+            request.done()
+        return request
+
+    def _remove_chunk_request(self, request: ChunkRequest) -> None:
+        self._chunk_requests.pop(request.nonce, None)
+        if self._guild_chunk_requests.get(request.guild_id) is request:
+            del self._guild_chunk_requests[request.guild_id]
+            self._chunk_scheduler.release(request)
 
     def call_handlers(self, key: str, *args: Any, **kwargs: Any) -> None:
         try:
@@ -394,9 +700,71 @@ class ConnectionState:
         except KeyError:
             user = User(state=self, data=data)
             if user.discriminator != "0000":
+                if self._compact_members:
+                    self._intern_user(user)
                 self._users[user_id] = user
             return user
 
+    def _intern_user(self, user: User) -> None:
+        user.name = sys.intern(user.name)
+        user.discriminator = sys.intern(user.discriminator)
+        if user.global_name is not None:
+            user.global_name = sys.intern(user.global_name)
+        if user._avatar is not None:
+            user._avatar = sys.intern(user._avatar)
+
+    def _shared_roles(self, roles: utils.SnowflakeList) -> utils.SnowflakeList:
+        key = roles.tobytes()
+        shared = self._role_sets.get(key)
+        if shared is None:
+            self._role_sets[key] = shared = roles
+        return shared
+
+    def _touch_member(self, guild_id: int | None, user_id: int) -> None:
+        # marks the member as recently active in bounded member caches
+        if self._member_cache_policy is None:
+            return
+        guild = self._get_guild(guild_id)
+        if guild is not None:
+            guild._members.touch(user_id)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def _evict_users(self, user_ids: Iterable[int]) -> None:
+        # with a strong-reference user cache, users are evicted once they
+        # aren't cached as a member of any guild anymore
+        if not isinstance(self._users, UserCache):
+            return
+        self_id = self.self_id
+        user_guilds = self._user_guilds
+        for user_id in user_ids:
+            if user_id != self_id and user_id not in user_guilds:
+                self._users.pop(user_id, None)
+
+    def _get_mutual_guilds(self, user_id: int) -> list[Guild]:
+        guilds: list[Guild] = []
+        for guild_id in self._user_guilds.get(user_id):
+            guild = self._guilds.get(guild_id)
+            if guild is not None and guild.get_member(user_id) is not None:
+                guilds.append(guild)
+            else:
+                # the member was evicted from a bounded member cache
+                self._user_guilds.discard(user_id, guild_id)
+        return guilds
+
+    def _update_member_names(self, user_id: int) -> None:
+        # user objects are shared between guilds, so a changed username or global name
+        # has to be updated in the member name index of every mutual guild
+        if not self.cache_backends.member_name_index:
+            return
+        # this doesn't go through `_get_mutual_guilds`/`get_member`,
+        # to avoid evicting members from bounded member caches here
+        for guild_id in self._user_guilds.get(user_id):
+            guild = _peek(self._guilds, guild_id)
+            if guild is None or guild._name_index is None:
+                continue
+            member = guild._peek_member(user_id)
+            if member is not None:
+                guild._name_index.add(member)
+
     def create_user(self, data: UserPayload) -> User:
         return User(state=self, data=data)
 
@@ -449,10 +817,15 @@ class ConnectionState:
         return self._guilds.get(guild_id)
 
     def _add_guild(self, guild: Guild) -> None:
+        previous = self._guilds.get(guild.id)
+        if previous is not None and previous is not guild:
+            self._user_guilds.discard_guild(previous.id, previous._members.keys())
         self._guilds[guild.id] = guild
+        self._user_guilds.add_guild(guild.id, guild._members.keys())
 
     def _remove_guild(self, guild: Guild) -> None:
         self._guilds.pop(guild.id, None)
+        self._user_guilds.discard_guild(guild.id, guild._members.keys())
 
         for emoji in guild.emojis:
             self._emojis.pop(emoji.id, None)
@@ -463,6 +836,7 @@ class ConnectionState:
         for sound in guild.soundboard_sounds:
             self._soundboard_sounds.pop(sound.id, None)
 
+        self._evict_users(guild._members.keys())
         del guild
 
     def _get_global_application_command(
@@ -603,24 +977,99 @@ class ConnectionState:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: int | None) -> Message | None:
-        return (
-            utils.find(lambda m: m.id == msg_id, reversed(self._messages))
-            if self._messages
-            else None
-        )
+        # the keys of self._messages are ints
+        return self._messages.get(msg_id) if self._messages is not None else None  # pyright: ignore[reportArgumentType]
 
     def _add_guild_from_data(self, data: GuildPayload | UnavailableGuildPayload) -> Guild:
+        skeleton = not self._is_fully_cached(int(data["id"]))
         guild = Guild(
-            data=data,  # pyright: ignore[reportArgumentType]  # may be unavailable guild
+            data=self._skeleton_guild_data(data) if skeleton else data,  # pyright: ignore[reportArgumentType]  # may be unavailable guild
             state=self,
         )
+        guild._skeleton = skeleton
         self._add_guild(guild)
         return guild
 
+    def _is_fully_cached(self, guild_id: int) -> bool:
+        guild_filter = self._guild_cache_filter
+        return guild_filter is None or bool(guild_filter(guild_id))
+
+    def _skeleton_guild_data(self, data: GuildPayload | UnavailableGuildPayload) -> Any:
+        # only keep what's cached for guilds that aren't fully cached, see `Client.guild_cache_filter`
+        result: dict[str, Any] = {
+            key: value
+            for key, value in data.items()
+            if key not in ("members", "presences", "emojis", "stickers", "threads")
+        }
+        if "members" in data:
+            self_id = self.self_id
+            result["members"] = [m for m in data["members"] if int(m["user"]["id"]) == self_id]
+        return result
+
+    def _set_guild_cache_filter(self, guild_filter: Callable[[int], bool] | None) -> None:
+        if guild_filter is not None and not callable(guild_filter):
+            msg = f"guild_cache_filter must be callable, not {type(guild_filter)!r}."
+            raise TypeError(msg)
+        self._guild_cache_filter = guild_filter
+
+        for guild in list(self._guilds.values()):
+            fully_cached = self._is_fully_cached(guild.id)
+            if guild._skeleton and fully_cached:
+                task = asyncio.create_task(self._upgrade_guild(guild))
+                self._guild_upgrades.add(task)
+                task.add_done_callback(self._guild_upgrades.discard)
+            elif not guild._skeleton and not fully_cached:
+                self._trim_guild(guild)
+
+    def _trim_guild(self, guild: Guild) -> None:
+        for emoji in guild.emojis:
+            self._emojis.pop(emoji.id, None)
+
+        for sticker in guild.stickers:
+            self._stickers.pop(sticker.id, None)
+
+        self._evict_users(guild._trim_cache())
+
+    async def _upgrade_guild(self, guild: Guild) -> None:
+        # the guild stays a skeleton until everything is fetched, so a failed upgrade
+        # is retried the next time the guild cache filter is set
+        try:
+            emojis = await self.http.get_all_custom_emojis(guild.id)
+            stickers = await self.http.get_all_guild_stickers(guild.id)
+            threads = await self.http.get_active_threads(guild.id)
+        except HTTPException:
+            _log.warning(
+                "Failed to fetch emojis, stickers or threads of guild ID %s.",
+                guild.id,
+                exc_info=True,
+            )
+            return
+
+        # the guild might've been upgraded, filtered out again or removed in the meantime
+        if (
+            not guild._skeleton
+            or not self._is_fully_cached(guild.id)
+            or self._get_guild(guild.id) is not guild
+        ):
+            return
+        guild._skeleton = False
+        for emoji in guild.emojis:
+            self._emojis.pop(emoji.id, None)
+        guild.emojis = tuple(self.store_emoji(guild, d) for d in emojis)
+        for sticker in guild.stickers:
+            self._stickers.pop(sticker.id, None)
+        guild.stickers = tuple(self.store_sticker(guild, d) for d in stickers)
+        for d in threads.get("threads", []):
+            guild._add_thread(Thread(guild=guild, state=self, data=d))
+
+        if self._guild_needs_chunking(guild):
+            await self.chunk_guild(guild)
+
     def _guild_needs_chunking(self, guild: Guild) -> bool:
         # If presences are enabled then we get back the old guild.large behaviour
         return (
             self._chunk_guilds
+            and not guild._skeleton
             and not guild.chunked
             and not (self._intents.presences and not guild.large)
         )
@@ -698,10 +1147,20 @@ class ConnectionState:
                 guild_id,
             )
             raise
+        finally:
+            self._chunk_requests.pop(request.nonce, None)
+
+    async def resolve_members(
+        self, guild: Guild, user_ids: Iterable[int], *, presences: bool, cache: bool
+    ) -> list[Member]:
+        resolver = self._member_resolvers.get(guild.id)
+        if resolver is None:
+            self._member_resolvers[guild.id] = resolver = MemberResolver(self, guild.id)
+        return await resolver.resolve(user_ids, presences=presences, cache=cache)
 
     async def _delay_ready(self) -> None:
+        tasks: list[asyncio.Task[None]] = []
         try:
-            states = []
             while True:
                 # this snippet of code is basically waiting N seconds
                 # until the last GUILD_CREATE was sent
@@ -713,28 +1172,19 @@ class ConnectionState:
                     break
                 else:
                     if self._guild_needs_chunking(guild):
-                        future = await self.chunk_guild(guild, wait=False)
-                        states.append((guild, future))
+                        # guilds are chunked concurrently (see `ChunkScheduler`),
+                        # and their events are dispatched as soon as they're chunked
+                        tasks.append(
+                            asyncio.create_task(self._chunk_and_dispatch(guild, guild.unavailable))
+                        )
                     else:
                         if guild.unavailable is False:
                             self.dispatch("guild_available", guild)
                         else:
                             self.dispatch("guild_join", guild)
 
-            for guild, future in states:
-                try:
-                    await asyncio.wait_for(future, timeout=5.0)
-                except asyncio.TimeoutError:
-                    _log.warning(
-                        "Shard ID %s timed out waiting for chunks for guild_id %s.",
-                        guild.shard_id,
-                        guild.id,
-                    )
-
-                if guild.unavailable is False:
-                    self.dispatch("guild_available", guild)
-                else:
-                    self.dispatch("guild_join", guild)
+            if tasks:
+                await asyncio.gather(*tasks)
 
             # remove the state
             try:
@@ -743,7 +1193,8 @@ class ConnectionState:
                 pass  # already been deleted somehow
 
         except asyncio.CancelledError:
-            pass
+            for task in tasks:
+                task.cancel()
         else:
             # dispatch the event
             self.call_handlers("ready")
@@ -755,6 +1206,8 @@ class ConnectionState:
         if self._ready_task is not None:
             self._ready_task.cancel()
 
+        self._pending_resumes.clear()
+
         self._ready_state: asyncio.Queue[Guild] = asyncio.Queue()
         self.clear(views=False, application_commands=False, modals=False)
         self.user = ClientUser(state=self, data=data["user"])
@@ -778,6 +1231,15 @@ class ConnectionState:
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data: gateway.ResumedEvent) -> None:
+        if self._pending_resumes:
+            # resumed a session of a previous process; there is no READY event in this case,
+            # so we're ready right away
+            self._pending_resumes.clear()
+            self.dispatch("connect")
+            self.call_handlers("connect_internal")
+            self.call_handlers("ready")
+            self.dispatch("ready")
+
         self.dispatch("resumed")
 
     def parse_application_command_permissions_update(
@@ -790,9 +1252,11 @@ class ConnectionState:
         channel, _ = self._get_guild_channel(data)
         # channel would be the correct type here
         message = Message(channel=channel, data=data, state=self)  # pyright: ignore[reportArgumentType]
+        if message.guild is not None:
+            self._touch_member(message.guild.id, message.author.id)
         self.dispatch("message", message)
         if self._messages is not None:
-            self._messages.append(message)
+            self._messages[message.id] = message
 
         if channel:
             # we ensure that the channel is a type that implements last_message_id
@@ -827,13 +1291,13 @@ class ConnectionState:
 
         if self._messages is not None and found is not None:
             self.dispatch("message_delete", found)
-            self._messages.remove(found)
+            self._messages.pop(found.id, None)
 
     def parse_message_delete_bulk(self, data: gateway.MessageDeleteBulkEvent) -> None:
         raw = RawBulkMessageDeleteEvent(data)
         if self._messages:
             found_messages = [
-                message for message in self._messages if message.id in raw.message_ids
+                message for message in self._messages.values() if message.id in raw.message_ids
             ]
         else:
             found_messages = []
@@ -852,7 +1316,7 @@ class ConnectionState:
             # self._messages won't be None here
             assert self._messages is not None
             for msg in found_messages:
-                self._messages.remove(msg)
+                self._messages.pop(msg.id, None)
 
     def parse_message_update(self, data: gateway.MessageUpdateEvent) -> None:
         raw = RawMessageUpdateEvent(data)
@@ -1008,6 +1472,11 @@ class ConnectionState:
 
         interaction: Interaction
 
+        if "member" in data:
+            self._touch_member(
+                utils._get_as_snowflake(data, "guild_id"), int(data["member"]["user"]["id"])
+            )
+
         if data["type"] == 1:
             # PING interaction should never be received
             return
@@ -1058,6 +1527,7 @@ class ConnectionState:
         old_member = Member._copy(member)
         user_update = member._presence_update(data=data, user=user)
         if user_update:
+            self._update_member_names(member_id)
             self.dispatch("user_update", user_update[0], user_update[1])
 
         self.dispatch("presence_update", old_member, member)
@@ -1065,6 +1535,7 @@ class ConnectionState:
     def parse_user_update(self, data: gateway.UserUpdateEvent) -> None:
         if user := self.user:
             user._update(data)
+            self._update_member_names(user.id)
 
     def parse_invite_create(self, data: gateway.InviteCreateEvent) -> None:
         invite = Invite.from_gateway(state=self, data=data)
@@ -1114,6 +1585,7 @@ class ConnectionState:
                     guild,
                     data,  # pyright: ignore[reportArgumentType]  # data type will always match channel type
                 )
+                guild._invalidate_caches()
                 self.dispatch("guild_channel_update", old_channel, channel)
             else:
                 _log.debug(
@@ -1353,6 +1825,7 @@ class ConnectionState:
             member = guild.get_member(user_id)
             if member is not None:
                 guild._remove_member(member)
+                self._evict_users((user_id,))
                 self.dispatch("member_remove", member)
                 user = member
             else:
@@ -1379,8 +1852,11 @@ class ConnectionState:
         if member is not None:
             old_member = Member._copy(member)
             member._update(data)
+            if guild._name_index is not None:
+                guild._name_index.add(member)
             user_update = member._update_inner_user(data["user"])
             if user_update:
+                self._update_member_names(user_id)
                 self.dispatch("user_update", user_update[0], user_update[1])
 
             self.dispatch("member_update", old_member, member)
@@ -1390,6 +1866,7 @@ class ConnectionState:
             # Force an update on the inner user if necessary
             user_update = member._update_inner_user(data["user"])
             if user_update:
+                self._update_member_names(user_id)
                 self.dispatch("user_update", user_update[0], user_update[1])
 
             if self.member_cache_flags.joined:
@@ -1406,6 +1883,12 @@ class ConnectionState:
             )
             return
 
+        if guild._skeleton:
+            # emojis of guilds that aren't fully cached aren't cached either
+            emojis = tuple(Emoji(guild=guild, state=self, data=d) for d in data["emojis"])
+            self.dispatch("guild_emojis_update", guild, (), emojis)
+            return
+
         before_emojis = guild.emojis
         for emoji in before_emojis:
             self._emojis.pop(emoji.id, None)
@@ -1421,6 +1904,12 @@ class ConnectionState:
             )
             return
 
+        if guild._skeleton:
+            # same as emojis above
+            stickers = tuple(GuildSticker(state=self, data=d) for d in data["stickers"])
+            self.dispatch("guild_stickers_update", guild, (), stickers)
+            return
+
         before_stickers = guild.stickers
         for sticker in before_stickers:
             self._stickers.pop(sticker.id, None)
@@ -1435,7 +1924,7 @@ class ConnectionState:
             guild = self._get_guild(int(data["id"]))
             if guild is not None:
                 guild.unavailable = False
-                guild._from_data(data)  # pyright: ignore[reportArgumentType]  # data type not narrowed correctly to full guild
+                guild._from_data(self._skeleton_guild_data(data) if guild._skeleton else data)  # pyright: ignore[reportArgumentType]  # data type not narrowed correctly to full guild
                 return guild
 
         return self._add_guild_from_data(data)
@@ -1457,22 +1946,50 @@ class ConnectionState:
         self, guild: Guild, *, wait: bool = True, cache: bool | None = None
     ) -> list[Member] | asyncio.Future[list[Member]]:
         cache = cache or self.member_cache_flags.joined
-        request = self._chunk_requests.get(guild.id)
+        request = self._guild_chunk_requests.get(guild.id)
         if request is None:
-            self._chunk_requests[guild.id] = request = ChunkRequest(
-                guild.id, self.loop, self._get_guild, cache=cache
-            )
-            await self.chunker(guild.id, nonce=request.nonce)
+            request = ChunkRequest(guild.id, self.loop, self._get_guild, cache=cache)
+            request.shard_id = guild.shard_id
+            request.expected = guild.member_count
+            request.priority = self._chunk_priority(guild)
+            self._guild_chunk_requests[guild.id] = self._chunk_requests[request.nonce] = request
+            # the future is created first, in case sending the request fails right away
+            future = request.get_future()
+            self._chunk_scheduler.schedule(request)
+        else:
+            future = request.get_future()
 
         if wait:
-            return await request.wait()
-        return request.get_future()
+            try:
+                return await future
+            finally:
+                request.waiters.remove(future)
+        return future
 
     async def _chunk_and_dispatch(self, guild: Guild, unavailable: bool | None) -> None:
         try:
-            await asyncio.wait_for(self.chunk_guild(guild), timeout=60.0)
+            future = await self.chunk_guild(guild, wait=False)
+            timeout = 60.0
+            request = self._guild_chunk_requests.get(guild.id)
+            if request is not None:
+                # time spent waiting for other requests to be sent doesn't count towards the timeout
+                await asyncio.wait((future, request.sent), return_when=asyncio.FIRST_COMPLETED)
+                timeout = self._chunk_scheduler.deadline(request)
+            await asyncio.wait_for(future, timeout=timeout)
         except asyncio.TimeoutError:
-            _log.info("Somehow timed out waiting for chunks.")
+            _log.warning(
+                "Shard ID %s timed out waiting for chunks for guild_id %s (%d members).",
+                guild.shard_id,
+                guild.id,
+                guild.member_count,
+            )
+        except Exception:
+            _log.warning(
+                "Shard ID %s failed to request chunks for guild_id %s.",
+                guild.shard_id,
+                guild.id,
+                exc_info=True,
+            )
 
         if unavailable is False:
             self.dispatch("guild_available", guild)
@@ -1531,9 +2048,8 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: deque[Message] | None = deque(
-                (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
-            )
+            for msg in [msg for msg in self._messages.values() if msg.guild == guild]:
+                self._messages.pop(msg.id, None)
 
         self._remove_guild(guild)
         self.dispatch("guild_remove", guild)
@@ -1599,6 +2115,7 @@ class ConnectionState:
             if role is not None:
                 old_role = copy.copy(role)
                 role._update(role_data)
+                guild._invalidate_caches()
                 self.dispatch("guild_role_update", old_role, role)
         else:
             _log.debug(
@@ -1710,8 +2227,23 @@ class ConnectionState:
                 if member is not None:
                     member._presence_update(presence, user)
 
-        complete = data.get("chunk_index", 0) + 1 == data.get("chunk_count")
-        self.process_chunk_requests(guild_id, data.get("nonce"), members, complete)
+        chunk_count = data.get("chunk_count")
+        complete = data.get("chunk_index", 0) + 1 == chunk_count
+        request = self.process_chunk_requests(
+            guild_id, data.get("nonce"), members, complete, chunk_count=chunk_count
+        )
+        # only requests for all members have an expected member count
+        if request is not None and request.expected is not None:
+            progress = request.progress(guild)
+            _log.debug(
+                "Chunking guild ID %s: %d/%s chunks, %d/%s members, ETA %.1fs.",
+                guild_id,
+                progress.chunks_received,
+                progress.chunk_count,
+                progress.members_received,
+                progress.member_count,
+                progress.eta or 0.0,
+            )
 
     def parse_guild_integrations_update(self, data: gateway.GuildIntegrationsUpdateEvent) -> None:
         guild = self._get_guild(int(data["guild_id"]))
@@ -1838,10 +2370,12 @@ class ConnectionState:
 
             member, before, after = guild._update_voice_state(data, channel_id)
             if member is not None:
+                self._touch_member(guild.id, member.id)
                 if flags.voice:
                     if channel_id is None and flags._voice_only and member.id != self_id:
                         # Only remove from cache if we only have the voice flag enabled
                         guild._remove_member(member)
+                        self._evict_users((member.id,))
                     elif channel_id is not None:
                         guild._add_member(member)
 
@@ -2473,7 +3007,7 @@ class AutoShardedConnectionState(ConnectionState):
     def _update_guild_channel_references(self) -> None:
         if not self._messages:
             return
-        for msg in self._messages:
+        for msg in self._messages.values():
             if not msg.guild:
                 continue
 
@@ -2501,7 +3035,7 @@ class AutoShardedConnectionState(ConnectionState):
                 vc.channel = new_channel  # pyright: ignore[reportAttributeAccessIssue]
 
     def _update_member_references(self) -> None:
-        messages: Sequence[Message] = self._messages or []
+        messages: Iterable[Message] = self._messages.values() if self._messages else ()
         for msg in messages:
             if not msg.guild:
                 continue
@@ -2513,10 +3047,11 @@ class AutoShardedConnectionState(ConnectionState):
             if new_author is not None and new_author is not msg.author:
                 msg.author = new_author
 
-            if msg._interaction is not None and isinstance(msg._interaction.user, Member):
-                new_author = msg.guild.get_member(msg._interaction.user.id)
-                if new_author is not None and new_author is not msg._interaction.user:
-                    msg._interaction.user = new_author
+            interaction = msg._decoded_interaction
+            if interaction is not None and isinstance(interaction.user, Member):
+                new_author = msg.guild.get_member(interaction.user.id)
+                if new_author is not None and new_author is not interaction.user:
+                    interaction.user = new_author
 
     async def chunker(
         self,
@@ -2535,9 +3070,7 @@ class AutoShardedConnectionState(ConnectionState):
 
     async def _delay_ready(self) -> None:
         await self.shards_launched.wait()
-        processed: list[tuple[Guild, asyncio.Future[list[Member]]]] = []
-        max_concurrency = len(self.shard_ids) * 2
-        current_bucket = []
+        processed: list[tuple[Guild, asyncio.Task[None] | None]] = []
         while True:
             # this snippet of code is basically waiting N seconds
             # until the last GUILD_CREATE was sent
@@ -2548,60 +3081,36 @@ class AutoShardedConnectionState(ConnectionState):
             except asyncio.TimeoutError:
                 break
             else:
-                future: asyncio.Future[list[Member]]
+                task: asyncio.Task[None] | None = None
                 if self._guild_needs_chunking(guild):
                     _log.debug(
                         "Guild ID %d requires chunking, will be done in the background.", guild.id
                     )
-                    if len(current_bucket) >= max_concurrency:
-                        try:
-                            await utils.sane_wait_for(
-                                current_bucket, timeout=max_concurrency * 70.0
-                            )
-                        except asyncio.TimeoutError:
-                            fmt = "Shard ID %s failed to wait for chunks from a sub-bucket with length %d"
-                            _log.warning(fmt, guild.shard_id, len(current_bucket))
-                        finally:
-                            current_bucket = []
-
-                    # Chunk the guild in the background while we wait for GUILD_CREATE streaming
-                    future = asyncio.ensure_future(self.chunk_guild(guild))
-                    current_bucket.append(future)
-                else:
-                    future = self.loop.create_future()
-                    future.set_result([])
+                    # Chunk the guild in the background while we wait for GUILD_CREATE streaming;
+                    # guilds are chunked concurrently (see `ChunkScheduler`),
+                    # and their events are dispatched as soon as they're chunked
+                    task = asyncio.create_task(self._chunk_and_dispatch(guild, guild.unavailable))
 
-                processed.append((guild, future))
+                processed.append((guild, task))
 
         # update references once the guild cache is repopulated
         self._update_guild_channel_references()
 
         guilds = sorted(processed, key=lambda g: g[0].shard_id)
         for shard_id, info in itertools.groupby(guilds, key=lambda g: g[0].shard_id):
-            # this is equivalent to `children, futures = zip(*info)`, but typed properly
-            children: list[Guild] = []
-            futures: list[asyncio.Future[list[Member]]] = []
-            for c, f in info:
-                children.append(c)
-                futures.append(f)
-
-            # 110 reqs/minute w/ 1 req/guild plus some buffer
-            timeout = 61 * (len(children) / 110)
-            try:
-                await utils.sane_wait_for(futures, timeout=timeout)
-            except asyncio.TimeoutError:
-                _log.warning(
-                    "Shard ID %s failed to wait for chunks (timeout=%.2f) for %d guilds",
-                    shard_id,
-                    timeout,
-                    len(guilds),
-                )
-            for guild in children:
-                if guild.unavailable is False:
+            tasks: list[asyncio.Task[None]] = []
+            for guild, task in info:
+                if task is not None:
+                    tasks.append(task)
+                elif guild.unavailable is False:
                     self.dispatch("guild_available", guild)
                 else:
                     self.dispatch("guild_join", guild)
 
+            # each task is bounded by a timeout based on the guild's member count
+            if tasks:
+                await asyncio.gather(*tasks)
+
             self.dispatch("shard_ready", shard_id)
 
         # remove the state
@@ -2627,6 +3136,14 @@ class AutoShardedConnectionState(ConnectionState):
         if not hasattr(self, "_ready_state"):
             self._ready_state = asyncio.Queue()
 
+        shard_id: int = data["__shard_id__"]  # pyright: ignore[reportGeneralTypeIssues]  # set in websocket receive
+        if shard_id in self._pending_resumes:
+            # failed to resume the session of a previous process, discard any guilds
+            # of this shard that were restored from a cache snapshot
+            self._pending_resumes.discard(shard_id)
+            for guild in [g for g in self._guilds.values() if g.shard_id == shard_id]:
+                self._remove_guild(guild)
+
         self.user = user = ClientUser(state=self, data=data["user"])
         # self._users is a list of Users, we're setting a ClientUser
         self._users[user.id] = user  # pyright: ignore[reportArgumentType]
@@ -2644,12 +3161,26 @@ class AutoShardedConnectionState(ConnectionState):
             self._add_guild_from_data(guild_data)
 
         self.dispatch("connect")
-        self.dispatch("shard_connect", data["__shard_id__"])  # pyright: ignore[reportGeneralTypeIssues]  # set in websocket receive
+        self.dispatch("shard_connect", shard_id)
         self.call_handlers("connect_internal")
 
         if self._ready_task is None:
             self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data: gateway.ResumedEvent) -> None:
+        shard_id: int = data["__shard_id__"]  # pyright: ignore[reportGeneralTypeIssues]  # set in websocket receive
+        if shard_id in self._pending_resumes:
+            # resumed a session of a previous process, see `ConnectionState.parse_resumed`
+            self._pending_resumes.discard(shard_id)
+            self.dispatch("connect")
+            self.dispatch("shard_connect", shard_id)
+            self.call_handlers("connect_internal")
+            self.dispatch("shard_ready", shard_id)
+
+            # if no other shards had to start a new session, dispatch ready once all are resumed
+            if not self._pending_resumes and not hasattr(self, "_ready_state"):
+                self.call_handlers("ready")
+                self.dispatch("ready")
+
         self.dispatch("resumed")
-        self.dispatch("shard_resumed", data["__shard_id__"])  # pyright: ignore[reportGeneralTypeIssues]  # set in websocket receive
+        self.dispatch("shard_resumed", shard_id)
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     import datetime
 
     from .asset import AssetBytes
+    from .cache import CacheBackends
     from .flags import MemberCacheFlags
     from .state import ConnectionState
     from .types.emoji import Emoji as EmojiPayload
@@ -49,6 +50,10 @@ class _PartialTemplateState:
     def member_cache_flags(self) -> MemberCacheFlags:
         return self.__state.member_cache_flags
 
+    @property
+    def cache_backends(self) -> CacheBackends:
+        return self.__state.cache_backends
+
     def store_emoji(self, guild: Guild, data: EmojiPayload) -> None:
         return None
 
@@ -645,7 +645,7 @@ class User(BaseUser, disnake.abc.Messageable):
 
         .. versionadded:: 1.7
         """
-        return [guild for guild in self._state._guilds.values() if guild.get_member(self.id)]
+        return self._state._get_mutual_guilds(self.id)
 
     async def create_dm(self) -> DMChannel:
         """|coro|
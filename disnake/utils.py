@@ -7,6 +7,7 @@ import asyncio
 import datetime
 import functools
 import inspect
+import itertools
 import json
 import os
 import pkgutil
@@ -33,6 +34,7 @@ from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
+    ClassVar,
     ForwardRef,
     Generic,
     Literal,
@@ -236,6 +238,39 @@ class SequenceProxy(Sequence[T_co]):
         return self.__proxied.count(value)
 
 
+class _MappingValuesProxy(Sequence[T_co]):
+    # Read-only sequence view of the values of a mapping, in iteration order,
+    # which avoids copying the values. Indexing is linear.
+
+    __slots__ = ("__mapping",)
+
+    def __init__(self, mapping: Mapping[Any, T_co]) -> None:
+        self.__mapping = mapping
+
+    @overload
+    def __getitem__(self, idx: int) -> T_co: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[T_co]: ...
+
+    def __getitem__(self, idx: int | slice) -> T_co | list[T_co]:
+        if isinstance(idx, slice):
+            return list(self.__mapping.values())[idx]
+        length = len(self.__mapping)
+        if idx < 0:
+            idx += length
+        if not 0 <= idx < length:
+            msg = "index out of range"
+            raise IndexError(msg)
+        return next(itertools.islice(self.__mapping.values(), idx, None))
+
+    def __len__(self) -> int:
+        return len(self.__mapping)
+
+    def __iter__(self) -> Iterator[T_co]:
+        return iter(self.__mapping.values())
+
+
 @overload
 def parse_time(timestamp: None) -> None: ...
 
@@ -735,6 +770,44 @@ class SnowflakeList(array.array):
         return i != len(self) and self[i] == element
 
 
+class Histogram:
+    """Internal class to count observed values (usually durations in seconds) in buckets.
+
+    Each bucket counts the values less than or equal to its upper bound,
+    and values greater than the last bound are counted in an additional bucket.
+    """
+
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    DEFAULT_BOUNDS: ClassVar[tuple[float, ...]] = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS) -> None:
+        self.bounds: Sequence[float] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def __repr__(self) -> str:
+        return f"<Histogram count={self.count} sum={self.sum}>"
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
 _IS_ASCII = re.compile(r"^[\x00-\x7f]+$")
 
 
@@ -317,6 +317,7 @@ html_context = {
     "discord_extensions": [
         ("disnake.ext.commands", "ext/commands"),
         ("disnake.ext.tasks", "ext/tasks"),
+        ("disnake.ext.metrics", "ext/metrics"),
     ],
     "READTHEDOCS": _IS_READTHEDOCS,
 }
@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: MIT
+
+"""Measures the memory used per cached member, with compact members and a presence store.
+
+python -m scripts.benchmarks.member_memory [--members 100000] [--roles 20]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Any
+
+import disnake
+from disnake.cache import CacheBackends, PresenceStore
+
+
+def _guild_data(roles: int) -> dict[str, Any]:
+    return {
+        "id": "1",
+        "name": "guild",
+        "owner_id": "1",
+        "member_count": 0,
+        "roles": [
+            {
+                "id": str(i),
+                "name": f"role {i}",
+                "permissions": "0",
+                "position": i,
+                "color": 0,
+                "colors": {"primary_color": 0, "secondary_color": None, "tertiary_color": None},
+            }
+            for i in range(1, roles + 1)
+        ],
+        "channels": [],
+    }
+
+
+def _member_data(member_id: int, roles: int, rng: random.Random) -> dict[str, Any]:
+    # most members have no roles, and others usually have one of a few common combinations
+    role_count = rng.choice((0, 0, 0, 1, 1, 2))
+    role_ids = sorted(rng.sample(range(2, roles + 2), min(role_count, roles)))
+    return {
+        "user": {
+            "id": str(member_id),
+            "username": f"user{member_id}",
+            "discriminator": "0",
+            "global_name": None,
+            "avatar": f"{member_id:032x}" if rng.random() < 0.7 else None,
+        },
+        "roles": [str(r) for r in role_ids],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "nick": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def _presence_data(member_id: int, rng: random.Random) -> dict[str, Any]:
+    # most activities are one of a few popular games or custom statuses, but timestamps
+    # are different for every member, and some members listen to a specific track on spotify
+    created_at = 1_700_000_000_000 + rng.randrange(10**9)
+    game = rng.randrange(50)
+    activities: list[dict[str, Any]] = [
+        {
+            "type": 0,
+            "name": f"game {game}",
+            "application_id": str(1000 + game),
+            "created_at": created_at,
+            "timestamps": {"start": created_at - rng.randrange(10**7)},
+        }
+    ]
+    if rng.random() < 0.3:
+        activities.append(
+            {
+                "type": 4,
+                "name": "Custom Status",
+                "state": f"status {rng.randrange(20)}",
+                "created_at": created_at,
+            }
+        )
+    if rng.random() < 0.1:
+        track = rng.randrange(1000)
+        activities.append(
+            {
+                "type": 2,
+                "name": "Spotify",
+                "id": "spotify:1",
+                "sync_id": f"track{track}",
+                "session_id": f"{member_id:032x}",
+                "party": {"id": f"spotify:{member_id}"},
+                "details": f"song {track}",
+                "state": f"artist {track % 100}",
+                "assets": {"large_image": f"spotify:{track:040x}", "large_text": "album"},
+                "timestamps": {"start": created_at, "end": created_at + 200_000},
+                "created_at": created_at,
+                "flags": 48,
+            }
+        )
+    return {
+        "user": {"id": str(member_id)},
+        "status": "online",
+        "client_status": {"desktop": "online"},
+        "activities": activities,
+    }
+
+
+def measure(count: int, roles: int, *, compact: bool, presences: bool = False) -> float:
+    client = disnake.Client(
+        intents=disnake.Intents.all(),
+        cache_backends=CacheBackends(
+            compact_members=compact, presences=PresenceStore() if presences else None
+        ),
+    )
+    state = client._connection
+    guild = disnake.Guild(data=_guild_data(roles), state=state)  # pyright: ignore[reportArgumentType]
+    rng = random.Random(0)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # payloads are created while tracing, since lazy activities keep parts of them alive
+    for i in range(2, count + 2):
+        data, presence = _member_data(i, roles, rng), _presence_data(i, rng)
+        member = disnake.Member(data=data, guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+        member._presence_update(presence, presence["user"])  # pyright: ignore[reportArgumentType]
+        guild._add_member(member)
+    del data, presence, member
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(guild._members) == count
+    return (after - before) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=100_000, help="number of members")
+    parser.add_argument("--roles", type=int, default=20, help="number of roles in the guild")
+    args = parser.parse_args()
+
+    regular = measure(args.members, args.roles, compact=False)
+    print(f"regular:    {regular:>8.1f} bytes/member")
+    for name, compact, presences in (
+        ("compact", True, False),
+        ("presences", False, True),
+        ("both", True, True),
+    ):
+        result = measure(args.members, args.roles, compact=compact, presences=presences)
+        print(
+            f"{name + ':':<11} {result:>8.1f} bytes/member ({(1 - result / regular) * 100:.1f}% less)"
+        )
+
+
+if __name__ == "__main__":
+    main()
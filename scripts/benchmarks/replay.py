@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: MIT
+
+"""Replays a gateway recording and reports parse throughput.
+
+Create a recording by passing a `disnake.GatewayRecorder` to the client, then run:
+
+    python -m scripts.benchmarks.replay path/to/recording.bin [--trace-memory]
+"""
+
+import argparse
+import asyncio
+
+import disnake
+
+
+async def run(args: argparse.Namespace) -> disnake.ReplayStats:
+    client = disnake.Client(
+        intents=disnake.Intents.all(),
+        max_messages=args.max_messages,
+        chunk_guilds_at_startup=False,
+        cache_backends=disnake.CacheBackends(lazy_messages=args.lazy_messages),
+    )
+    replay = disnake.GatewayReplay(args.path)
+    try:
+        return await replay.run(client, speed=args.speed, trace_memory=args.trace_memory)
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="path to the gateway recording")
+    parser.add_argument(
+        "--speed", type=float, default=None, help="replay speed relative to real time"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="measure memory allocated per event type"
+    )
+    parser.add_argument("--max-messages", type=int, default=1000, help="message cache size")
+    parser.add_argument(
+        "--lazy-messages", action="store_true", help="decode message sub-objects on access"
+    )
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args))
+
+    print(f"frames:         {stats.frames}")
+    print(f"events:         {stats.events}")
+    print(f"duration:       {stats.duration:.3f}s")
+    print(f"parse time:     {stats.parse_time:.3f}s")
+    print(f"events/second:  {stats.events_per_second:.1f}")
+    print()
+
+    memory = stats.memory_per_event()
+    print(f"{'event':<40} {'count':>8} {'total ms':>10} {'us/event':>10} {'bytes/event':>12}")
+    for event, count in sorted(stats.event_counts.items(), key=lambda e: -stats.event_times[e[0]]):
+        total = stats.event_times[event]
+        per_event = memory.get(event)
+        print(
+            f"{event:<40} {count:>8} {total * 1000:>10.2f} {total / count * 1e6:>10.2f} "
+            f"{'-' if per_event is None else f'{per_event:.0f}':>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+
+"""Compares the default weakref-based user cache with the strong-reference UserCache.
+
+python -m scripts.benchmarks.user_cache [--users 100000] [--lookups 1000000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from typing import Any
+
+import disnake
+from disnake.cache import CacheBackends, UserCache
+
+
+def _user_data(user_id: int) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def measure(users: int, lookups: int, backends: CacheBackends) -> tuple[float, float, float]:
+    client = disnake.Client(intents=disnake.Intents.all(), cache_backends=backends)
+    state = client._connection
+    payloads = [_user_data(i) for i in range(users)]
+    # keep users alive, like cached members would
+    keep = []
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep.extend(state.store_user(data) for data in payloads)  # pyright: ignore[reportArgumentType]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    memory = (after - before) / users
+
+    # the minimum of several runs is the most stable measure here
+    ids = [i % users for i in range(lookups)]
+    get_user = min(
+        timeit.repeat(lambda: [state.get_user(user_id) for user_id in ids], number=1, repeat=5)
+    )
+
+    hits = [payloads[i] for i in ids]
+    store_user = min(
+        timeit.repeat(lambda: [state.store_user(data) for data in hits], number=1, repeat=5)  # pyright: ignore[reportArgumentType]
+    )
+
+    assert len(state._users) == users
+    return memory, get_user / lookups, store_user / lookups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000, help="number of cached users")
+    parser.add_argument("--lookups", type=int, default=1_000_000, help="number of lookups")
+    args = parser.parse_args()
+
+    for name, backends in (
+        ("WeakValueDictionary", CacheBackends()),
+        ("UserCache", CacheBackends(users=lambda: UserCache(args.users))),
+    ):
+        memory, get_user, store_user = measure(args.users, args.lookups, backends)
+        print(
+            f"{name:<20} {memory:>8.1f} bytes/user"
+            f"  get_user: {get_user * 1e9:>6.1f} ns"
+            f"  store_user (hit): {store_user * 1e9:>6.1f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: MIT
+
+from unittest import mock
+
+import pytest
+
+import disnake
+from disnake.ext.metrics import Metrics
+from disnake.gateway import GatewayStats
+
+
+@pytest.fixture
+def client() -> disnake.Client:
+    client = disnake.Client()
+    stats = client._connection._gateway_stats[0] = GatewayStats()
+    stats.record("MESSAGE_CREATE", 100)
+    stats.record("MESSAGE_CREATE", 50)
+    stats.record(None, 10)
+
+    http = client.http._stats
+    http.record_response("GET /users/@me", 200, 0.2)
+    http.record_response("POST /channels/{channel_id}/messages", 429, 0.1)
+    http.record_ratelimit("abcd")
+    http.record_retry("POST /channels/{channel_id}/messages", "ratelimited")
+    return client
+
+
+def _samples(text: str) -> dict[str, str]:
+    return dict(
+        line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#")
+    )
+
+
+@pytest.mark.asyncio
+async def test_collect(client: disnake.Client) -> None:
+    metrics = Metrics(client)
+
+    async def on_test() -> None: ...
+
+    await client._run_event(on_test, "on_test")
+
+    text = metrics.collect()
+    samples = _samples(text)
+    assert samples['disnake_gateway_latency_seconds{shard="0"}'] == "NaN"
+    assert samples['disnake_gateway_events_total{shard="0",event="MESSAGE_CREATE"}'] == "2"
+    assert samples['disnake_gateway_frames_total{shard="0"}'] == "3"
+    assert samples['disnake_gateway_received_bytes_total{shard="0"}'] == "160"
+    assert (
+        samples['disnake_http_request_duration_seconds_bucket{route="GET /users/@me",le="0.1"}']
+        == "0"
+    )
+    assert (
+        samples['disnake_http_request_duration_seconds_bucket{route="GET /users/@me",le="0.25"}']
+        == "1"
+    )
+    assert (
+        samples['disnake_http_request_duration_seconds_bucket{route="GET /users/@me",le="+Inf"}']
+        == "1"
+    )
+    assert samples['disnake_http_request_duration_seconds_count{route="GET /users/@me"}'] == "1"
+    assert samples['disnake_http_ratelimited_total{bucket="abcd"}'] == "1"
+    assert (
+        samples[
+            'disnake_http_retries_total{route="POST /channels/{channel_id}/messages",reason="ratelimited"}'
+        ]
+        == "1"
+    )
+    assert (
+        samples[
+            'disnake_event_handler_duration_seconds_count{event="on_test",handler="test_collect.<locals>.on_test"}'
+        ]
+        == "1"
+    )
+    assert samples['disnake_tasks{kind="other"}'] == "1"
+    assert samples['disnake_cache_entries{cache="guilds"}'] == "0"
+
+    assert "# TYPE disnake_gateway_events_total counter" in text
+    assert not text.endswith("# EOF\n")
+
+
+def test_openmetrics(client: disnake.Client) -> None:
+    text = Metrics(client, handler_durations=False, cache=False).collect(openmetrics=True)
+    assert "# TYPE disnake_gateway_events counter" in text
+    assert 'disnake_gateway_events_total{shard="0",event="MESSAGE_CREATE"} 2' in text
+    assert "event_handler" not in text.replace('kind="event_handler"', "")
+    assert "cache_entries" not in text
+    assert client.handler_profiler is None
+    assert text.endswith("# EOF\n")
+
+
+def test_escape(client: disnake.Client) -> None:
+    client.http._stats.record_ratelimit('a"b\\c')
+    text = Metrics(client).collect()
+    assert r'disnake_http_ratelimited_total{bucket="a\"b\\c"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_handle(client: disnake.Client) -> None:
+    metrics = Metrics(client)
+    request = mock.Mock(headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+    response = await metrics._handle(request)
+    assert response.content_type == "application/openmetrics-text"
+    assert response.body.endswith(b"# EOF\n")  # pyright: ignore[reportOptionalMemberAccess]
+
+    response = await metrics._handle(mock.Mock(headers={}))
+    assert response.content_type == "text/plain"
@@ -0,0 +1,513 @@
+# SPDX-License-Identifier: MIT
+
+import gc
+import weakref
+from typing import Any
+from unittest import mock
+
+import pytest
+
+import disnake
+from disnake.activity import create_activity
+from disnake.cache import (
+    CacheBackends,
+    LRUCache,
+    MemberCachePolicy,
+    PresenceStore,
+    TTLCache,
+    UserCache,
+    _get_slot_descriptors,
+)
+
+
+class TestLRUCache:
+    def test_evict(self) -> None:
+        cache: LRUCache[str] = LRUCache(2)
+        cache[1] = "a"
+        cache[2] = "b"
+        assert cache.get(1) == "a"
+
+        cache[3] = "c"
+        assert list(cache) == [1, 3]
+        assert 2 not in cache
+        assert len(cache) == 2
+
+    def test_values(self) -> None:
+        cache: LRUCache[str] = LRUCache(2)
+        cache[1] = "a"
+        cache[2] = "b"
+        # iterating shouldn't affect the order
+        assert list(cache.values()) == ["a", "b"]
+        assert list(cache.items()) == [(1, "a"), (2, "b")]
+
+    def test_contains(self) -> None:
+        cache: LRUCache[str] = LRUCache(2)
+        cache[1] = "a"
+        cache[2] = "b"
+        # membership tests shouldn't affect the order
+        assert 1 in cache
+        cache[3] = "c"
+        assert list(cache) == [2, 3]
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="maxsize"):
+            LRUCache(0)
+
+
+class TestTTLCache:
+    def test_expire(self) -> None:
+        cache: TTLCache[str] = TTLCache(10)
+        with mock.patch("time.monotonic", return_value=100):
+            cache[1] = "a"
+        with mock.patch("time.monotonic", return_value=105):
+            cache[2] = "b"
+            assert cache[1] == "a"
+
+        with mock.patch("time.monotonic", return_value=111):
+            assert 1 not in cache
+            assert cache.get(1) is None
+            assert cache[2] == "b"
+            assert list(cache) == [2]
+
+        with mock.patch("time.monotonic", return_value=120):
+            assert len(cache) == 0
+
+    def test_maxsize(self) -> None:
+        cache: TTLCache[str] = TTLCache(10, maxsize=1)
+        cache[1] = "a"
+        cache[2] = "b"
+        assert list(cache) == [2]
+
+
+class TestUserCache:
+    def test_evict_unreferenced(self) -> None:
+        client = disnake.Client(
+            intents=disnake.Intents.all(), cache_backends=CacheBackends(users=lambda: UserCache(10))
+        )
+        state = client._connection
+        a = disnake.Guild(data={"id": "1", "name": "a"}, state=state)  # pyright: ignore[reportArgumentType]
+        b = disnake.Guild(data={"id": "2", "name": "b"}, state=state)  # pyright: ignore[reportArgumentType]
+        state._add_guild(a)
+        state._add_guild(b)
+        for guild, user_id in ((a, 10), (a, 11), (b, 11)):
+            member = disnake.Member(data=_member_data(user_id, []), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+            guild._add_member(member)
+        assert set(state._users) == {10, 11}
+
+        # 11 is still a member of guild b
+        a._remove_member(disnake.Object(10))
+        a._remove_member(disnake.Object(11))
+        state._evict_users((10, 11))
+        assert list(state._users) == [11]
+
+        state._remove_guild(b)
+        assert not state._users
+
+
+def _make_member(member_id: int, voice_states: dict[int, object]) -> mock.Mock:
+    return mock.Mock(
+        id=member_id, _state=mock.Mock(self_id=1), guild=mock.Mock(_voice_states=voice_states)
+    )
+
+
+class TestMemberCachePolicy:
+    def test_max_size(self) -> None:
+        voice_states: dict[int, object] = {}
+        cache = MemberCachePolicy(max_size=3)()
+        for member_id in range(1, 4):
+            cache[member_id] = _make_member(member_id, voice_states)
+        voice_states[2] = object()
+
+        # 1 is the client's own member, 2 is in a voice channel
+        cache[4] = _make_member(4, voice_states)
+        assert list(cache) == [4, 1, 2]
+
+        cache.touch(1)
+        cache[5] = _make_member(5, voice_states)
+        assert list(cache) == [2, 1, 5]
+        assert len(cache) == 3
+
+    def test_ttl(self) -> None:
+        cache = MemberCachePolicy(ttl=10)()
+        voice_states: dict[int, object] = {}
+        with mock.patch("time.monotonic", return_value=100):
+            for member_id in range(1, 4):
+                cache[member_id] = _make_member(member_id, voice_states)
+        with mock.patch("time.monotonic", return_value=105):
+            cache.touch(3)
+
+        with mock.patch("time.monotonic", return_value=111):
+            assert cache.get(1) is not None
+            assert cache.get(2) is None
+            cache[4] = _make_member(4, voice_states)
+        assert list(cache) == [3, 4, 1]
+
+    def test_touch_member(self) -> None:
+        policy = MemberCachePolicy(max_size=10)
+        client = disnake.Client(cache_backends=CacheBackends(members=policy))
+        state = client._connection
+        assert state._member_cache_policy is policy
+
+        guild = mock.Mock()
+        with mock.patch.object(state, "_get_guild", return_value=guild):
+            state._touch_member(1, 2)
+        guild._members.touch.assert_called_once_with(2)
+
+
+class TestCacheBackends:
+    def test_default(self) -> None:
+        state = disnake.Client(max_messages=2)._connection
+        assert isinstance(state._users, weakref.WeakValueDictionary)
+        assert type(state._guilds) is dict
+
+        # messages are evicted in insertion order, regardless of access
+        messages = state._messages
+        assert messages is not None
+        for i in range(3):
+            messages[i] = mock.Mock(id=i)
+            state._get_message(min(messages))
+        assert list(messages) == [1, 2]
+
+    def test_cached_messages(self) -> None:
+        client = disnake.Client(max_messages=3)
+        messages = client._connection._messages
+        assert messages is not None
+        view = client.cached_messages
+        for i in range(4):
+            messages[i] = mock.Mock(id=i)
+
+        assert [m.id for m in view] == [1, 2, 3]
+        assert view[0].id == 1
+        assert view[-1].id == 3
+        assert [m.id for m in view[1:]] == [2, 3]
+        with pytest.raises(IndexError):
+            view[3]
+        assert client.get_message(2) is messages[2]
+        assert client.get_message(0) is None
+
+    def test_disabled_messages(self) -> None:
+        client = disnake.Client(
+            max_messages=None, cache_backends=CacheBackends(messages=lambda: LRUCache(5))
+        )
+        assert client._connection._messages is None
+        assert not client.cached_messages
+
+    def test_custom(self) -> None:
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=CacheBackends(users=lambda: LRUCache(1), guilds=lambda: TTLCache(60)),
+        )
+        state = client._connection
+        assert isinstance(state._users, LRUCache)
+        assert isinstance(state._guilds, TTLCache)
+
+        for user_id in (1, 2):
+            state.store_user(
+                {"id": str(user_id), "username": "user", "discriminator": "0", "avatar": None}  # pyright: ignore[reportArgumentType]
+            )
+        assert [u.id for u in client.users] == [2]
+
+        # caches are recreated when clearing the state
+        cache = state._users
+        state.clear()
+        assert isinstance(state._users, LRUCache)
+        assert state._users is not cache
+
+    def test_invalid(self) -> None:
+        with pytest.raises(TypeError, match="must be callable"):
+            CacheBackends(users={})  # pyright: ignore[reportArgumentType]
+        with pytest.raises(TypeError, match="must be CacheBackends"):
+            disnake.Client(cache_backends={})  # pyright: ignore[reportArgumentType]
+
+
+def _member_data(member_id: int, roles: list[str]) -> dict:
+    return {
+        "user": {
+            "id": str(member_id),
+            "username": f"user{member_id}",
+            "discriminator": "0",
+            "avatar": None,
+        },
+        "roles": roles,
+        "joined_at": None,
+        "deaf": False,
+        "mute": False,
+    }
+
+
+class TestCompactMembers:
+    def _make(self) -> tuple[disnake.Guild, disnake.state.ConnectionState]:
+        client = disnake.Client(
+            intents=disnake.Intents.all(), cache_backends=CacheBackends(compact_members=True)
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        return guild, state
+
+    def test_shared(self) -> None:
+        guild, state = self._make()
+        a, b, c = (
+            disnake.Member(data=_member_data(i, roles), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+            for i, roles in ((2, ["20", "10"]), (3, ["10", "20"]), (4, ["10"]))
+        )
+        assert a._roles is b._roles
+        assert a._roles is not c._roles
+        assert a._client_status is b._client_status
+
+        # changing the status shouldn't affect other members
+        a.status = disnake.Status.online
+        assert a.status is disnake.Status.online
+        assert b.status is disnake.Status.offline
+
+    def test_prune_roles(self) -> None:
+        guild, state = self._make()
+        member = disnake.Member(data=_member_data(2, ["10"]), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+        other = disnake.Member(data=_member_data(3, ["20"]), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+        assert len(state._role_sets) == 2
+
+        # role lists are dropped once no member references them anymore
+        del other
+        gc.collect()
+        assert list(state._role_sets.values()) == [member._roles]
+
+    def test_lazy_activities(self) -> None:
+        guild, state = self._make()
+        member = disnake.Member(data=_member_data(2, []), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+        member._presence_update(
+            {"status": "idle", "activities": [{"type": 0, "name": "game"}]},  # pyright: ignore[reportArgumentType]
+            {"id": "2"},  # pyright: ignore[reportArgumentType]
+        )
+        assert isinstance(member._activities, list)
+        assert member.status is disnake.Status.idle
+
+        activities = member.activities
+        assert isinstance(activities[0], disnake.Game)
+        assert member.activities is activities
+
+
+class TestPresenceStore:
+    def test_shared(self) -> None:
+        store = PresenceStore(max_size=2)
+        client = disnake.Client(
+            intents=disnake.Intents.all(), cache_backends=CacheBackends(presences=store)
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        a, b = (
+            disnake.Member(data=_member_data(i, []), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+            for i in (2, 3)
+        )
+        for member in (a, b):
+            # per-member fields don't prevent sharing
+            presence = {
+                "status": "online",
+                "client_status": {"desktop": "online"},
+                "activities": [
+                    {
+                        "type": 0,
+                        "name": "game",
+                        "created_at": member.id,
+                        "timestamps": {"start": 1},
+                    },
+                    {"type": 4, "name": "Custom Status", "created_at": member.id},
+                ],
+            }
+            member._presence_update(presence, {"id": str(member.id)})  # pyright: ignore[reportArgumentType]
+
+        assert isinstance(a.activities[0], disnake.Game)
+        assert all(
+            x is not y and x.name is y.name for x, y in zip(a.activities, b.activities, strict=True)
+        )
+        # ... and are still available for each member
+        assert a.activities[0].created_at.timestamp() == 0.002  # pyright: ignore[reportOptionalMemberAccess]
+        assert b.activities[1].created_at.timestamp() == 0.003  # pyright: ignore[reportOptionalMemberAccess]
+        assert a.activities[0].start.timestamp() == 0.001  # pyright: ignore[reportOptionalMemberAccess]
+        assert a._client_status is b._client_status
+        assert b.status is disnake.Status.online
+        assert b.desktop_status is disnake.Status.online
+        assert (store.hits, store.misses) == (2, 2)
+
+        # the least recently seen activity is evicted, but still kept by existing members
+        b._presence_update(
+            {"status": "idle", "activities": [{"type": 0, "name": "other game"}]},  # pyright: ignore[reportArgumentType]
+            {"id": "3"},  # pyright: ignore[reportArgumentType]
+        )
+        assert len(store) == 2
+        assert a.activity.name == "game"  # pyright: ignore[reportOptionalMemberAccess]
+        assert b.status is disnake.Status.idle
+        assert a.status is disnake.Status.online
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"type": 0, "name": "game"},
+            {"type": 0, "name": "game", "created_at": 1, "timestamps": {"start": 2, "end": 3}},
+            {
+                "type": 0,
+                "name": "game",
+                "application_id": "4",
+                "details": "details",
+                "state": "state",
+                "assets": {"large_image": "image"},
+                "id": "abc",
+                "created_at": 1,
+            },
+            {"type": 4, "name": "Custom Status", "state": "hi", "emoji": {"name": "x"}, "id": "c"},
+            {"type": 1, "name": "Twitch", "url": "https://twitch.tv/x", "created_at": 1},
+        ],
+    )
+    def test_unchanged(self, data: dict[str, Any]) -> None:
+        # activities from the store are the same as without the store
+        state = disnake.Client(
+            intents=disnake.Intents.all(), cache_backends=CacheBackends(presences=PresenceStore())
+        )._connection
+        store = state._presence_store
+        assert store is not None
+        store._get_activities([{**data, "created_at": 1000}], state)  # pyright: ignore[reportArgumentType]
+
+        (activity,) = store._get_activities([data], state)  # pyright: ignore[reportArgumentType]
+        expected = create_activity(data, state=state)  # pyright: ignore[reportArgumentType]
+        assert type(activity) is type(expected)
+        for descriptor in _get_slot_descriptors(type(expected)):
+            assert descriptor.__get__(activity) == descriptor.__get__(expected)
+
+    def test_session(self) -> None:
+        store = PresenceStore()
+        state = disnake.Client(
+            intents=disnake.Intents.all(), cache_backends=CacheBackends(presences=store)
+        )._connection
+        data = {
+            "type": 2,
+            "name": "Spotify",
+            "sync_id": "track",
+            "session_id": "session",
+            "party": {"id": "spotify:2"},
+        }
+        (x,) = store._get_activities([data], state)  # pyright: ignore[reportArgumentType]
+        (y,) = store._get_activities([data], state)  # pyright: ignore[reportArgumentType]
+        assert isinstance(x, disnake.Spotify)
+        assert x is not y
+        assert len(store) == 0
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="max_size"):
+            PresenceStore(max_size=0)
+        with pytest.raises(TypeError, match="must be PresenceStore"):
+            CacheBackends(presences=10)  # pyright: ignore[reportArgumentType]
+
+
+class TestUserGuildIndex:
+    def test_mutual_guilds(self) -> None:
+        client = disnake.Client(intents=disnake.Intents.all())
+        state = client._connection
+        a, b, c = (
+            disnake.Guild(data={"id": str(i), "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+            for i in (1, 2, 3)
+        )
+        a._add_member(disnake.Member(data=_member_data(10, []), guild=a, state=state))  # pyright: ignore[reportArgumentType]
+        state._add_guild(a)
+        state._add_guild(b)
+        state._add_guild(c)
+        for guild in (b, c):
+            guild._add_member(disnake.Member(data=_member_data(10, []), guild=guild, state=state))  # pyright: ignore[reportArgumentType]
+        b._add_member(disnake.Member(data=_member_data(11, []), guild=b, state=state))  # pyright: ignore[reportArgumentType]
+
+        user = state.get_user(10)
+        assert user is not None
+        assert sorted(g.id for g in user.mutual_guilds) == [1, 2, 3]
+        assert sorted(m.guild.id for m in client.get_all_members(user=user)) == [1, 2, 3]
+
+        b._remove_member(user)
+        state._remove_guild(c)
+        assert [g.id for g in user.mutual_guilds] == [1]
+        assert state._user_guilds.get(11) == (2,)
+
+    def test_uncached_guild(self) -> None:
+        state = disnake.Client(intents=disnake.Intents.all())._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        guild._add_member(disnake.Member(data=_member_data(10, []), guild=guild, state=state))  # pyright: ignore[reportArgumentType]
+        assert 10 not in state._user_guilds
+
+    def test_evicted_member(self) -> None:
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=CacheBackends(members=MemberCachePolicy(max_size=1)),
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        state._add_guild(guild)
+        for user_id in (10, 11):
+            guild._add_member(
+                disnake.Member(data=_member_data(user_id, []), guild=guild, state=state)
+            )  # pyright: ignore[reportArgumentType]
+
+        # evicted members are removed from the index right away
+        assert 10 not in state._user_guilds
+        assert state._get_mutual_guilds(10) == []
+        assert state._get_mutual_guilds(11) == [guild]
+
+    def test_evicted_member_cleanup(self) -> None:
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=CacheBackends(
+                users=lambda: UserCache(100),
+                members=MemberCachePolicy(ttl=10),
+                member_name_index=True,
+            ),
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        state._add_guild(guild)
+        with mock.patch("time.monotonic", return_value=100):
+            guild._add_member(
+                disnake.Member(data=_member_data(10, []), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+            )
+        assert 10 in state._users
+        assert guild._name_index is not None
+        assert len(guild._name_index) == 1
+
+        with mock.patch("time.monotonic", return_value=111):
+            # `in` applies the same expiry as lookups
+            assert 10 not in guild._members
+        assert 10 not in state._user_guilds
+        assert len(guild._name_index) == 0
+        assert 10 not in state._users
+
+
+class TestCacheStats:
+    def test_stats(self) -> None:
+        client = disnake.Client(intents=disnake.Intents.all())
+        state = client._connection
+        guilds = [
+            disnake.Guild(data={"id": str(i), "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+            for i in (1, 2)
+        ]
+        for guild in guilds:
+            state._add_guild(guild)
+        for guild, user_id in ((guilds[0], 10), (guilds[0], 11), (guilds[1], 11)):
+            guild._add_member(
+                disnake.Member(data=_member_data(user_id, []), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+            )
+        assert state._messages is not None
+        state._messages[100] = mock.Mock(guild=guilds[1])
+        client.wait_for("message").close()
+
+        stats = client.cache_stats()
+        assert stats.counts["guilds"] == 2
+        assert stats.counts["members"] == 3
+        assert stats.counts["users"] == 2
+        assert stats.counts["messages"] == 1
+        assert stats.counts["wait_for"] == 1
+        assert stats.counts["views"] == 0
+        assert stats.sizes["members"] > 3 * 100
+        assert stats.sizes["views"] == 0
+        assert stats.size == sum(stats.sizes.values())
+        assert not stats.guilds
+
+        stats = client.cache_stats(per_guild=True)
+        assert stats.guilds[1].counts["members"] == 2
+        assert stats.guilds[1].counts["messages"] == 0
+        assert stats.guilds[2].counts["messages"] == 1
+        assert stats.guilds[1].sizes["members"] == pytest.approx(
+            stats.sizes["members"] * 2 / 3, abs=1
+        )
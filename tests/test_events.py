@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: MIT
+import logging
 from typing import Any
 
 import pytest
@@ -6,6 +7,7 @@ import pytest
 import disnake
 from disnake import Event
 from disnake.ext import commands
+from disnake.gateway import GatewayStats
 
 
 # n.b. the specific choice of events used in this file is irrelevant
@@ -107,3 +109,95 @@ def test_listener__implicit(bot: commands.Bot) -> None:
 
     bot.add_cog(Cog())
     assert len(bot.extra_events["on_automod_rule_update"]) == 1
+
+
+# Client.minimal_intents / Client.intents_report
+
+
+def test_minimal_intents() -> None:
+    client = disnake.Client(intents=disnake.Intents.all())
+    assert client.minimal_intents() == disnake.Intents(guilds=True, members=True, voice_states=True)
+
+    @client.event
+    async def on_typing(*args: Any) -> None: ...
+
+    @client.listen(Event.raw_reaction_add)
+    async def callback(*args: Any) -> None: ...
+
+    coro = client.wait_for("presence_update")
+    coro.close()
+
+    assert client.minimal_intents() == disnake.Intents(
+        guilds=True, members=True, voice_states=True, typing=True, reactions=True, presences=True
+    )
+
+
+def test_minimal_intents__cache_flags() -> None:
+    client = disnake.Client(
+        intents=disnake.Intents.all(),
+        member_cache_flags=disnake.MemberCacheFlags(voice=True, joined=False),
+        chunk_guilds_at_startup=False,
+    )
+    assert client.minimal_intents() == disnake.Intents(guilds=True, voice_states=True)
+
+
+def test_minimal_intents__voice() -> None:
+    # voice states are required for connecting to voice, even if they aren't cached
+    client = disnake.Client(
+        intents=disnake.Intents.all(),
+        member_cache_flags=disnake.MemberCacheFlags(voice=False, joined=False),
+        chunk_guilds_at_startup=False,
+    )
+    assert client.minimal_intents() == disnake.Intents(guilds=True, voice_states=True)
+
+
+def test_minimal_intents__never_adds() -> None:
+    client = disnake.Client(intents=disnake.Intents(guilds=True, guild_messages=True))
+
+    @client.event
+    async def on_message(*args: Any) -> None: ...
+
+    assert client.minimal_intents() == disnake.Intents(guilds=True, guild_messages=True)
+
+
+def test_minimal_intents__bot(bot: commands.Bot) -> None:
+    class Cog(commands.Cog):
+        @commands.Cog.listener()
+        async def on_member_ban(self, *args: Any) -> None: ...
+
+    bot.add_cog(Cog())
+    # prefix commands require messages
+    assert bot.minimal_intents() == disnake.Intents(
+        guilds=True, moderation=True, voice_states=True, messages=True
+    )
+
+
+def test_intents_report() -> None:
+    client = disnake.Client(intents=disnake.Intents(guilds=True, messages=True, typing=True))
+
+    @client.event
+    async def on_message(*args: Any) -> None: ...
+
+    stats = GatewayStats()
+    stats.record("MESSAGE_CREATE", 1000)
+    stats.record("TYPING_START", 100)
+    stats.record("TYPING_START", 100)
+    stats.record("GUILD_CREATE", 10000)
+    stats.record(None, 10)
+    stats.started_at -= 2
+    client._connection._gateway_stats[0] = stats
+
+    report = client.intents_report()
+    assert report.unused == disnake.Intents(typing=True)
+    assert report.events == {"TYPING_START": 2}
+    assert report.events_per_second == pytest.approx(1, rel=0.01)
+    assert report.bytes_per_second == pytest.approx(100, rel=0.01)
+
+
+def test_enforce_minimal_intents(caplog: pytest.LogCaptureFixture) -> None:
+    client = disnake.Client(intents=disnake.Intents.all(), enforce_minimal_intents=True)
+    with caplog.at_level(logging.WARNING, logger="disnake.client"):
+        client._apply_minimal_intents()
+    assert client.intents == disnake.Intents(guilds=True, members=True, voice_states=True)
+    (record,) = caplog.records
+    assert record.message.startswith("Not requesting unused intents: ")
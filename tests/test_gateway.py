@@ -0,0 +1,246 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import disnake
+from disnake import gateway
+from disnake.gateway import GatewayRatelimiter, ResumeState, SessionFile
+
+USER = {
+    "id": "5",
+    "username": "bot",
+    "discriminator": "0",
+    "avatar": None,
+    "global_name": None,
+    "bot": True,
+}
+
+
+@pytest.fixture
+def client() -> disnake.Client:
+    client = disnake.Client()
+    client._connection.user = disnake.ClientUser(state=client._connection, data=USER)  # pyright: ignore[reportArgumentType]
+    return client
+
+
+def _make_ws(shard_id: int | None, session_id: str | None) -> mock.Mock:
+    return mock.Mock(
+        shard_id=shard_id,
+        session_id=session_id,
+        sequence=42,
+        resume_gateway="wss://gateway.discord.gg",
+    )
+
+
+class TestSessionFile:
+    def test_roundtrip(self, client: disnake.Client, tmp_path: Path) -> None:
+        path = tmp_path / "session.json"
+        client._connection.application_id = 1234
+        client._connection.application_flags = disnake.ApplicationFlags(gateway_presence=True)
+
+        store = SessionFile(path, state=client._connection)
+        store.update(_make_ws(None, "abc"))  # pyright: ignore[reportArgumentType]
+        store.save()
+        assert not (tmp_path / "session.json.tmp").exists()
+
+        client2 = disnake.Client()
+        client2._connection.user = client._connection.user
+        store = SessionFile(path, state=client2._connection)
+        assert store.pop(None) == ResumeState("abc", 42, "wss://gateway.discord.gg")
+        assert store.pop(None) is None
+
+        assert client2._connection.application_id == 1234
+        assert client2._connection.application_flags.gateway_presence
+
+    def test_invalidated(self, client: disnake.Client, tmp_path: Path) -> None:
+        path = tmp_path / "session.json"
+        store = SessionFile(path, state=client._connection)
+        store.update(_make_ws(0, "abc"))  # pyright: ignore[reportArgumentType]
+        store.update(_make_ws(1, "def"))  # pyright: ignore[reportArgumentType]
+        store.update(_make_ws(0, None))  # pyright: ignore[reportArgumentType]
+        store.save()
+
+        data = json.loads(path.read_text())
+        assert [s["shard_id"] for s in data["shards"]] == [1]
+
+    @pytest.mark.asyncio
+    async def test_save_async(self, client: disnake.Client, tmp_path: Path) -> None:
+        path = tmp_path / "session.json"
+        store = SessionFile(path, state=client._connection)
+        store.update(_make_ws(None, "abc"))  # pyright: ignore[reportArgumentType]
+        store.save_later()
+        store.update(_make_ws(None, "def"))  # pyright: ignore[reportArgumentType]
+        await store.save_async()
+
+        data = json.loads(path.read_text())
+        assert [s["session_id"] for s in data["shards"]] == ["def"]
+
+        # unchanged states aren't written again
+        store.save_later()
+        assert store._save_task is None
+
+    def test_outdated_write(self, client: disnake.Client, tmp_path: Path) -> None:
+        path = tmp_path / "session.json"
+        store = SessionFile(path, state=client._connection)
+        store.update(_make_ws(None, "abc"))  # pyright: ignore[reportArgumentType]
+        old = store._dump()
+        store.update(_make_ws(None, "def"))  # pyright: ignore[reportArgumentType]
+        store.save()
+        # e.g. a background write that only ran after a newer blocking save
+        store._write(store._generation - 1, old)  # pyright: ignore[reportArgumentType]
+
+        data = json.loads(path.read_text())
+        assert [s["session_id"] for s in data["shards"]] == ["def"]
+
+    def test_missing(self, client: disnake.Client, tmp_path: Path) -> None:
+        store = SessionFile(tmp_path / "session.json", state=client._connection)
+        assert store.pop(None) is None
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            "not json",
+            json.dumps({"v": 1, "user_id": 6, "shard_count": None, "shards": []}),
+            json.dumps({"v": 1, "user_id": 5, "shard_count": 2, "shards": []}),
+            json.dumps({"v": 0, "user_id": 5, "shard_count": None, "shards": []}),
+            json.dumps({"v": 1, "user_id": 5, "shard_count": None, "shards": [{}]}),
+        ],
+    )
+    def test_ignored(self, client: disnake.Client, tmp_path: Path, data: str) -> None:
+        path = tmp_path / "session.json"
+        path.write_text(data)
+
+        store = SessionFile(path, state=client._connection)
+        assert store.pop(None) is None
+
+
+class TestPendingResume:
+    def test_ready(self, client: disnake.Client) -> None:
+        state = client._connection
+        state._pending_resumes.add(None)
+
+        with mock.patch.object(state, "dispatch") as m:
+            state.parse_resumed({"__shard_id__": None})  # pyright: ignore[reportArgumentType]
+
+        assert client.is_ready()
+        assert not state._pending_resumes
+        assert [c.args[0] for c in m.call_args_list] == ["connect", "ready", "resumed"]
+
+    def test_regular(self, client: disnake.Client) -> None:
+        state = client._connection
+
+        with mock.patch.object(state, "dispatch") as m:
+            state.parse_resumed({"__shard_id__": None})  # pyright: ignore[reportArgumentType]
+
+        assert not client.is_ready()
+        assert [c.args[0] for c in m.call_args_list] == ["resumed"]
+
+
+class TestGatewayRatelimiter:
+    @pytest.mark.asyncio
+    async def test_priority(self) -> None:
+        limiter = GatewayRatelimiter(count=2, per=0.05)
+        assert await limiter.block()
+
+        order: list[int] = []
+
+        async def send(priority: int) -> None:
+            await limiter.block(priority)
+            order.append(priority)
+
+        priorities = [
+            gateway._PRIORITY_DEFAULT,
+            gateway._PRIORITY_CHUNKS,
+            gateway._PRIORITY_VOICE,
+            gateway._PRIORITY_CONNECTION,
+        ]
+        tasks = [asyncio.create_task(send(p)) for p in priorities]
+        await asyncio.sleep(0)
+        # first one goes through immediately, since there's still one slot left
+        assert order == [gateway._PRIORITY_DEFAULT]
+        assert limiter.queue_size == 3
+
+        await asyncio.gather(*tasks)
+        assert order == [
+            gateway._PRIORITY_DEFAULT,
+            gateway._PRIORITY_CONNECTION,
+            gateway._PRIORITY_VOICE,
+            gateway._PRIORITY_CHUNKS,
+        ]
+        assert limiter.queue_size == 0
+
+    @pytest.mark.asyncio
+    async def test_coalesce(self) -> None:
+        limiter = GatewayRatelimiter(count=1, per=0.05)
+        assert await limiter.block()
+
+        first = asyncio.create_task(limiter.block(coalesce="presence"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(limiter.block(coalesce="presence"))
+        other = asyncio.create_task(limiter.block())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        # the first update is superseded and shouldn't be sent
+        assert first.done()
+        assert first.result() is False
+        assert limiter.queue_size == 2
+
+        assert await second is True
+        assert await other is True
+        assert not limiter._coalesced
+
+    @pytest.mark.asyncio
+    async def test_cancelled(self) -> None:
+        limiter = GatewayRatelimiter(count=1, per=0.05)
+        assert await limiter.block()
+
+        cancelled = asyncio.create_task(limiter.block())
+        waiting = asyncio.create_task(limiter.block())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert limiter.queue_size == 1
+
+        # the cancelled command shouldn't use up the next slot
+        await asyncio.wait_for(waiting, timeout=0.09)
+
+
+@pytest.mark.asyncio
+async def test_stats() -> None:
+    ws = gateway.DiscordWebSocket(mock.Mock(), loop=asyncio.get_running_loop())
+    ws._discord_parsers = {}
+    ws.shard_id = None
+    ws._stats = stats = gateway.GatewayStats()
+
+    typing = json.dumps({"op": 0, "t": "TYPING_START", "s": 1, "d": {}})
+    await ws.received_message(typing)
+    await ws.received_message(typing)
+    await ws.received_message(json.dumps({"op": 11, "d": None}))
+
+    assert stats.frames == 3
+    assert stats.events == {"TYPING_START": 2}
+    assert stats.event_bytes == {"TYPING_START": 2 * len(typing)}
+    assert stats.bytes > stats.event_bytes["TYPING_START"]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_ack_saves_session(client: disnake.Client, tmp_path: Path) -> None:
+    ws = gateway.DiscordWebSocket(mock.Mock(), loop=asyncio.get_running_loop())
+    ws._discord_parsers = {}
+    ws.shard_id = None
+    ws.session_id = "abc"
+    ws.resume_gateway = "wss://gateway.discord.gg"
+    ws._session_file = store = SessionFile(tmp_path / "session.json", state=client._connection)
+
+    await ws.received_message(json.dumps({"op": 0, "t": "TYPING_START", "s": 10, "d": {}}))
+    await ws.received_message(json.dumps({"op": 11, "d": None}))
+    await store.save_async()
+
+    data = json.loads((tmp_path / "session.json").read_text())
+    assert data["shards"][0]["sequence"] == 10
@@ -0,0 +1,653 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from typing import Any
+from unittest import mock
+
+import pytest
+
+import disnake
+
+
+def _channel_data(channel_id: int, type: int, position: int, parent_id: int | None = None) -> Any:
+    return {
+        "id": str(channel_id),
+        "guild_id": "1",
+        "type": type,
+        "name": f"channel {channel_id}",
+        "position": position,
+        "parent_id": str(parent_id) if parent_id else None,
+        "permission_overwrites": [],
+    }
+
+
+def _role_data(role_id: int, position: int) -> Any:
+    return {
+        "id": str(role_id),
+        "name": f"role {role_id}",
+        "permissions": "0",
+        "position": position,
+        "color": 0,
+        "colors": {"primary_color": 0, "secondary_color": None, "tertiary_color": None},
+    }
+
+
+@pytest.fixture
+def guild() -> disnake.Guild:
+    state = disnake.Client()._connection
+    guild = disnake.Guild(
+        data={
+            "id": "1",
+            "name": "guild",
+            "roles": [_role_data(1, 0), _role_data(10, 2), _role_data(11, 1)],
+            "channels": [
+                _channel_data(20, 4, 1),
+                _channel_data(21, 0, 1, parent_id=20),
+                _channel_data(22, 0, 0, parent_id=20),
+                _channel_data(23, 2, 0),
+            ],
+        },  # pyright: ignore[reportArgumentType]
+        state=state,
+    )
+    state._add_guild(guild)
+    return guild
+
+
+class TestSortedViews:
+    def test_channels(self, guild: disnake.Guild) -> None:
+        assert [c.id for c in guild.text_channels] == [22, 21]
+        assert [c.id for c in guild.voice_channels] == [23]
+        assert [c.id for c in guild.categories] == [20]
+
+        # returned lists can be modified without affecting the cached view
+        guild.text_channels.clear()
+        assert guild._sorted_views["text_channels"] is not guild.text_channels
+        assert [c.id for c in guild.text_channels] == [22, 21]
+
+        guild._state.parse_channel_create(_channel_data(24, 0, 2, parent_id=20))
+        assert [c.id for c in guild.text_channels] == [22, 21, 24]
+
+        guild._state.parse_channel_update(_channel_data(24, 0, -1, parent_id=20))
+        assert [c.id for c in guild.text_channels] == [24, 22, 21]
+
+        guild._state.parse_channel_delete(_channel_data(22, 0, 0, parent_id=20))
+        assert [c.id for c in guild.text_channels] == [24, 21]
+
+    def test_by_category(self, guild: disnake.Guild) -> None:
+        result = guild.by_category()
+        assert [(c and c.id, [ch.id for ch in chs]) for c, chs in result] == [
+            (None, [23]),
+            (20, [22, 21]),
+        ]
+        result[1][1].clear()
+        assert [len(chs) for _, chs in guild.by_category()] == [1, 2]
+
+        guild._state.parse_channel_update(_channel_data(23, 2, 0, parent_id=20))
+        assert [(c and c.id, [ch.id for ch in chs]) for c, chs in guild.by_category()] == [
+            (20, [22, 21, 23]),
+        ]
+
+    def test_roles(self, guild: disnake.Guild) -> None:
+        assert [r.id for r in guild.roles] == [1, 11, 10]
+        state = guild._state
+
+        state.parse_guild_role_create({"guild_id": "1", "role": _role_data(12, 1)})
+        assert [r.id for r in guild.roles] == [1, 12, 11, 10]
+
+        state.parse_guild_role_update({"guild_id": "1", "role": _role_data(12, 5)})
+        assert [r.id for r in guild.roles] == [1, 11, 10, 12]
+
+        state.parse_guild_role_delete({"guild_id": "1", "role_id": "10"})
+        assert [r.id for r in guild.roles] == [1, 11, 12]
+
+
+def _member_data(member_id: int, roles: list[int]) -> Any:
+    return {
+        "user": {"id": str(member_id), "username": "user", "discriminator": "0", "avatar": None},
+        "roles": [str(r) for r in roles],
+        "joined_at": None,
+        "deaf": False,
+        "mute": False,
+    }
+
+
+class TestPermissionsFor:
+    def test_cached(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        channel = guild.get_channel(21)
+        assert isinstance(channel, disnake.TextChannel)
+        a, b = (
+            disnake.Member(data=_member_data(i, [10]), guild=guild, state=state) for i in (100, 101)
+        )
+
+        assert not channel.permissions_for(a).manage_messages
+        assert list(guild._permission_cache) == [(21, a._roles.tobytes())]
+
+        # role permission updates invalidate the cache (view_channel | manage_messages)
+        state.parse_guild_role_update(
+            {"guild_id": "1", "role": {**_role_data(10, 2), "permissions": "9216"}}
+        )
+        assert not guild._permission_cache
+        assert channel.permissions_for(a).manage_messages
+
+        # so do overwrite updates, and member overwrites are applied per member
+        state.parse_channel_update(
+            {
+                **_channel_data(21, 0, 1, parent_id=20),
+                "permission_overwrites": [
+                    {"id": "10", "type": 0, "allow": "0", "deny": "8192"},
+                    {"id": "101", "type": 1, "allow": "8192", "deny": "0"},
+                ],
+            }
+        )
+        assert not channel.permissions_for(a).manage_messages
+        assert channel.permissions_for(b).manage_messages
+        assert len(guild._permission_cache) == 1
+
+    def test_bulk(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        channel = guild.get_channel(23)
+        assert isinstance(channel, disnake.VoiceChannel)
+        for member_id, roles in ((100, []), (101, [10]), (102, [10, 11])):
+            guild._add_member(
+                disnake.Member(data=_member_data(member_id, roles), guild=guild, state=state)
+            )
+
+        # members with member overwrites are resolved individually
+        state.parse_channel_update(
+            {
+                **_channel_data(23, 2, 0),
+                "permission_overwrites": [{"id": "101", "type": 1, "allow": "1024", "deny": "0"}],
+            }
+        )
+        guild._add_member(disnake.Member(data=_member_data(103, [10]), guild=guild, state=state))
+
+        result = channel.permissions_for_members()
+        assert {m.id: p for m, p in result.items()} == {
+            m.id: channel.permissions_for(m) for m in guild.members
+        }
+        assert result[guild.get_member(101)] != result[guild.get_member(103)]  # pyright: ignore[reportArgumentType]
+
+    def test_guild_bulk(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        state.parse_guild_role_update(
+            {"guild_id": "1", "role": {**_role_data(11, 1), "permissions": "8"}}
+        )
+        for member_id, roles in ((100, []), (101, [10]), (102, [10, 11])):
+            guild._add_member(
+                disnake.Member(data=_member_data(member_id, roles), guild=guild, state=state)
+            )
+
+        result = guild.permissions_for_members()
+        assert {m.id: p for m, p in result.items()} == {
+            m.id: m.guild_permissions for m in guild.members
+        }
+        assert result[guild.get_member(102)] == disnake.Permissions.all()  # pyright: ignore[reportArgumentType]
+
+
+def _named_member_data(member_id: int, username: str, nick: str | None = None) -> Any:
+    return {
+        "user": {
+            "id": str(member_id),
+            "username": username,
+            "discriminator": "0",
+            "global_name": None,
+            "avatar": None,
+        },
+        "nick": nick,
+        "roles": [],
+        "joined_at": None,
+        "deaf": False,
+        "mute": False,
+    }
+
+
+class TestMemberNameIndex:
+    @pytest.fixture(params=[False, True], ids=["scan", "index"])
+    def named_guild(self, request: pytest.FixtureRequest) -> disnake.Guild:
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=disnake.CacheBackends(member_name_index=request.param),
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        state._add_guild(guild)
+        for member_id, username, nick in (
+            (100, "alice", None),
+            (101, "bob", "Alicia"),
+            (102, "carol", None),
+        ):
+            guild._add_member(
+                disnake.Member(
+                    data=_named_member_data(member_id, username, nick), guild=guild, state=state
+                )
+            )
+        return guild
+
+    def test_get_member_named(self, named_guild: disnake.Guild) -> None:
+        assert named_guild.get_member_named("alice").id == 100  # pyright: ignore[reportOptionalMemberAccess]
+        assert named_guild.get_member_named("Alicia").id == 101  # pyright: ignore[reportOptionalMemberAccess]
+        assert named_guild.get_member_named("carol#0").id == 102  # pyright: ignore[reportOptionalMemberAccess]
+        assert named_guild.get_member_named("dave") is None
+
+    def test_search(self, named_guild: disnake.Guild) -> None:
+        assert {m.id for m in named_guild.search_cached_members("ALI")} == {100, 101}
+        assert len(named_guild.search_cached_members("ali", limit=1)) == 1
+        assert named_guild.search_cached_members("x") == []
+        with pytest.raises(ValueError, match="limit"):
+            named_guild.search_cached_members("a", limit=0)
+
+    def test_update(self, named_guild: disnake.Guild) -> None:
+        state = named_guild._state
+        state.parse_guild_member_update(
+            {"guild_id": "1", **_named_member_data(101, "bob", "Dave")}  # pyright: ignore[reportArgumentType]
+        )
+        assert named_guild.get_member_named("Alicia") is None
+        assert named_guild.get_member_named("dave") is None
+        assert named_guild.get_member_named("Dave").id == 101  # pyright: ignore[reportOptionalMemberAccess]
+        assert [m.id for m in named_guild.search_cached_members("ali")] == [100]
+
+        # username changes are shared across guilds
+        state.parse_presence_update(
+            {
+                "guild_id": "1",
+                "user": _named_member_data(102, "carla")["user"],
+                "status": "online",
+                "activities": [],
+                "client_status": {},
+            }  # pyright: ignore[reportArgumentType]
+        )
+        assert named_guild.get_member_named("carol") is None
+        assert [m.id for m in named_guild.search_cached_members("carl")] == [102]
+
+        named_guild._remove_member(disnake.Object(100))
+        assert named_guild.get_member_named("alice") is None
+        assert named_guild.search_cached_members("ali") == []
+
+    def test_update_from_message(self, named_guild: disnake.Guild) -> None:
+        member = named_guild.get_member(101)
+        assert member is not None
+        member._update_from_message(_named_member_data(101, "bob", "new"))  # pyright: ignore[reportArgumentType]
+        assert named_guild.get_member_named("new") is member
+        assert named_guild.get_member_named("Alicia") is None
+
+    def test_update_without_eviction(self) -> None:
+        # updating the index mustn't evict expired members as a side effect
+        client = disnake.Client(
+            intents=disnake.Intents.all(),
+            cache_backends=disnake.CacheBackends(
+                members=disnake.MemberCachePolicy(ttl=10), member_name_index=True
+            ),
+        )
+        state = client._connection
+        guild = disnake.Guild(data={"id": "1", "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+        state._add_guild(guild)
+        with mock.patch("time.monotonic", return_value=100):
+            member = disnake.Member(
+                data=_named_member_data(100, "alice", None), guild=guild, state=state
+            )  # pyright: ignore[reportArgumentType]
+            guild._add_member(member)
+
+        with mock.patch("time.monotonic", return_value=200):
+            member._update_from_message(_named_member_data(100, "alice", "new"))  # pyright: ignore[reportArgumentType]
+            member._user.name = "other"
+            state._update_member_names(100)
+            assert 100 in guild._members._data  # pyright: ignore[reportAttributeAccessIssue]
+            assert guild._name_index is not None
+            assert guild._name_index.search("new", 5) == [100]
+            assert guild._name_index.search("other", 5) == [100]
+
+    def test_outdated_index(self, named_guild: disnake.Guild) -> None:
+        # names changed without reindexing must not return stale matches
+        member = named_guild.get_member(100)
+        assert member is not None
+        member._user.name = "other"
+        assert named_guild.get_member_named("alice") is None
+        assert named_guild.get_member_named("alice#0") is None
+
+
+class TestMemberResolver:
+    @pytest.mark.asyncio
+    async def test_coalesce(self, guild: disnake.Guild) -> None:
+        state = guild._state
+
+        async def query_members(
+            guild: disnake.Guild, *, user_ids: list[int], **kwargs: Any
+        ) -> list[disnake.Member]:
+            await asyncio.sleep(0)
+            # pretend that 102 isn't a member
+            return [
+                disnake.Member(data=_member_data(i, []), guild=guild, state=state)
+                for i in user_ids
+                if i != 102
+            ]
+
+        with mock.patch.object(state, "query_members", side_effect=query_members) as m:
+            results = await asyncio.gather(
+                guild.get_or_fetch_members([100, 101]),
+                guild.get_or_fetch_members([101, 102]),
+                guild.get_or_fetch_members([100]),
+            )
+
+        assert [[member.id for member in r] for r in results] == [[100, 101], [101], [100]]
+        m.assert_called_once()
+        assert m.call_args.kwargs["user_ids"] == [100, 101, 102]
+        assert guild.get_member(101) is not None
+        assert not state._member_resolvers
+
+    @pytest.mark.asyncio
+    async def test_in_flight(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        requested = asyncio.Event()
+        respond = asyncio.Event()
+
+        async def query_members(
+            guild: disnake.Guild, *, user_ids: list[int], **kwargs: Any
+        ) -> list[disnake.Member]:
+            requested.set()
+            await respond.wait()
+            return [
+                disnake.Member(data=_member_data(i, []), guild=guild, state=state) for i in user_ids
+            ]
+
+        with mock.patch.object(state, "query_members", side_effect=query_members) as m:
+            first = asyncio.create_task(guild.get_or_fetch_members([5]))
+            await requested.wait()
+            # requested again while the first request is in flight
+            second = asyncio.create_task(guild.get_or_fetch_members([5]))
+            await asyncio.sleep(0.1)
+            respond.set()
+            results = await asyncio.gather(first, second)
+
+        assert [c.kwargs["user_ids"] for c in m.call_args_list] == [[5]]
+        assert [[member.id for member in r] for r in results] == [[5], [5]]
+        assert not state._member_resolvers
+
+    @pytest.mark.asyncio
+    async def test_batches(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        with mock.patch.object(state, "query_members", return_value=[]) as m:
+            await guild.get_or_fetch_members(list(range(1000, 1250)))
+        assert [len(c.kwargs["user_ids"]) for c in m.call_args_list] == [100, 100, 50]
+
+    @pytest.mark.asyncio
+    async def test_error(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        with (
+            mock.patch.object(state, "query_members", side_effect=asyncio.TimeoutError),
+            pytest.raises(asyncio.TimeoutError),
+        ):
+            await asyncio.gather(
+                guild.get_or_fetch_members([100]), guild.get_or_fetch_members([100, 101])
+            )
+        assert not state._member_resolvers
+
+
+def _chunk_data(guild: disnake.Guild, nonce: str, index: int, count: int, ids: range) -> Any:
+    return {
+        "guild_id": str(guild.id),
+        "members": [_member_data(i, []) for i in ids],
+        "chunk_index": index,
+        "chunk_count": count,
+        "nonce": nonce,
+    }
+
+
+class TestChunkRequests:
+    @pytest.mark.asyncio
+    async def test_progress(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        state.loop = asyncio.get_running_loop()
+        guild._member_count = 4
+        with mock.patch.object(state, "chunker") as chunker:
+            future = await state.chunk_guild(guild, wait=False)
+            assert guild.chunk_progress.queued  # pyright: ignore[reportOptionalMemberAccess]
+            await asyncio.sleep(0)
+        chunker.assert_awaited_once()
+        nonce = chunker.call_args.kwargs["nonce"]
+
+        # replies for other nonces and guilds are ignored
+        state.parse_guild_members_chunk(_chunk_data(guild, "other", 0, 1, range(100, 102)))
+        state.parse_guild_members_chunk(
+            {**_chunk_data(guild, nonce, 0, 1, range(100, 102)), "guild_id": "2"}
+        )
+        state.parse_guild_members_chunk(_chunk_data(guild, nonce, 0, 2, range(100, 102)))
+        progress = guild.chunk_progress
+        assert progress is not None
+        assert (progress.members_received, progress.chunks_received) == (2, 1)
+        assert progress.ratio == 0.5
+        assert progress.eta is not None
+        assert not future.done()
+
+        state.parse_guild_members_chunk(_chunk_data(guild, nonce, 1, 2, range(102, 104)))
+        assert [m.id for m in await future] == [100, 101, 102, 103]
+        assert guild.chunk_progress is None
+        assert not state._chunk_requests
+        assert not state._chunk_scheduler.in_flight
+
+    @pytest.mark.asyncio
+    async def test_scheduler(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        state.loop = asyncio.get_running_loop()
+        state._chunk_scheduler.max_members = 1000
+        guilds = []
+        for guild_id, member_count in ((2, 800), (3, 300), (4, 400), (5, 100)):
+            g = disnake.Guild(
+                data={"id": str(guild_id), "name": "guild", "member_count": member_count},  # pyright: ignore[reportArgumentType]
+                state=state,
+            )
+            state._add_guild(g)
+            guilds.append(g)
+
+        with mock.patch.object(state, "chunker") as chunker:
+            futures = [await state.chunk_guild(g, wait=False) for g in guilds]
+            await asyncio.sleep(0)
+            # a single guild takes up at most half of the budget,
+            # and smaller guilds are sent first as long as they fit into the budget
+            assert [c.args[0] for c in chunker.call_args_list] == [2, 3, 5]
+            assert state._chunk_scheduler.in_flight == {0: 900}
+
+            # completing the first request sends the remaining one
+            nonce = chunker.call_args_list[0].kwargs["nonce"]
+            state.parse_guild_members_chunk(_chunk_data(guilds[0], nonce, 0, 1, range(100, 101)))
+            await asyncio.sleep(0)
+            assert [c.args[0] for c in chunker.call_args_list] == [2, 3, 5, 4]
+            assert state._chunk_scheduler.in_flight == {0: 800}
+
+        assert futures[0].done()
+        assert not any(f.done() for f in futures[1:])
+
+    @pytest.mark.asyncio
+    async def test_priority(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        state.loop = asyncio.get_running_loop()
+        state._chunk_scheduler.max_requests = 1
+        state._chunk_priority = lambda g: -g.id
+        guilds = [guild]
+        for guild_id in (2, 3):
+            g = disnake.Guild(data={"id": str(guild_id), "name": "guild"}, state=state)  # pyright: ignore[reportArgumentType]
+            state._add_guild(g)
+            guilds.append(g)
+
+        with mock.patch.object(state, "chunker") as chunker:
+            for g in guilds:
+                await state.chunk_guild(g, wait=False)
+            await asyncio.sleep(0)
+            # only one request is in flight at a time, complete them in the order they're sent
+            for _ in guilds:
+                guild_id, nonce = chunker.call_args.args[0], chunker.call_args.kwargs["nonce"]
+                state.parse_guild_members_chunk(
+                    _chunk_data(state._get_guild(guild_id), nonce, 0, 1, range(0))  # pyright: ignore[reportArgumentType]
+                )
+                await asyncio.sleep(0)
+
+        assert [c.args[0] for c in chunker.call_args_list] == [1, 3, 2]
+
+    @pytest.mark.asyncio
+    async def test_send_error(self, guild: disnake.Guild) -> None:
+        state = guild._state
+        state.loop = asyncio.get_running_loop()
+        with (
+            mock.patch.object(state, "chunker", side_effect=ConnectionError),
+            pytest.raises(ConnectionError),
+        ):
+            await state.chunk_guild(guild)
+        assert not state._chunk_requests
+        assert not state._guild_chunk_requests
+        assert not state._chunk_scheduler.in_flight
+
+    @pytest.mark.looptime
+    @pytest.mark.asyncio
+    async def test_delay_ready(self, looptime) -> None:
+        client = disnake.Client(
+            intents=disnake.Intents(guilds=True, members=True), guild_ready_timeout=1
+        )
+        state = client._connection
+        state.loop = asyncio.get_running_loop()
+        guilds = []
+        for guild_id, member_count in ((1, 1_000_000), (2, 10)):
+            g = disnake.Guild(
+                data={
+                    "id": str(guild_id),
+                    "name": "guild",
+                    "member_count": member_count,
+                    "large": True,
+                },  # pyright: ignore[reportArgumentType]
+                state=state,
+            )
+            state._add_guild(g)
+            guilds.append(g)
+
+        dispatched: list[tuple[str, int, float]] = []
+        state.dispatch = lambda event, *args: dispatched.append(
+            (event, args[0].id if args else 0, float(looptime))
+        )
+
+        async def chunker(guild_id: int, *, nonce: str) -> None:
+            # only the small guild responds
+            if guild_id == 2:
+                state.loop.call_later(
+                    3,
+                    state.parse_guild_members_chunk,
+                    _chunk_data(guilds[1], nonce, 0, 1, range(0)),
+                )
+
+        state._ready_state = asyncio.Queue()
+        for g in guilds:
+            state._ready_state.put_nowait(g)
+        with mock.patch.object(state, "chunker", side_effect=chunker):
+            await state._delay_ready()
+
+        # the small guild is available right after its chunk arrives,
+        # the large one only after a timeout based on its member count
+        assert dispatched == [
+            ("guild_available", 2, pytest.approx(3)),
+            ("guild_available", 1, pytest.approx(510)),
+            ("ready", 0, pytest.approx(510)),
+        ]
+
+
+def _emoji_data(emoji_id: int) -> Any:
+    return {"id": str(emoji_id), "name": "emoji", "roles": [], "animated": False}
+
+
+def _full_guild_data(guild_id: int) -> Any:
+    return {
+        "id": str(guild_id),
+        "name": "guild",
+        "member_count": 2,
+        "roles": [_role_data(guild_id, 0)],
+        "channels": [{**_channel_data(guild_id * 10, 0, 0), "guild_id": str(guild_id)}],
+        "members": [_member_data(100, []), _member_data(101, [])],
+        "emojis": [_emoji_data(guild_id * 10)],
+        "stickers": [],
+        "threads": [],
+    }
+
+
+class TestGuildCacheFilter:
+    @pytest.fixture
+    def client(self) -> disnake.Client:
+        client = disnake.Client(
+            intents=disnake.Intents(guilds=True, members=True),
+            chunk_guilds_at_startup=False,
+            guild_cache_filter=lambda guild_id: guild_id == 2,
+        )
+        state = client._connection
+        state.user = disnake.ClientUser(state=state, data=_member_data(100, [])["user"])
+        for guild_id in (1, 2):
+            state._add_guild_from_data(_full_guild_data(guild_id))
+        return client
+
+    def test_skeleton(self, client: disnake.Client) -> None:
+        state = client._connection
+        skeleton, full = client.get_guild(1), client.get_guild(2)
+        assert skeleton is not None
+        assert full is not None
+        assert not skeleton.fully_cached
+        assert full.fully_cached
+
+        # channels, roles and the own member are still cached
+        assert [c.id for c in skeleton.channels] == [10]
+        assert skeleton.get_role(1) is not None
+        assert [m.id for m in skeleton.members] == [100]
+        assert skeleton.emojis == ()
+        assert [e.id for e in client.emojis] == [20]
+        assert [g.id for g in state._get_mutual_guilds(101)] == [2]
+
+        state.parse_guild_member_add({"guild_id": "1", **_member_data(102, [])})
+        assert skeleton.get_member(102) is None
+        assert skeleton.member_count == 3
+
+    @pytest.mark.asyncio
+    async def test_runtime(self, client: disnake.Client) -> None:
+        state = client._connection
+        skeleton, full = client.get_guild(1), client.get_guild(2)
+        assert skeleton is not None
+        assert full is not None
+
+        with (
+            mock.patch.object(
+                state.http, "get_all_custom_emojis", mock.AsyncMock(return_value=[_emoji_data(10)])
+            ),
+            mock.patch.object(
+                state.http, "get_all_guild_stickers", mock.AsyncMock(return_value=[])
+            ),
+            mock.patch.object(
+                state.http, "get_active_threads", mock.AsyncMock(return_value={"threads": []})
+            ),
+        ):
+            client.guild_cache_filter = lambda guild_id: guild_id == 1
+
+            # trimming happens right away
+            assert not full.fully_cached
+            assert [m.id for m in full.members] == [100]
+            assert full.emojis == ()
+            assert not state._get_mutual_guilds(101)
+
+            # upgrading happens in the background
+            await asyncio.gather(*state._guild_upgrades)
+
+        assert skeleton.fully_cached
+        assert [e.id for e in skeleton.emojis] == [10]
+        assert [e.id for e in client.emojis] == [10]
+
+        with pytest.raises(TypeError, match="callable"):
+            client.guild_cache_filter = 1  # pyright: ignore[reportAttributeAccessIssue]
+
+    @pytest.mark.asyncio
+    async def test_failed_upgrade(self, client: disnake.Client) -> None:
+        state = client._connection
+        skeleton = client.get_guild(1)
+        assert skeleton is not None
+
+        error = disnake.HTTPException(mock.Mock(status=500), "error")
+        with mock.patch.object(
+            state.http, "get_all_custom_emojis", mock.AsyncMock(side_effect=error)
+        ):
+            client.guild_cache_filter = None
+            await asyncio.gather(*state._guild_upgrades)
+
+        # the guild stays a skeleton, and is upgraded when the filter is set again
+        assert not skeleton.fully_cached
+        assert skeleton.emojis == ()
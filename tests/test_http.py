@@ -1,8 +1,16 @@
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest import mock
+
 import pytest
 
-from disnake.http import HTTPClient
+from disnake.errors import DiscordServerError
+from disnake.http import HTTPClient, Route
 
 
 @pytest.mark.parametrize(
@@ -45,3 +53,60 @@ from disnake.http import HTTPClient
 )
 def test_format_gateway_url(url: str, encoding: str, zlib: bool, expected: str) -> None:
     assert HTTPClient._format_gateway_url(url, encoding=encoding, zlib=zlib) == expected
+
+
+@pytest.mark.asyncio
+async def test_request_stats() -> None:
+    responses = [
+        (
+            429,
+            {"X-Ratelimit-Bucket": "abcd", "Via": "1.1 google"},
+            {"retry_after": 0, "global": False},
+        ),
+        (500, {}, {}),
+        (200, {}, {"id": "1"}),
+    ]
+
+    @contextlib.asynccontextmanager
+    async def request(*args: Any, **kwargs: Any) -> AsyncIterator[mock.Mock]:
+        status, headers, data = responses.pop(0)
+        response = mock.Mock(status=status, headers={"content-type": "application/json", **headers})
+        response.text = mock.AsyncMock(return_value=json.dumps(data))
+        yield response
+
+    http = HTTPClient(loop=asyncio.get_running_loop())
+    http._HTTPClient__session = mock.Mock(request=request)  # pyright: ignore[reportAttributeAccessIssue]
+    with mock.patch("asyncio.sleep", mock.AsyncMock()):
+        assert await http.request(Route("GET", "/users/{user_id}", user_id=1)) == {"id": "1"}
+
+    stats = http._stats
+    assert stats.durations["GET /users/{user_id}"].count == 3
+    assert stats.responses == {
+        ("GET /users/{user_id}", 429): 1,
+        ("GET /users/{user_id}", 500): 1,
+        ("GET /users/{user_id}", 200): 1,
+    }
+    assert stats.ratelimits == {"abcd": 1}
+    assert stats.retries == {
+        ("GET /users/{user_id}", "ratelimited"): 1,
+        ("GET /users/{user_id}", "server_error"): 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_request_stats_out_of_retries() -> None:
+    @contextlib.asynccontextmanager
+    async def request(*args: Any, **kwargs: Any) -> AsyncIterator[mock.Mock]:
+        response = mock.Mock(status=500, headers={"content-type": "application/json"})
+        response.text = mock.AsyncMock(return_value="{}")
+        yield response
+
+    http = HTTPClient(loop=asyncio.get_running_loop())
+    http._HTTPClient__session = mock.Mock(request=request)  # pyright: ignore[reportAttributeAccessIssue]
+    with mock.patch("asyncio.sleep", mock.AsyncMock()), pytest.raises(DiscordServerError):
+        await http.request(Route("GET", "/users/{user_id}", user_id=1))
+
+    stats = http._stats
+    assert stats.responses == {("GET /users/{user_id}", 500): 5}
+    # the last attempt isn't retried
+    assert stats.retries == {("GET /users/{user_id}", "server_error"): 4}
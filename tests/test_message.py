@@ -1,5 +1,7 @@
 # SPDX-License-Identifier: MIT
 
+import copy
+
 import pytest
 
 import disnake
@@ -55,3 +57,69 @@ def _create_emoji(animated: bool) -> disnake.Emoji:
 )
 def test_convert_emoji_reaction__object(emoji, expected) -> None:
     assert message.convert_emoji_reaction(emoji) == expected
+
+
+def _message_data(message_id: int, **kwargs) -> dict:
+    return {
+        "id": str(message_id),
+        "channel_id": "10",
+        "author": {"id": "2", "username": "user", "discriminator": "0", "avatar": None},
+        "content": "content",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        **kwargs,
+    }
+
+
+class TestLazyMessage:
+    def _create(self, lazy: bool, **kwargs) -> disnake.Message:
+        client = disnake.Client(cache_backends=disnake.CacheBackends(lazy_messages=lazy))
+        channel = disnake.PartialMessageable(state=client._connection, id=10)
+        data = _message_data(
+            1,
+            embeds=[{"title": "embed"}],
+            reactions=[{"count": 2, "me": False, "emoji": {"id": None, "name": "🔥"}}],
+            message_reference={"message_id": "3", "channel_id": "10"},
+            referenced_message=_message_data(3, content="reply"),
+            **kwargs,
+        )
+        return disnake.Message(state=client._connection, channel=channel, data=data)  # pyright: ignore[reportArgumentType]
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_attributes(self, lazy: bool) -> None:
+        msg = self._create(lazy)
+        if lazy:
+            assert msg._lazy is not None
+            assert set(msg._lazy) == {"embeds", "reactions", "reference"}
+        else:
+            assert msg._lazy is None
+
+        assert [e.title for e in msg.embeds] == ["embed"]
+        assert msg.reactions[0].count == 2
+        assert msg.reactions[0].message is msg
+        assert msg.attachments == []
+        assert msg.poll is None
+        assert msg.interaction_metadata is None
+        assert msg.message_snapshots == []
+        assert msg.reference is not None
+        assert isinstance(msg.reference.resolved, disnake.Message)
+        assert msg.reference.resolved.content == "reply"
+        assert not msg._lazy
+
+    def test_update(self) -> None:
+        msg = self._create(True)
+        old = copy.copy(msg)
+        msg._update({"embeds": [{"title": "new"}]})  # pyright: ignore[reportArgumentType]
+
+        assert [e.title for e in msg.embeds] == ["new"]
+        assert [e.title for e in old.embeds] == ["embed"]
+        assert msg._lazy is not None
+        assert "embeds" not in msg._lazy
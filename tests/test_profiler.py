@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+import disnake
+from disnake.profiler import HandlerProfiler, LoopLagMonitor
+
+
+def test_invalid_threshold() -> None:
+    with pytest.raises(ValueError, match="threshold"):
+        HandlerProfiler(threshold=0)
+
+
+def test_slowest() -> None:
+    profiler = HandlerProfiler()
+    for name, durations in (("a", [1, 1, 1]), ("b", [0.5, 4]), ("c", [2])):
+        for duration in durations:
+            profiler._handlers.setdefault(
+                ("on_message", name), disnake.HandlerStats("on_message", name)
+            )._observe(duration)
+
+    assert [s.name for s in profiler.slowest()] == ["b", "c", "a"]
+    assert [s.name for s in profiler.slowest(2, key="max")] == ["b", "c"]
+    assert [s.name for s in profiler.slowest(key="total")] == ["b", "a", "c"]
+
+    stats = profiler.slowest(1)[0]
+    assert stats.count == 2
+    assert stats.total == 4.5
+    assert stats.mean == 2.25
+    assert stats.max == 4
+
+    with pytest.raises(ValueError, match="key"):
+        profiler.slowest(key="min")  # pyright: ignore[reportArgumentType]
+
+    profiler.reset()
+    assert profiler.handlers == []
+
+
+@pytest.mark.asyncio
+async def test_run_event() -> None:
+    client = disnake.Client()
+    assert client.handler_profiler is None
+
+    async def on_message(*args) -> None: ...
+
+    # nothing is measured without a profiler
+    await client._run_event(on_message, "on_message")
+
+    client.handler_profiler = profiler = HandlerProfiler()
+    await client._run_event(on_message, "on_message")
+    await client._run_event(on_message, "on_message")
+
+    (stats,) = profiler.handlers
+    assert stats.event == "on_message"
+    assert stats.name == "test_run_event.<locals>.on_message"
+    assert stats.count == 2
+
+    with pytest.raises(TypeError):
+        client.handler_profiler = object()  # pyright: ignore[reportAttributeAccessIssue]
+
+
+@pytest.mark.asyncio
+async def test_threshold_running(caplog: pytest.LogCaptureFixture) -> None:
+    profiler = HandlerProfiler(threshold=0.01)
+    client = disnake.Client(handler_profiler=profiler)
+
+    async def on_message() -> None:
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.WARNING, logger="disnake.profiler"):
+        await asyncio.create_task(client._run_event(on_message, "on_message"))
+
+    (record,) = caplog.records
+    assert "is still running after" in record.message
+    # the stack of the handler's task is included
+    assert "in on_message" in record.message
+
+
+@pytest.mark.asyncio
+async def test_threshold_blocking(caplog: pytest.LogCaptureFixture) -> None:
+    profiler = HandlerProfiler(threshold=0.01)
+    client = disnake.Client(handler_profiler=profiler)
+
+    async def on_message() -> None:
+        time.sleep(0.02)  # noqa: ASYNC251
+
+    with caplog.at_level(logging.WARNING, logger="disnake.profiler"):
+        await client._run_event(on_message, "on_message")
+
+    (record,) = caplog.records
+    assert record.message.startswith(
+        "Handler test_threshold_blocking.<locals>.on_message for on_message took"
+    )
+
+
+def test_loop_lag_invalid() -> None:
+    with pytest.raises(ValueError, match="interval"):
+        LoopLagMonitor(interval=0)
+    with pytest.raises(ValueError, match="history"):
+        LoopLagMonitor(history=0)
+    with pytest.raises(ValueError, match="dump_stack"):
+        LoopLagMonitor(dump_stack=True)
+
+
+def test_loop_lag_percentile() -> None:
+    monitor = LoopLagMonitor(history=4)
+    assert monitor.percentile(50) == 0.0
+
+    for lag in (5, 1, 2, 3, 4):
+        monitor._record(lag)
+
+    # the oldest sample was dropped
+    assert [s.lag for s in monitor.samples] == [1, 2, 3, 4]
+    assert monitor.percentile(0) == 1
+    assert monitor.percentile(50) == 2.5
+    assert monitor.percentile(100) == 4
+
+    with pytest.raises(ValueError, match="percentile"):
+        monitor.percentile(101)
+
+    monitor.reset()
+    assert monitor.samples == []
+
+
+def test_loop_lag_attribution(caplog: pytest.LogCaptureFixture) -> None:
+    monitor = LoopLagMonitor(threshold=0.01)
+
+    monitor._event_started("MESSAGE_CREATE")
+    monitor._event_finished()
+    monitor._event_started("GUILD_CREATE")
+    time.sleep(0.02)
+    monitor._event_finished()
+
+    with caplog.at_level(logging.WARNING, logger="disnake.profiler"):
+        sample = monitor._record(0.03)
+    assert sample.event == "GUILD_CREATE"
+    (record,) = caplog.records
+    assert (
+        record.message == "Event loop was blocked for 0.030 seconds (gateway event: GUILD_CREATE)."
+    )
+
+    # not attributed to events that only took a fraction of the lag
+    monitor._event_started("MESSAGE_CREATE")
+    monitor._event_finished()
+    assert monitor._record(0.5).event is None
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_run(caplog: pytest.LogCaptureFixture) -> None:
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05, dump_stack=True)
+    client = disnake.Client(loop_lag_monitor=monitor)
+    assert client.loop_lag_monitor is monitor
+
+    monitor._start()
+    assert monitor.running
+    await asyncio.sleep(0.03)
+
+    def block() -> None:
+        monitor._event_started("GUILD_CREATE")
+        time.sleep(0.2)
+        monitor._event_finished()
+
+    with caplog.at_level(logging.WARNING, logger="disnake.profiler"):
+        block()
+        await asyncio.sleep(0.03)
+    monitor._close()
+    assert not monitor.running
+
+    assert max(s.lag for s in monitor.samples) > 0.1
+    assert any(s.event == "GUILD_CREATE" for s in monitor.samples)
+    # the stack is logged while blocked, instead of the warning after the fact
+    (record,) = caplog.records
+    assert "has been blocked" in record.message
+    assert "gateway event: GUILD_CREATE" in record.message
+    assert "in block" in record.message
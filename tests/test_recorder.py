@@ -0,0 +1,166 @@
+# SPDX-License-Identifier: MIT
+
+import io
+import json
+import zlib
+from typing import Any
+
+import pytest
+
+import disnake
+from disnake.recorder import GatewayRecorder, GatewayReplay
+
+USER = {
+    "id": "5",
+    "username": "bot",
+    "discriminator": "0",
+    "avatar": None,
+    "global_name": None,
+    "bot": True,
+}
+
+READY = {
+    "op": 0,
+    "t": "READY",
+    "s": 1,
+    "d": {
+        "v": 10,
+        "user": USER,
+        "guilds": [{"id": "1", "unavailable": True}],
+        "session_id": "abc",
+        "resume_gateway_url": "wss://gateway.discord.gg",
+        "application": {"id": "2", "flags": 0},
+    },
+}
+
+GUILD_CREATE = {
+    "op": 0,
+    "t": "GUILD_CREATE",
+    "s": 2,
+    "d": {
+        "id": "1",
+        "name": "guild",
+        "unavailable": False,
+        "member_count": 1,
+        "roles": [
+            {
+                "id": "1",
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "colors": {"primary_color": 0, "secondary_color": None, "tertiary_color": None},
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [{"id": "10", "type": 0, "name": "general", "position": 0}],
+        "members": [
+            {
+                "user": USER,
+                "roles": [],
+                "joined_at": "2020-01-01T00:00:00+00:00",
+                "deaf": False,
+                "mute": False,
+            }
+        ],
+        "owner_id": "5",
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "voice_states": [],
+        "presences": [],
+    },
+}
+
+HEARTBEAT_ACK = {"op": 11, "d": None}
+
+
+def _record(*payloads: dict[str, Any], compress: bool, transport_compress: bool) -> io.BytesIO:
+    fp = io.BytesIO()
+    recorder = GatewayRecorder(fp, compress=compress)
+    recorder.record_connect(shard_id=0)
+
+    zlib_ctx = zlib.compressobj()
+    for payload in payloads:
+        raw = json.dumps(payload)
+        if transport_compress:
+            data = zlib_ctx.compress(raw.encode()) + zlib_ctx.flush(zlib.Z_SYNC_FLUSH)
+            # split frame to make sure partial messages are buffered
+            recorder.record(data[:8], shard_id=0)
+            recorder.record(data[8:], shard_id=0)
+        else:
+            recorder.record(raw, shard_id=0)
+
+    recorder.close()
+    assert recorder.closed
+    assert not fp.closed
+
+    fp.seek(0)
+    return fp
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_roundtrip(compress: bool) -> None:
+    fp = _record(READY, HEARTBEAT_ACK, compress=compress, transport_compress=False)
+    assert (fp.getvalue()[:2] == b"\x1f\x8b") is compress
+
+    frames = list(GatewayReplay(fp).frames())
+    assert [f.kind for f in frames] == [0, 1, 1]
+    assert all(f.shard_id == 0 for f in frames)
+    assert frames[0].data == b""
+    assert json.loads(frames[1].data) == READY
+    assert json.loads(frames[2].data) == HEARTBEAT_ACK
+    assert frames[0].timestamp <= frames[1].timestamp <= frames[2].timestamp
+
+
+def test_invalid_file() -> None:
+    with pytest.raises(ValueError, match="not a gateway recording"):
+        list(GatewayReplay(io.BytesIO(b"{}")).frames())
+
+
+def test_truncated(caplog: pytest.LogCaptureFixture) -> None:
+    fp = _record(READY, compress=False, transport_compress=False)
+    fp = io.BytesIO(fp.getvalue()[:-10])
+
+    frames = list(GatewayReplay(fp).frames())
+    assert len(frames) == 1
+    assert "truncated" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport_compress", [False, True])
+async def test_replay(transport_compress: bool) -> None:
+    fp = _record(
+        READY,
+        HEARTBEAT_ACK,
+        GUILD_CREATE,
+        compress=True,
+        transport_compress=transport_compress,
+    )
+
+    client = disnake.Client(intents=disnake.Intents.all(), chunk_guilds_at_startup=False)
+    stats = await GatewayReplay(fp).run(client)
+    if client._connection._ready_task:
+        client._connection._ready_task.cancel()
+
+    assert stats.frames == (7 if transport_compress else 4)
+    assert stats.events == 2
+    assert stats.event_counts == {"READY": 1, "GUILD_CREATE": 1}
+    assert stats.events_per_second > 0
+    assert stats.event_memory == {}
+
+    assert client.user.id == 5
+    guild = client.get_guild(1)
+    assert guild is not None
+    assert guild.name == "guild"
+    assert [c.id for c in guild.text_channels] == [10]
+    assert guild.me is not None
+
+
+@pytest.mark.asyncio
+async def test_replay_invalid_speed() -> None:
+    with pytest.raises(ValueError, match="speed must be greater than 0"):
+        await GatewayReplay(io.BytesIO()).run(disnake.Client(), speed=0)
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from disnake.gateway import ReconnectWebSocket
+from disnake.shard import EventType, ReconnectCoordinator, Shard
+
+
+class TestReconnectCoordinator:
+    @pytest.mark.looptime
+    @pytest.mark.asyncio
+    async def test_identify_buckets(self, looptime) -> None:
+        coordinator = ReconnectCoordinator(max_concurrency=2)
+
+        # shards 0-3 are in buckets 0, 1, 0, 1
+        await asyncio.gather(*(coordinator.wait_identify(shard_id) for shard_id in range(4)))
+        assert looptime == pytest.approx(5, abs=0.1)
+
+        # next IDENTIFY in bucket 0 has to wait again
+        await coordinator.wait_identify(4)
+        assert looptime == pytest.approx(10, abs=0.1)
+        assert coordinator.stats.identify_delay == pytest.approx(15, abs=0.1)
+
+    @pytest.mark.looptime
+    @pytest.mark.asyncio
+    async def test_identify_initial(self, looptime) -> None:
+        coordinator = ReconnectCoordinator()
+        await coordinator.wait_identify(0)
+        await coordinator.wait_identify(1, initial=True)
+        assert looptime == 0
+
+    def test_shared_backoff(self) -> None:
+        coordinator = ReconnectCoordinator()
+        first = coordinator.backoff_delay()
+        second = coordinator.backoff_delay()
+        # second shard joins the ongoing backoff
+        assert second <= first
+        assert coordinator._backoff._exp == 1
+
+    def test_stats(self) -> None:
+        coordinator = ReconnectCoordinator()
+        coordinator.disconnected(0)
+        coordinator.disconnected(1)
+        # a failed reconnect attempt isn't another disconnect
+        coordinator.disconnected(1)
+        coordinator.reconnected(0)
+
+        stats = coordinator.stats
+        assert stats.disconnects == 2
+        assert stats.reconnecting == 1
+        assert stats.peak_reconnecting == 2
+
+        coordinator.reconnected(1)
+        assert stats.reconnecting == 0
+        assert stats.peak_reconnecting == 2
+
+    @pytest.mark.asyncio
+    async def test_requested_reconnect(self) -> None:
+        coordinator = ReconnectCoordinator()
+        client = mock.Mock(_reconnect_coordinator=coordinator)
+        client.is_closed.return_value = False
+        ws = mock.Mock(shard_id=0)
+        ws.poll_event = mock.AsyncMock(side_effect=ReconnectWebSocket(0, resume=True))
+        queue_put = mock.Mock()
+
+        await Shard(ws, client, queue_put).worker()
+
+        (item,) = queue_put.call_args.args
+        assert item.type == EventType.resume
+        # reconnects requested by the gateway aren't unexpected disconnects
+        assert coordinator.stats.disconnects == 0
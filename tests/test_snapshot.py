@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MIT
+
+import io
+import pickle
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import disnake
+from disnake.gateway import ResumeState
+from disnake.recorder import GatewayReplay
+from disnake.snapshot import CacheSnapshot, _SnapshotUnpickler
+
+from .test_recorder import GUILD_CREATE, READY, USER, _record
+
+SESSION = ResumeState("abc", 2, "wss://gateway.discord.gg")
+
+
+def _make_client() -> disnake.Client:
+    client = disnake.Client(intents=disnake.Intents.all(), chunk_guilds_at_startup=False)
+    client._connection.user = disnake.ClientUser(state=client._connection, data=USER)  # pyright: ignore[reportArgumentType]
+    return client
+
+
+async def _create_snapshot(tmp_path: Path) -> Path:
+    client = _make_client()
+    await GatewayReplay(_record(READY, GUILD_CREATE, compress=False, transport_compress=False)).run(
+        client
+    )
+    if client._connection._ready_task:
+        client._connection._ready_task.cancel()
+
+    path = tmp_path / "snapshot.bin"
+    CacheSnapshot(path, state=client._connection).save({None: SESSION})
+    return path
+
+
+def test_enum_pickle() -> None:
+    assert pickle.loads(pickle.dumps(disnake.ChannelType.text)) is disnake.ChannelType.text  # noqa: S301
+
+    unknown = disnake.enums.try_enum(disnake.ChannelType, 1234)
+    assert pickle.loads(pickle.dumps(unknown)) == unknown  # noqa: S301
+
+
+@pytest.mark.asyncio
+async def test_roundtrip(tmp_path: Path) -> None:
+    snapshot_path = await _create_snapshot(tmp_path)
+    client = _make_client()
+    assert CacheSnapshot(snapshot_path, state=client._connection).load({None: SESSION}) == 1
+
+    guild = client.get_guild(1)
+    assert guild is not None
+    assert guild._state is client._connection
+    assert [c.id for c in guild.text_channels] == [10]
+    assert guild.get_channel(10).guild is guild  # pyright: ignore[reportOptionalMemberAccess]
+    assert guild.me is not None
+    assert guild.me._user is client.user
+    assert guild.chunked
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "session",
+    [
+        ResumeState("abc", 3, SESSION.resume_gateway),
+        ResumeState("def", 2, SESSION.resume_gateway),
+    ],
+)
+async def test_outdated(tmp_path: Path, session: ResumeState) -> None:
+    snapshot_path = await _create_snapshot(tmp_path)
+    client = _make_client()
+    assert CacheSnapshot(snapshot_path, state=client._connection).load({None: session}) == 0
+    assert not client.guilds
+
+
+@pytest.mark.asyncio
+async def test_library_version(tmp_path: Path) -> None:
+    snapshot_path = await _create_snapshot(tmp_path)
+    client = _make_client()
+    with mock.patch("disnake.snapshot.__version__", "0.0.0-other"):
+        assert CacheSnapshot(snapshot_path, state=client._connection).load({None: SESSION}) == 0
+
+
+def test_disallowed_class(tmp_path: Path) -> None:
+    client = _make_client()
+    path = tmp_path / "snapshot.bin"
+
+    snapshot = CacheSnapshot(path, state=client._connection)
+    with mock.patch.object(client._connection, "_guilds", {1: Path("abc")}):
+        snapshot.save({None: SESSION})
+
+    assert snapshot.load({None: SESSION}) == 0
+    assert not client.guilds
+
+
+def test_disallowed_builtin() -> None:
+    client = _make_client()
+    unpickler = _SnapshotUnpickler(
+        io.BytesIO(b"cbuiltins\neval\n(V1+41\ntR."), state=client._connection
+    )
+    with pytest.raises(pickle.UnpicklingError, match=r"builtins\.eval"):
+        unpickler.load()
+
+
+def test_requires_session_file() -> None:
+    with pytest.raises(ValueError, match="requires session_file"):
+        disnake.Client(cache_snapshot="snapshot.bin")